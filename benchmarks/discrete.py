@@ -0,0 +1,72 @@
+# benchmarks/discrete.py
+"""Timing benchmarks for stepping forward linear discrete ROMs.
+
+Run from the top-level directory with
+
+    $ python3 benchmarks/discrete.py
+
+to compare InferredDiscreteROM.predict() for linear models ('cA' and 'cAB'),
+which uses a blocked scan of about 3*sqrt(niters) matrix-matrix products,
+against stepping the model forward one f_() evaluation at a time, for long
+horizons and several reduced dimensions r. The table also reports the
+relative difference between the two results.
+"""
+
+import time
+import numpy as np
+import scipy.linalg as la
+
+import rom_operator_inference as roi
+
+
+def _time(func, *args, repeat=3, **kwargs):
+    """Return the result of func() and its best wall time (in seconds) of
+    `repeat` calls.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def _relerr(A, B):
+    """Relative Frobenius error of B with respect to A."""
+    return la.norm(A - B) / la.norm(A)
+
+
+def _step(model, x0, niters, U=None):
+    """Step forward the model with f_(), one iteration at a time."""
+    X = np.empty((model.r,niters))
+    X[:,0] = x0
+    for j in range(niters-1):
+        X[:,j+1] = model.f_(X[:,j], U[:,j]) if U is not None \
+                                            else model.f_(X[:,j])
+    return X
+
+
+def bench_linear(rs=(10, 50, 200), ks=(1000, 10000, 100000), m=2):
+    """Time predict() for stable linear discrete ROMs with random operators."""
+    for form in ("cA", "cAB"):
+        print(f"\npredict(), modelform='{form}'")
+        print(f"{'r':>6}{'niters':>9}{'loop':>12}{'scan':>12}{'reldiff':>12}")
+        for r in rs:
+            A = np.random.standard_normal((r,r))
+            operators = dict(c_=np.random.standard_normal(r),
+                             A_=.99 * A / np.max(np.abs(la.eigvals(A))))
+            if "B" in form:
+                operators["B_"] = np.random.standard_normal((r,m))
+            model = roi.InferredDiscreteROM(form)
+            model._set_operators(None, **operators)
+            x0 = np.random.standard_normal(r)
+            for k in ks:
+                U = np.random.standard_normal((m,k)) if "B" in form else None
+                X_loop, t_loop = _time(_step, model, x0, k, U, repeat=1)
+                X_scan, t_scan = _time(model.predict, x0, k, U)
+                print(f"{r:>6}{k:>9}{t_loop:>12.2e}{t_scan:>12.2e}"
+                      f"{_relerr(X_loop, X_scan):>12.1e}")
+
+
+if __name__ == "__main__":
+    bench_linear()
@@ -0,0 +1,166 @@
+# benchmarks/integrate.py
+"""Timing benchmarks for the built-in Runge-Kutta integrators.
+
+Run from the top-level directory with
+
+    $ python3 benchmarks/integrate.py
+
+to compare InferredContinuousROM.predict() with scipy.integrate.solve_ivp()
+('RK45') against the built-in integrators ('dopri5' and 'rk4') as the reduced
+dimension r grows, predict_ensemble() for batches of N initial conditions, and
+the built-in IMEX integrators for a ROM with a stiff linear part, and exact
+integration of linear ROMs with cached matrix exponentials ('expm'). The
+fixed-step, stiff, and linear tables also report the error of the built-in
+integrators with respect to a tightly resolved solve_ivp() solution.
+"""
+
+import time
+import numpy as np
+import scipy.linalg as la
+
+import rom_operator_inference as roi
+
+
+def _time(func, *args, repeat=3, **kwargs):
+    """Return the result of func() and its best wall time (in seconds) of
+    `repeat` calls.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def _model(r, modelform="cAH"):
+    """A stable quadratic ROM with random operators."""
+    A = np.random.standard_normal((r,r)) / np.sqrt(r)
+    A = A - A.T - np.eye(r)
+    Hc = np.random.standard_normal((r,r*(r+1)//2)) / r**2
+    c = np.random.standard_normal(r) / 10
+    model = roi.InferredContinuousROM(modelform)
+    return model._set_operators(None, c_=c, A_=A, Hc_=Hc)
+
+
+def _relerr(A, B):
+    """Relative Frobenius error of B with respect to A."""
+    return la.norm(A - B) / la.norm(A)
+
+
+def bench_predict(rs=(5, 10, 20, 30), nt=101, tf=10, dt=1e-2, tol=1e-10):
+    """Time predict() with solve_ivp() and with the built-in integrators when
+    many time steps are needed, i.e., when the per-step overhead dominates:
+    first with the step size fixed to dt (solve_ivp() with max_step=dt), then
+    with tight adaptive error tolerances.
+    """
+    t = np.linspace(0, tf, nt)
+    print(f"predict(), modelform='cAH', nt={nt}, max_step={dt}")
+    print(f"{'r':>6}{'RK45':>12}{'dopri5':>12}{'rk4':>12}"
+          f"{'err(dopri5)':>13}{'err(rk4)':>12}")
+    for r in rs:
+        model = _model(r)
+        x0 = np.random.standard_normal(r)
+        exact = model.predict(x0, t, rtol=1e-12, atol=1e-12)
+        _, t_ivp = _time(model.predict, x0, t, method="RK45", max_step=dt)
+        X_dp5, t_dp5 = _time(model.predict, x0, t, method="dopri5",
+                             max_step=dt)
+        X_rk4, t_rk4 = _time(model.predict, x0, t, method="rk4", max_step=dt)
+        print(f"{r:>6}{t_ivp:>12.2e}{t_dp5:>12.2e}{t_rk4:>12.2e}"
+              f"{_relerr(exact, X_dp5):>13.1e}{_relerr(exact, X_rk4):>12.1e}")
+
+    print(f"\npredict(), modelform='cAH', nt={nt}, rtol=atol={tol}")
+    print(f"{'r':>6}{'RK45':>12}{'dopri5':>12}{'nfev(RK45)':>12}"
+          f"{'nfev(dopri5)':>14}")
+    for r in rs:
+        model = _model(r)
+        x0 = np.random.standard_normal(r)
+        _, t_ivp = _time(model.predict, x0, t, method="RK45",
+                         rtol=tol, atol=tol)
+        nfev_ivp = model.sol_.nfev
+        _, t_dp5 = _time(model.predict, x0, t, method="dopri5",
+                         rtol=tol, atol=tol)
+        print(f"{r:>6}{t_ivp:>12.2e}{t_dp5:>12.2e}{nfev_ivp:>12d}"
+              f"{model.sol_.nfev:>14d}")
+
+
+def bench_ensemble(Ns=(10, 100, 1000), r=10, nt=200, tf=2):
+    """Time predict_ensemble() against one predict() call per member."""
+    print(f"\npredict_ensemble(), modelform='cAH', r={r}, nt={nt}")
+    print(f"{'N':>6}{'RK45 (loop)':>14}{'RK45':>12}{'rk4':>12}{'dopri5':>12}")
+    t = np.linspace(0, tf, nt)
+    model = _model(r)
+    for N in Ns:
+        X0 = np.random.standard_normal((r,N))
+        _, t_loop = _time(lambda: [model.predict(x0, t) for x0 in X0.T],
+                          repeat=1)
+        _, t_ivp = _time(model.predict_ensemble, X0, t, method="RK45")
+        _, t_rk4 = _time(model.predict_ensemble, X0, t, method="rk4")
+        _, t_dp5 = _time(model.predict_ensemble, X0, t, method="dopri5")
+        print(f"{N:>6}{t_loop:>14.2e}{t_ivp:>12.2e}{t_rk4:>12.2e}"
+              f"{t_dp5:>12.2e}")
+
+
+def bench_stiff(rs=(10, 20, 30), nt=1001, tf=10, stiffness=1e4):
+    """Time predict() for a ROM with a stiff linear part (eigenvalues of A
+    down to -stiffness) with solve_ivp() ('RK45' and 'BDF') and with the
+    built-in IMEX integrators, which step on the time grid.
+    """
+    print(f"\nStiff predict(), modelform='cAH', nt={nt}, tf={tf}")
+    print(f"{'r':>6}{'RK45':>12}{'BDF':>12}{'cnab2':>12}{'ars222':>12}"
+          f"{'err(cnab2)':>12}{'err(ars222)':>12}")
+    t = np.linspace(0, tf, nt)
+    for r in rs:
+        model = _model(r)
+        model.A_ = model.A_ - np.diag(np.logspace(0, np.log10(stiffness), r))
+        model._construct_f_()
+        x0 = np.random.standard_normal(r)
+        exact = model.predict(x0, t, method="BDF", rtol=1e-10, atol=1e-12)
+        _, t_rk45 = _time(model.predict, x0, t, method="RK45", repeat=1)
+        _, t_bdf = _time(model.predict, x0, t, method="BDF")
+        X_cn, t_cn = _time(model.predict, x0, t, method="cnab2")
+        X_ars, t_ars = _time(model.predict, x0, t, method="ars222")
+        print(f"{r:>6}{t_rk45:>12.2e}{t_bdf:>12.2e}{t_cn:>12.2e}"
+              f"{t_ars:>12.2e}{_relerr(exact, X_cn):>12.1e}"
+              f"{_relerr(exact, X_ars):>12.1e}")
+
+
+def bench_linear(rs=(10, 30, 100), m=2, nt=1001, tf=10, tol=1e-8):
+    """Time predict() for linear ROMs without and with inputs (modelforms
+    'cA' and 'cAB') with solve_ivp() ('RK45', rtol=atol=tol) and with exact
+    integration ('expm'), the first time (building the propagators) and once
+    they are cached. With inputs, 'expm' is exact up to the first-order hold
+    of u between the times t.
+    """
+    t = np.linspace(0, tf, nt)
+    u = lambda s: np.array([np.sin(s), np.cos(s/2)])[:m]
+    for form in ("cA", "cAB"):
+        inputs = u if "B" in form else None
+        print(f"\nLinear predict(), modelform='{form}', nt={nt}, tf={tf}")
+        print(f"{'r':>6}{'RK45':>12}{'expm':>12}{'expm (cached)':>15}"
+              f"{'err(RK45)':>12}{'err(expm)':>12}")
+        for r in rs:
+            A = np.random.standard_normal((r,r)) / np.sqrt(r)
+            operators = dict(c_=np.random.standard_normal(r),
+                             A_=A - A.T - np.eye(r))
+            if inputs:
+                operators["B_"] = np.random.standard_normal((r,m))
+            model = roi.InferredContinuousROM(form)
+            model._set_operators(None, **operators)
+            x0 = np.random.standard_normal(r)
+            exact = model.predict(x0, t, inputs, rtol=1e-13, atol=1e-13)
+            X_ivp, t_ivp = _time(model.predict, x0, t, inputs, method="RK45",
+                                 rtol=tol, atol=tol)
+            _, t_first = _time(model.predict, x0, t, inputs, method="expm",
+                               repeat=1)
+            X_exp, t_exp = _time(model.predict, x0, t, inputs, method="expm")
+            print(f"{r:>6}{t_ivp:>12.2e}{t_first:>12.2e}{t_exp:>15.2e}"
+                  f"{_relerr(exact, X_ivp):>12.1e}"
+                  f"{_relerr(exact, X_exp):>12.1e}")
+
+
+if __name__ == "__main__":
+    bench_predict()
+    bench_ensemble()
+    bench_stiff()
+    bench_linear()
@@ -0,0 +1,64 @@
+# benchmarks/kronecker.py
+"""Timing benchmarks for the compact / full Kronecker product utilities.
+
+Run from the top-level directory with
+
+    $ python3 benchmarks/kronecker.py
+
+to print the wall time of the matricized tensor management routines as the
+reduced dimension r grows, and of an intrusive model fit (which compresses the
+n-dimensional full-order operators) as the full dimension n grows.
+"""
+
+import time
+import numpy as np
+
+import rom_operator_inference as roi
+
+
+def _time(func, *args, repeat=3):
+    """Return the best wall time (in seconds) of `repeat` calls to func()."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_operators(rs=(10, 20, 40, 80), rs_cubic=(5, 10, 20, 30)):
+    """Time compress_H(), expand_Hc(), compress_G(), and expand_Gc()."""
+    print("Quadratic operators")
+    print(f"{'r':>6}{'compress_H':>14}{'expand_Hc':>14}")
+    for r in rs:
+        H = np.random.random((r,r**2))
+        Hc = np.random.random((r,r*(r+1)//2))
+        print(f"{r:>6}{_time(roi.utils.compress_H, H):>14.2e}"
+              f"{_time(roi.utils.expand_Hc, Hc):>14.2e}")
+
+    print("\nCubic operators")
+    print(f"{'r':>6}{'compress_G':>14}{'expand_Gc':>14}")
+    for r in rs_cubic:
+        G = np.random.random((r,r**3))
+        Gc = np.random.random((r,r*(r+1)*(r+2)//6))
+        print(f"{r:>6}{_time(roi.utils.compress_G, G):>14.2e}"
+              f"{_time(roi.utils.expand_Gc, Gc):>14.2e}")
+
+
+def bench_intrusive(ns=(50, 100, 200, 400), r=10):
+    """Time IntrusiveContinuousROM.fit() with a quadratic FOM operator."""
+    print(f"\nIntrusive fit, modelform='AH', r={r}")
+    print(f"{'n':>6}{'fit (H)':>14}{'fit (Hc)':>14}")
+    for n in ns:
+        Vr = np.linalg.qr(np.random.random((n,r)))[0]
+        A = np.random.random((n,n))
+        H = np.random.random((n,n**2))
+        Hc = roi.utils.compress_H(H)
+        model = roi.IntrusiveContinuousROM("AH")
+        print(f"{n:>6}{_time(model.fit, Vr, {'A':A, 'H':H}):>14.2e}"
+              f"{_time(model.fit, Vr, {'A':A, 'H':Hc}):>14.2e}")
+
+
+if __name__ == "__main__":
+    bench_operators()
+    bench_intrusive()
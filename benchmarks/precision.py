@@ -0,0 +1,80 @@
+# benchmarks/precision.py
+"""Accuracy / throughput tradeoff of single-precision Operator Inference.
+
+Run from the top-level directory with
+
+    $ python3 benchmarks/precision.py
+
+to compare pod_basis(), InferredContinuousROM.fit(), and predict() with
+float64 data against the same routines with float32 data (which is assembled
+in float32 but always solved in float64). For each number of snapshots k, the
+table reports wall times, the memory needed for the data matrix, and the
+relative error of the float32 linear operator and predictions with respect to
+the float64 results.
+"""
+
+import time
+import numpy as np
+import scipy.linalg as la
+
+import rom_operator_inference as roi
+
+
+def _time(func, *args, **kwargs):
+    """Return the result of func() and its wall time (in seconds)."""
+    start = time.perf_counter()
+    out = func(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def _relerr(A, B):
+    """Relative Frobenius error of B with respect to A."""
+    return la.norm(A - B) / la.norm(A)
+
+
+def _data(n, k):
+    """Snapshots and velocities of the heat equation u_t = u_xx / 10."""
+    x = np.linspace(0, 1, n)[:,np.newaxis]
+    t = np.linspace(0, 1, k)
+    j = np.arange(1, 21)
+    decay = np.exp(-(j*np.pi)**2 * t[:,np.newaxis] / 10) / j    # (k,20)
+    modes = np.sin(np.pi * x * j)                               # (n,20)
+    X = modes @ decay.T
+    Xdot = modes @ (-(j*np.pi)**2 / 10 * decay).T
+    return X, Xdot, t
+
+
+def bench_precision(n=2000, ks=(1000, 5000, 20000), r=6, modelform="AH",
+                    P=1e-2):
+    """Time POD + fit + predict in double and single precision. The heat
+    equation data has no quadratic part, so the default regularization P
+    keeps the (otherwise rank-deficient) least-squares problem well posed.
+    """
+    print(f"n={n}, r={r}, modelform='{modelform}', P={P}")
+    d = roi.utils.get_least_squares_size(modelform, r)
+    print(f"{'k':>7}{'dtype':>9}{'pod':>10}{'fit':>10}{'predict':>10}"
+          f"{'D (MB)':>10}{'err(A)':>10}{'err(X)':>10}")
+    for k in ks:
+        X, Xdot, t = _data(n, k)
+        Vr = roi.pre.pod_basis(X, r)[0]
+        results = {}
+        for dtype in (np.float64, np.float32):
+            X_, Xdot_ = X.astype(dtype), Xdot.astype(dtype)
+            _, t_pod = _time(roi.pre.pod_basis, X_, r)
+            # Use the same basis (rounded to dtype) so the operators compare.
+            model = roi.InferredContinuousROM(modelform)
+            _, t_fit = _time(model.fit, Vr.astype(dtype), X_, Xdot_, P=P)
+            Xpred, t_pred = _time(model.predict, X_[:,0], t[:200])
+            if dtype is np.float64:
+                mbytes = k * d * 8 / 2**20
+            else:
+                mbytes = min(k, 8192) * (d + r) * 4 / 2**20
+            results[dtype] = (model.A_, Xpred)
+            errA = _relerr(results[np.float64][0], model.A_)
+            errX = _relerr(results[np.float64][1], Xpred)
+            print(f"{k:>7}{np.dtype(dtype).name:>9}{t_pod:>10.2e}"
+                  f"{t_fit:>10.2e}{t_pred:>10.2e}{mbytes:>10.1f}"
+                  f"{errA:>10.1e}{errX:>10.1e}")
+
+if __name__ == "__main__":
+    bench_precision()
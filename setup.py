@@ -40,6 +40,7 @@ setuptools.setup(
         "scipy>=1.3",
         "matplotlib>=3.0",
         "scikit-learn>=0.18",
+        "threadpoolctl>=2.0",
       ],
     setup_requires=["pytest-runner"],
     test_suite="pytest",
@@ -13,6 +13,7 @@ __all__ = [
             "AffineInferredContinuousROM",
           ]
 
+import types
 import numpy as np
 
 from ._base import AffineOperator, _AffineMixin
@@ -20,10 +21,9 @@ from .._base import _ContinuousROM, _DiscreteROM
 from .._inferred import (_InferredMixin,
                          InferredDiscreteROM,
                          InferredContinuousROM)
-from ...utils import (lstsq_reg,
+from ...utils import (lstsq_reg, get_least_squares_size, kronc_size,
                       expand_Hc as Hc2H,
-                      expand_Gc as Gc2G,
-                      kron2c, kron3c)
+                      expand_Gc as Gc2G)
 
 
 # Affine inferred mixin (private) =============================================
@@ -124,58 +124,43 @@ class _AffineInferredMixin(_InferredMixin, _AffineMixin):
         Xs_ = [self.project(X, 'X') for X in Xs]
         rhss_ = [self.project(rhs, 'rhs') for rhs in rhss]
 
-        # Construct the large "Data matrix" D.
-        D_blockrows = []
-        for i,(µ,X_) in enumerate(zip(µs, Xs_)):
-            row = []
+        # Construct the large "Data matrix" D, writing each (scaled) block of
+        # the nonparametric data matrix directly into its slice of D.
+        m = self.m if self.has_inputs else 0
+        sizes = {'c': 1, 'A': self.r, 'H': kronc_size(self.r, 2),
+                 'G': kronc_size(self.r, 3), 'B': m}
+        d = get_least_squares_size(self.modelform, self.r, m, affines)
+        K = sum(X_.shape[1] for X_ in Xs_)
+        D = np.empty((K,d), order='F')
+        row = 0
+        for µ, X_, U in zip(µs, Xs_, Us):
             k = X_.shape[1]
-
-            if self.has_constant:
-                ones = np.ones((k,1))
-                if 'c' in affines:
-                    row += [θ(µ) * ones for θ in affines['c']]
-                else:
-                    row.append(ones)
-
-            if self.has_linear:
-                if 'A' in affines:
-                    row += [θ(µ) * X_.T for θ in affines['A']]
-                else:
-                    row.append(X_.T)
-
-            if self.has_quadratic:
-                X2_ = kron2c(X_)
-                if 'H' in affines:
-                    row += [θ(µ) * X2_.T for θ in affines['H']]
+            if U is not None and self.m == 1:
+                U = U.reshape((1,k))
+            D0 = self._construct_data_matrix(X_, U)
+            rows = slice(row, row + k)
+            i = i0 = 0
+            for key in "cAHGB":
+                if key not in self.modelform:
+                    continue
+                block = D0[:,i0:i0+sizes[key]]
+                if key in affines:
+                    for θ in affines[key]:
+                        np.multiply(θ(µ), block, out=D[rows,i:i+sizes[key]])
+                        i += sizes[key]
                 else:
-                    row.append(X2_.T)
-
-            if self.has_cubic:
-                X3_ = kron3c(X_)
-                if 'G' in affines:
-                    row += [θ(µ) * X3_.T for θ in affines['G']]
-                else:
-                    row.append(X3_.T)
-
-            if self.has_inputs:
-                U = Us[i]
-                if self.m == 1:
-                    U = U.reshape((1,k))
-                if 'B' in affines:
-                    row += [θ(µ) * U.T for θ in affines['B']]
-                else:
-                    row.append(U.T)
-
-            D_blockrows.append(np.hstack(row))
+                    D[rows,i:i+sizes[key]] = block
+                    i += sizes[key]
+                i0 += sizes[key]
+            row += k
 
-        D = np.vstack(D_blockrows)
-        self.datacond_ = np.linalg.cond(D)      # Condition number of data.
         R = np.hstack(rhss_).T
-        self._D_ = D.copy()                     ## Save data matrix for later.
 
         # Solve for the reduced-order model operators via least squares.
-        Otrp, res = lstsq_reg(D, R, P)[0:2]
-        self.residual_ = np.sum(res)
+        if isinstance(P, (tuple, range, types.GeneratorType)):
+            P = list(P)
+        Otrp, res, _, sval = lstsq_reg(D, R, P)
+        self._set_diagnostics(D, R, Otrp, 0, P, res, sval)
 
         # Extract the reduced operators from Otrp.
         i = 0
@@ -206,7 +191,7 @@ class _AffineInferredMixin(_InferredMixin, _AffineMixin):
             self.A_ = None
 
         if self.has_quadratic:
-            _r2 = self.r * (self.r + 1) // 2
+            _r2 = kronc_size(self.r, 2)
             if 'H' in affines:
                 Hcs_ = []
                 for j in range(len(affines['H'])):
@@ -222,7 +207,7 @@ class _AffineInferredMixin(_InferredMixin, _AffineMixin):
             self.Hc_, self.H_ = None, None
 
         if self.has_cubic:
-            _r3 = self.r * (self.r + 1) * (self.r + 2) // 6
+            _r3 = kronc_size(self.r, 3)
             if 'G' in affines:
                 Gcs_ = []
                 for j in range(len(affines['G'])):
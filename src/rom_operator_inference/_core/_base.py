@@ -6,14 +6,278 @@ __all__ = []
 import os
 import h5py
 import warnings
+import functools
 import numpy as np
+import scipy.linalg as la
+from scipy import sparse
+from scipy.optimize import OptimizeResult
 from scipy.interpolate import CubicSpline
 from scipy.integrate import solve_ivp, IntegrationWarning
 
 from ..utils import (lstsq_reg,
                      expand_Hc as Hc2H, compress_H as H2Hc,
                      expand_Gc as Gc2G, compress_G as G2Gc,
-                     kron2c, kron3c)
+                     kronc, kron2c, kron3c, integrate)
+from ..utils._kronecker import _kronc_indices, _kronc_jacobian_indices
+from ..utils._integrate import _METHODS as _RK_METHODS, _IMEX
+
+
+# Helper functions (private) ==================================================
+def _reuse_output(kron):
+    """Wrap the compact Kronecker product `kron` (kron2c() or kron3c()) so
+    that products of one-dimensional vectors are written to a buffer that is
+    allocated on the first call and reused on subsequent calls.
+
+    The wrapped function is meant for the inner loop of the reduced model
+    operator f_: the returned buffer is overwritten by the next call, so it
+    should only be used immediately (e.g., multiplied by Hc_ or Gc_).
+    """
+    buffers = {}
+
+    def kron_(x):
+        if x.ndim != 1:
+            return kron(x)
+        key = (x.shape[0], x.dtype)
+        if key not in buffers:
+            buffers[key] = kron(x)
+            return buffers[key]
+        return kron(x, out=buffers[key])
+
+    return kron_
+
+
+def _compact_jacobian(Oc, p):
+    """Get a function computing the (r,r) Jacobian of x -> Oc @ kronc(x, p)
+    for a compact matricized operator Oc (e.g., Hc_ with p = 2 or Gc_ with
+    p = 3), i.e., Oc @ D(x) where D(x) is the sparse (s,r) Jacobian of the
+    compact Kronecker product. The sparsity structure of D(x) is computed
+    once for each (r,p); each call only fills in its nonzero entries.
+    """
+    r, s = Oc.shape
+    indptr, indices, columns, counts = _kronc_jacobian_indices(r, p)
+    kron_ = (lambda x: x) if p == 2 else _reuse_output(
+                                            functools.partial(kronc, p=p-1))
+    OcT = np.asarray(Oc.T, order='C')
+
+    def jac_(x):
+        D = sparse.csr_matrix((counts*kron_(x)[columns], indices, indptr),
+                              shape=(s,r))
+        return (D.T @ OcT).T
+
+    return jac_
+
+
+def _fused_f_(model, args, modelform=None):
+    """Generate the reduced model operator f_ of `model` as a single product
+
+        f_(x, u) = O @ z(x, u),     O = [ c | A | Hc | Gc | B ],
+                                    z = [ 1, x, kron2c(x), kron3c(x), u ],
+
+    keeping only the terms of model.modelform. The operators are stacked once
+    and the feature vector z is written to a buffer that is reused across
+    calls, so each evaluation is one matrix-vector product. Two-dimensional
+    states are evaluated column-wise.
+
+    Parameters
+    ----------
+    model : _BaseROM
+        A trained model (with operators c_, A_, Hc_, Gc_, and/or B_).
+
+    args : str
+        The arguments of f_, e.g., "x_,u" (discrete) or "t,x_,u" (continuous).
+        If "t" is an argument, the input u is a function to be evaluated at t.
+
+    modelform : str or None
+        The terms to include, a nonempty subset of model.modelform. If None
+        (default), include all of model.modelform.
+
+    Returns
+    -------
+    f_ : func
+        A lambda function with the given arguments.
+    """
+    form = model.modelform if modelform is None else modelform
+    operators = dict(c=model.c_, A=model.A_, H=model.Hc_, G=model.Gc_,
+                     B=model.B_)
+    blocks = [np.reshape(operators[key], (-1,1))
+              if key in "cB" and np.ndim(operators[key]) < 2
+              else np.atleast_2d(operators[key]) for key in form]
+    O = np.hstack(blocks)
+    r = O.shape[0]
+    bounds = np.cumsum([0] + [block.shape[1] for block in blocks])
+    z = np.zeros(O.shape[1], dtype=O.dtype)
+
+    def _stack(x_, u):
+        """Feature matrix for the columns of a two-dimensional state."""
+        k = x_.shape[1]
+        if "B" in form and np.ndim(u) < 2:
+            u = np.reshape(u, (1,-1) if bounds[-1]-bounds[-2] == 1 else (-1,1))
+        features = dict(c=lambda: np.ones((1,k)), A=lambda: x_,
+                        H=lambda: kron2c(x_), G=lambda: kron3c(x_),
+                        B=lambda: np.broadcast_to(u, (u.shape[0],k)))
+        return np.vstack([features[key]() for key in form])
+
+    # Write the source of the feature map with one statement per term.
+    namespace = dict(_O=O, _z=z, _stack=_stack, _multiply=np.multiply,
+                     _kron3c=kron3c)
+    source = ["def _features(x_, u):",
+              "    if x_.ndim != 1:",
+              "        return _stack(x_, u)"]
+    for key, start, stop in zip(form, bounds[:-1], bounds[1:]):
+        namespace[f"_z{key}"] = z[start:stop]
+        if key == "c":
+            z[start] = 1
+        elif key == "A":
+            source.append("    _zA[...] = x_")
+        elif key == "H":
+            namespace["_i2"], namespace["_j2"] = _kronc_indices(r, 2)
+            source.append("    _multiply(x_[_i2], x_[_j2], out=_zH)")
+        elif key == "G" and "H" in form:
+            # Reuse the quadratic terms: kron3c(x)[l] = x[i[l]]*kron2c(x)[j[l]].
+            namespace["_i3"], namespace["_j3"] = _kronc_indices(r, 3)
+            source.append("    _multiply(x_[_i3], _zH[_j3], out=_zG)")
+        elif key == "G":
+            source.append("    _kron3c(x_, out=_zG)")
+        elif key == "B":
+            source.append("    _zB[...] = u")
+    source.append("    return _z")
+    exec("\n".join(source), namespace)
+
+    u = ("u(t)" if "t" in args else "u") if "B" in form else "None"
+    return eval(f"lambda {args}: _O @ _features(x_, {u})", namespace)
+
+
+def _linear_propagators(A, C, dt, hold):
+    """Get the exact propagators of dx / dt = A x + C w(t) over one step of
+    size dt, from the exponential of an augmented matrix:
+
+        x(t+dt) = Phi x(t) + G0 w(t) + G1 (w(t+dt) - w(t)),
+
+    where w is held constant over the step (hold='zoh', so G1 = 0) or
+    interpolated linearly (hold='foh').
+
+    Parameters
+    ----------
+    A : (r,r) ndarray
+        The linear operator.
+
+    C : (r,q) ndarray
+        The operator acting on the forcing w(t).
+
+    dt : float
+        The step size.
+
+    hold : str
+        The interpolation of w over the step, 'zoh' or 'foh'.
+
+    Returns
+    -------
+    Phi : (r,r) ndarray
+    G0, G1 : (r,q) ndarrays
+    """
+    r, q = C.shape
+    size = r + (2*q if hold == "foh" else q)
+    M = np.zeros((size,size))
+    M[:r,:r], M[:r,r:r+q] = A, C
+    if hold == "foh":
+        # The extra block v' = 0 drives w' = v / dt, so v = w(t+dt) - w(t).
+        M[r:r+q,r+q:] = np.eye(q) / dt
+    E = la.expm(M*dt)
+    G1 = E[:r,r+q:] if hold == "foh" else np.zeros((r,q))
+    return E[:r,:r], E[:r,r:r+q], G1
+
+
+def _linear_scan(A, X0, F, niters):
+    """Evaluate the linear recursion x_{j+1} = A x_{j} + f_{j} for
+    j = 0, ..., niters-2 as a blocked scan.
+
+    The iterations are split into blocks of b ~ sqrt(niters) steps. The
+    contributions of the forcing terms to the end of each block are
+    accumulated for all blocks at once, the states at the start of each block
+    then follow from x_{(k+1)b} = A^b x_{kb} + (forcing), and finally all the
+    blocks are filled in together. Each of the ~3 sqrt(niters) sequential
+    steps is a matrix-matrix product.
+
+    Parameters
+    ----------
+    A : (r,r) ndarray
+        The linear operator.
+
+    X0 : (r,N) ndarray
+        The initial states.
+
+    F : (r,niters-1,N) or (r,niters-1,1) ndarray or None
+        The forcing terms f_{j} (None if there are none).
+
+    niters : int
+        The number of states to compute, including X0.
+
+    Returns
+    -------
+    X : (r,niters,N) ndarray
+        The states x_{j}.
+    """
+    r, N = X0.shape
+    b = max(1, int(np.ceil(np.sqrt(niters))))
+    nblocks = max(1, int(np.ceil(niters / b)))
+
+    # Arrange the forcing in blocks, Fb[i] = [f_{i}, f_{b+i}, f_{2b+i}, ...].
+    if F is not None:
+        Fb = np.zeros((r, nblocks*b, N))
+        Fb[:,:niters-1] = F
+        Fb = Fb.reshape((r,nblocks,b,N)).transpose(2,0,1,3).copy()
+
+    # Contribution of the forcing to the end of each block.
+    Z = np.empty((b,r,nblocks,N))
+    starts = Z[0]
+    if F is not None:
+        Y = np.zeros((r,nblocks*N))
+        for i in range(b):
+            Y = A @ Y + Fb[i].reshape((r,-1))
+        Y = Y.reshape((r,nblocks,N))
+
+    # States at the start of each block.
+    Ab = np.linalg.matrix_power(A, b)
+    starts[:,0] = X0
+    for k in range(nblocks-1):
+        starts[:,k+1] = Ab @ starts[:,k]
+        if F is not None:
+            starts[:,k+1] += Y[:,k]
+
+    # Fill in the blocks.
+    for i in range(b-1):
+        Zi = A @ Z[i].reshape((r,-1))
+        if F is not None:
+            Zi += Fb[i].reshape((r,-1))
+        Z[i+1] = Zi.reshape((r,nblocks,N))
+
+    return Z.transpose(1,2,0,3).reshape((r,nblocks*b,N))[:,:niters]
+
+
+def _operator_property(name):
+    """Property for the reduced operator attribute `name` (e.g., "A_").
+    Setting or deleting the operator discards the fused operator f_, which
+    is rebuilt from the current operators the next time it is accessed.
+    """
+    key = '_' + name
+
+    def fget(self):
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no "
+                                 f"attribute '{name}'") from None
+
+    def fset(self, op):
+        self.__dict__[key] = op
+        self._f_ = None
+
+    def fdel(self):
+        fget(self)
+        del self.__dict__[key]
+        self._f_ = None
+
+    return property(fget, fset, fdel)
 
 
 # Base classes (private) ======================================================
@@ -60,6 +324,25 @@ class _BaseROM:
     # def has_outputs(self):
     #     return "C" in self._form
 
+    c_ = _operator_property("c_")
+    A_ = _operator_property("A_")
+    Hc_ = _operator_property("Hc_")
+    Gc_ = _operator_property("Gc_")
+    B_ = _operator_property("B_")
+
+    @property
+    def f_(self):
+        """Reduced model operator, (re)constructed with _construct_f_() if an
+        operator has been set since f_ was last constructed.
+        """
+        if getattr(self, "_f_", None) is None:
+            self._construct_f_()
+        return self._f_
+
+    @f_.setter
+    def f_(self, f_):
+        self._f_ = f_
+
     def _check_modelform(self, trained=False):
         """Ensure that self.modelform is valid."""
         for key in self.modelform:
@@ -194,73 +477,25 @@ class _DiscreteROM(_BaseROM):
         """Define the attribute self.f_ based on the computed operators."""
         self._check_modelform(trained=True)
 
-        # No control inputs, so f = f(x).
-        if self.modelform == "c":
-            f_ = lambda x_: self.c_
-        elif self.modelform == "A":
-            f_ = lambda x_: self.A_@x_
-        elif self.modelform == "H":
-            f_ = lambda x_: self.Hc_@kron2c(x_)
-        elif self.modelform == "G":
-            f_ = lambda x_: self.Gc_@kron3c(x_)
-        elif self.modelform == "cA":
-            f_ = lambda x_: self.c_ + self.A_@x_
-        elif self.modelform == "cH":
-            f_ = lambda x_: self.c_ + self.Hc_@kron2c(x_)
-        elif self.modelform == "cG":
-            f_ = lambda x_: self.c_ + self.Gc_@kron3c(x_)
-        elif self.modelform == "AH":
-            f_ = lambda x_: self.A_@x_ + self.Hc_@kron2c(x_)
-        elif self.modelform == "AG":
-            f_ = lambda x_: self.A_@x_ + self.Gc_@kron3c(x_)
-        elif self.modelform == "HG":
-            f_ = lambda x_: self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-        elif self.modelform == "cAH":
-            f_ = lambda x_: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_)
-        elif self.modelform == "cAG":
-            f_ = lambda x_: self.c_ + self.A_@x_ + self.Gc_@kron3c(x_)
-        elif self.modelform == "cHG":
-            f_ = lambda x_: self.c_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-        elif self.modelform == "AHG":
-            f_ = lambda x_: self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-        elif self.modelform == "cAHG":
-            f_ = lambda x_: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-
-        # Has control inputs, so f = f(x, u).
-        elif self.modelform == "B":
-            f_ = lambda x_,u: self.B_@u
-        elif self.modelform == "cB":
-            f_ = lambda x_,u: self.c_ + self.B_@u
-        elif self.modelform == "AB":
-            f_ = lambda x_,u: self.A_@x_ + self.B_@u
-        elif self.modelform == "HB":
-            f_ = lambda x_,u: self.Hc_@kron2c(x_) + self.B_@u
-        elif self.modelform == "GB":
-            f_ = lambda x_,u: self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "cAB":
-            f_ = lambda x_,u: self.c_ + self.A_@x_ + self.B_@u
-        elif self.modelform == "cHB":
-            f_ = lambda x_,u: self.c_ + self.Hc_@kron2c(x_) + self.B_@u
-        elif self.modelform == "cGB":
-            f_ = lambda x_,u: self.c_ + self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "AHB":
-            f_ = lambda x_,u: self.A_@x_ + self.Hc_@kron2c(x_) + self.B_@u
-        elif self.modelform == "AGB":
-            f_ = lambda x_,u: self.A_@x_ + self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "HGB":
-            f_ = lambda x_,u: self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "cAHB":
-            f_ = lambda x_,u: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_) + self.B_@u
-        elif self.modelform == "cAGB":
-            f_ = lambda x_,u: self.c_ + self.A_@x_ + self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "cHGB":
-            f_ = lambda x_,u: self.c_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "AHGB":
-            f_ = lambda x_,u: self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u
-        elif self.modelform == "cAHGB":
-            f_ = lambda x_,u: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u
-
-        self.f_ = f_
+        args = "x_,u" if self.has_inputs else "x_"
+        self.f_ = _fused_f_(self, args)
+
+    def _linear_predict(self, X0_, niters, U):
+        """Step forward a linear ROM (with a linear term but no quadratic or
+        cubic terms) from the initial states X0_ (r,N) with inputs U
+        (m,niters-1) or (m,niters-1,N), using a blocked scan instead of one
+        matrix-vector product per step (see _linear_scan()).
+        """
+        F = None
+        if self.has_inputs:
+            U = U[:,:niters-1]
+            F = np.tensordot(np.reshape(self.B_, (self.r,-1)), U, axes=1)
+            if F.ndim == 2:
+                F = F[...,np.newaxis]
+        if self.has_constant:
+            c_ = self.c_.reshape((-1,1,1))
+            F = c_ + (F if F is not None else np.zeros((1,niters-1,1)))
+        return _linear_scan(self.A_, X0_, F, niters)
 
     def fit(self, *args, **kwargs):             # pragma: no cover
         raise NotImplementedError("fit() must be implemented by child classes")
@@ -286,7 +521,14 @@ class _DiscreteROM(_BaseROM):
             The approximate solution to the system, including the given
             initial condition. If the basis Vr is None, return solutions in the
             reduced r-dimensional subspace (r,niters). Otherwise, map solutions
-            to the full n-dimensional space with Vr (n,niters).
+            to the full n-dimensional space with Vr (n,niters), in the
+            precision of Vr (e.g., float32 if Vr is float32).
+
+        Notes
+        -----
+        Linear models (modelforms "A", "cA", "AB", and "cAB") are stepped
+        forward with a blocked scan of about 3*sqrt(niters) matrix-matrix
+        products instead of niters matrix-vector products.
         """
         # Verify modelform.
         self._check_modelform(trained=True)
@@ -312,14 +554,97 @@ class _DiscreteROM(_BaseROM):
             if U.ndim != 2 or U.shape[0] != self.m or U.shape[1] < niters - 1:
                 raise ValueError("invalid input shape "
                                  f"({U.shape} != {(self.m,niters-1)}")
+        if self.has_linear and not (self.has_quadratic or self.has_cubic) \
+                                                        and niters > 1:
+            X_ = self._linear_predict(X_[:,:1], niters, U)[...,0]
+        elif self.has_inputs:
+            f_ = self.f_
+            for j in range(niters-1):
+                X_[:,j+1] = f_(X_[:,j], U[:,j])         # f(xj,uj)
+        else:
+            f_ = self.f_
+            for j in range(niters-1):
+                X_[:,j+1] = f_(X_[:,j])                 # f(xj)
+
+        # Reconstruct the approximation to the full-order model if possible,
+        # in the precision of the basis (e.g., float32).
+        if self.Vr is None:
+            return X_
+        return self.Vr @ X_.astype(self.Vr.dtype, copy=False)
+
+    def predict_ensemble(self, X0, niters, U=None):
+        """Step forward the learned ROM `niters` steps from several initial
+        conditions at once. The states of all N ensemble members are advanced
+        together, so each step is one matrix-matrix product.
+
+        Parameters
+        ----------
+        X0 : (n,N) or (r,N) ndarray
+            The initial state vectors of the N ensemble members (columns),
+            either full order or projected to reduced order.
+
+        niters : int
+            The number of times to step the system forward.
+
+        U : (m,niters-1) or (m,niters-1,N) ndarray
+            The inputs for the next niters-1 time steps, either shared by all
+            ensemble members or given for each member (last axis).
+
+        Returns
+        -------
+        X_ROM : (n,niters,N) or (r,niters,N) ndarray
+            The approximate solutions, including the given initial conditions,
+            so that X_ROM[...,i] = predict(X0[:,i], niters, U[...,i]). If the
+            basis Vr is None, return solutions in the reduced r-dimensional
+            subspace. Otherwise, map the solutions to the full n-dimensional
+            space with Vr, in the precision of Vr.
+        """
+        # Verify modelform.
+        self._check_modelform(trained=True)
+        self._check_inputargs(U, 'U')
+
+        # Project initial conditions (if needed).
+        if X0.ndim != 2:
+            raise ValueError("initial conditions X0 must be two-dimensional")
+        X0_ = self.project(X0, 'X0')
+        N = X0_.shape[1]
+
+        # Verify iteration argument.
+        if not isinstance(niters, int) or niters < 0:
+            raise ValueError("argument 'niters' must be a nonnegative integer")
+
+        # Create the solution array and fill in the initial conditions.
+        X_ = np.empty((self.r,niters,N))
+        X_[:,0] = X0_
+
+        # Run the iteration on all ensemble members together.
+        if self.has_inputs:
+            if callable(U):
+                raise TypeError("input U must be an array, not a callable")
+            # Validate shape of input, reshaping if input is 1d.
+            U = np.atleast_2d(U)
+            if U.shape[0] != self.m or U.shape[1] < niters - 1 \
+                                    or U.shape[2:] not in {(), (N,)}:
+                raise ValueError("invalid input shape "
+                                 f"({U.shape} != {(self.m,niters-1)}"
+                                 f" or {(self.m,niters-1,N)})")
+        if self.has_linear and not (self.has_quadratic or self.has_cubic) \
+                                                        and niters > 1:
+            X_ = self._linear_predict(X0_, niters, U)
+        elif self.has_inputs:
+            f_ = self.f_
             for j in range(niters-1):
-                X_[:,j+1] = self.f_(X_[:,j], U[:,j])    # f(xj,uj)
+                X_[:,j+1] = f_(X_[:,j], U[:,j])         # f(Xj,Uj)
         else:
+            f_ = self.f_
             for j in range(niters-1):
-                X_[:,j+1] = self.f_(X_[:,j])            # f(xj)
+                X_[:,j+1] = f_(X_[:,j])                 # f(Xj)
 
         # Reconstruct the approximation to the full-order model if possible.
-        return self.Vr @ X_ if self.Vr is not None else X_
+        if self.Vr is None:
+            return X_
+        X_ = X_.astype(self.Vr.dtype, copy=False).reshape((self.r,-1))
+        return (self.Vr @ X_).reshape((self.n,niters,N))
 
 
 class _ContinuousROM(_BaseROM):
@@ -334,87 +659,111 @@ class _ContinuousROM(_BaseROM):
         """Define the attribute self.f_ based on the computed operators."""
         self._check_modelform(trained=True)
 
-        # self._jac = None
-        # No control inputs.
-        if self.modelform == "c":
-            f_ = lambda t,x_: self.c_
-            # self._jac = np.zeros((self.r, self.r))
-        elif self.modelform == "A":
-            f_ = lambda t,x_: self.A_@x_
-            # self._jac = self.A_
-        elif self.modelform == "H":
-            f_ = lambda t,x_: self.Hc_@kron2c(x_)
-        elif self.modelform == "G":
-            f_ = lambda t,x_: self.Gc_@kron3c(x_)
-        elif self.modelform == "cA":
-            f_ = lambda t,x_: self.c_ + self.A_@x_
-            # self._jac = self.A_
-        elif self.modelform == "cH":
-            f_ = lambda t,x_: self.c_ + self.Hc_@kron2c(x_)
-        elif self.modelform == "cG":
-            f_ = lambda t,x_: self.c_ + self.Gc_@kron3c(x_)
-        elif self.modelform == "AH":
-            f_ = lambda t,x_: self.A_@x_ + self.Hc_@kron2c(x_)
-        elif self.modelform == "AG":
-            f_ = lambda t,x_: self.A_@x_ + self.Gc_@kron3c(x_)
-        elif self.modelform == "HG":
-            f_ = lambda t,x_: self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-        elif self.modelform == "cAH":
-            f_ = lambda t,x_: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_)
-        elif self.modelform == "cAG":
-            f_ = lambda t,x_: self.c_ + self.A_@x_ + self.Gc_@kron3c(x_)
-        elif self.modelform == "cHG":
-            f_ = lambda t,x_: self.c_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-        elif self.modelform == "AHG":
-            f_ = lambda t,x_: self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-        elif self.modelform == "cAHG":
-            f_ = lambda t,x_: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_)
-
-        # Has control inputs.
-        elif self.modelform == "B":
-            f_ = lambda t,x_,u: self.B_@u(t)
-            # self._jac = np.zeros((self.r, self.r))
-        elif self.modelform == "cB":
-            f_ = lambda t,x_,u: self.c_ + self.B_@u(t)
-            # self._jac = np.zeros((self.r, self.r))
-        elif self.modelform == "AB":
-            f_ = lambda t,x_,u: self.A_@x_ + self.B_@u(t)
-            # self._jac = self.A_
-        elif self.modelform == "HB":
-            f_ = lambda t,x_,u: self.Hc_@kron2c(x_) + self.B_@u(t)
-        elif self.modelform == "GB":
-            f_ = lambda t,x_,u: self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "cAB":
-            f_ = lambda t,x_,u: self.c_ + self.A_@x_ + self.B_@u(t)
-            # self._jac = self.A_
-        elif self.modelform == "cHB":
-            f_ = lambda t,x_,u: self.c_ + self.Hc_@kron2c(x_) + self.B_@u(t)
-        elif self.modelform == "cGB":
-            f_ = lambda t,x_,u: self.c_ + self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "AHB":
-            f_ = lambda t,x_,u: self.A_@x_ + self.Hc_@kron2c(x_) + self.B_@u(t)
-        elif self.modelform == "AGB":
-            f_ = lambda t,x_,u: self.A_@x_ + self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "HGB":
-            f_ = lambda t,x_,u: self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "cAHB":
-            f_ = lambda t,x_,u: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_) + self.B_@u(t)
-        elif self.modelform == "cAGB":
-            f_ = lambda t,x_,u: self.c_ + self.A_@x_ + self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "cHGB":
-            f_ = lambda t,x_,u: self.c_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "AHGB":
-            f_ = lambda t,x_,u: self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u(t)
-        elif self.modelform == "cAHGB":
-            f_ = lambda t,x_,u: self.c_ + self.A_@x_ + self.Hc_@kron2c(x_) + self.Gc_@kron3c(x_) + self.B_@u(t)
-
-        self.f_ = f_
+        args = "t,x_,u" if self.has_inputs else "t,x_"
+        self.f_ = _fused_f_(self, args)
+        self._propagators = {}
+
+        # Jacobian of f_ with respect to the state (for implicit integrators).
+        jac0 = self.A_ if 'A' in self.modelform else np.zeros((self.r,self.r))
+        jacs = []
+        if 'H' in self.modelform:
+            jacs.append(_compact_jacobian(self.Hc_, 2))
+        if 'G' in self.modelform:
+            jacs.append(_compact_jacobian(self.Gc_, 3))
+        if jacs:
+            self._jac = lambda t,x_: sum((jac_(x_) for jac_ in jacs), jac0)
+        else:
+            self._jac = jac0
+
+    def _imex_split(self, u):
+        """Split the right-hand side f_ for the built-in IMEX integrators into
+        the linear operator A_ (treated implicitly) and a function of the
+        remaining terms (treated explicitly) for the input function u.
+        """
+        A_ = self.A_ if self.has_linear else np.zeros((self.r,self.r))
+        form = self.modelform.replace('A', '')
+        if not form:
+            return (lambda t,x_: np.zeros_like(x_)), A_
+        if self.has_inputs:
+            g_ = _fused_f_(self, "t,x_,u", form)
+            return (lambda t,x_: g_(t, x_, u)), A_
+        return _fused_f_(self, "t,x_", form), A_
+
+    def _propagate(self, x0_, t, u, method="expm", hold="foh"):
+        """Integrate a linear ROM (no quadratic or cubic terms) exactly,
+
+            x_{k+1} = Phi x_{k} + G0 w_{k} + G1 (w_{k+1} - w_{k}),
+
+        where w = [1, u] collects the constant and input terms. The
+        propagators Phi, G0, and G1 are computed once for each distinct step
+        size of `t` and input hold (see _linear_propagators()) and are cached
+        until the operators change. Returns a solve_ivp()-like result.
+        """
+        if self.has_quadratic or self.has_cubic:
+            raise ValueError(f"method '{method}' requires a linear model"
+                             " (no 'H' or 'G' terms)")
+        if hold not in ("zoh", "foh"):
+            raise ValueError(f"invalid hold '{hold}'; options are zoh, foh")
+        nt = t.shape[0]
+
+        # Sample the forcing w = [1, u] on the time grid.
+        Cs, Ws = [], []
+        if self.has_inputs:
+            U = np.stack([u(s) for s in t], axis=1)
+            Cs.append(np.reshape(self.B_, (self.r,-1)))
+            Ws.append(U)
+        if self.has_constant:
+            Cs.insert(0, np.reshape(self.c_, (-1,1)))
+            Ws.insert(0, np.ones((1,) + (Ws[0].shape[1:] if Ws else (nt,))))
+        C = np.hstack(Cs) if Cs else np.zeros((self.r,0))
+        A_ = self.A_ if self.has_linear else np.zeros((self.r,self.r))
+
+        # Group the steps by size (up to rounding) and get the propagators.
+        dts = np.diff(t)
+        scale = 10.0**(np.floor(np.log10(np.max(np.abs(dts)))) - 12) \
+                                                        if nt > 1 else 1
+        keys, steps = np.unique(np.round(dts / scale) * scale,
+                                return_inverse=True)
+        props = []
+        for dt in keys:
+            if (dt, hold) not in self._propagators:
+                self._propagators[(dt, hold)] = _linear_propagators(A_, C,
+                                                                    dt, hold)
+            props.append(self._propagators[(dt, hold)])
+
+        # Forcing terms of all the steps at once.
+        X = np.empty((nt,) + x0_.shape)
+        F = None
+        if Cs:
+            W = np.concatenate(Ws)
+            F = np.empty((nt-1,) + np.broadcast_shapes(x0_.shape,
+                                                       (self.r,) + W.shape[2:]))
+            for i, (_, G0, G1) in enumerate(props):
+                mask = (steps == i)
+                F[mask] = np.moveaxis(
+                    np.tensordot(G0, W[:,:-1][:,mask], axes=1)
+                    + np.tensordot(G1, np.diff(W, axis=1)[:,mask], axes=1),
+                    1, 0)
+
+        # Step forward: one small matrix-vector product per step.
+        Phis = [Phi for Phi, _, _ in props]
+        X[0] = x = x0_
+        for k, i in enumerate(steps.tolist()):
+            x = Phis[i] @ x
+            if F is not None:
+                x = x + F[k]
+            X[k+1] = x
+
+        return OptimizeResult(t=t, y=np.moveaxis(X, 0, 1), nfev=0, njev=0,
+                              nlu=0, status=0, success=True,
+                              message="Exact integration of a linear model.")
 
     def fit(self, *args, **kwargs):             # pragma: no cover
         raise NotImplementedError("fit() must be implemented by child classes")
 
     def predict(self, x0, t, u=None, **options):
-        """Simulate the learned ROM with scipy.integrate.solve_ivp().
+        """Simulate the learned ROM with scipy.integrate.solve_ivp() or with
+        one of the built-in explicit integrators (see utils.integrate()).
 
         Parameters
         ----------
@@ -434,6 +783,19 @@ class _ContinuousROM(_BaseROM):
             Arguments for solver.integrate.solve_ivp(), such as the following:
             method : str
                 The ODE solver for the reduced-order system.
+                * 'euler', 'ssprk3', 'rk4', 'dopri5': Built-in explicit
+                    Runge-Kutta methods (see utils.integrate()), which have
+                    much less overhead than solve_ivp() for small r.
+                * 'imex_euler', 'cnab2', 'ars222': Built-in fixed-step
+                    implicit-explicit methods (see utils.integrate()) that
+                    treat the (possibly stiff) linear term A_ implicitly and
+                    all other terms explicitly. The step size is the spacing
+                    of `t` (or max_step, if smaller).
+                * 'expm': Exact integration of linear models (no 'H' or 'G'
+                    terms) with matrix exponentials, one per distinct step
+                    size of `t`, cached across calls. Between the times `t`,
+                    the input is held constant (hold='zoh') or interpolated
+                    linearly (hold='foh', default).
                 * 'RK45' (default): Explicit Runge-Kutta method of order 5(4).
                 * 'RK23': Explicit Runge-Kutta method of order 3(2).
                 * 'Radau': Implicit Runge-Kutta method of the Radau IIA family
@@ -445,6 +807,11 @@ class _ContinuousROM(_BaseROM):
                     and switching. This wraps the Fortran solver from ODEPACK.
             max_step : float
                 The maximimum allowed integration step size.
+            jac : callable or (r,r) ndarray
+                The Jacobian of the reduced-order system with respect to the
+                state. If not given, the implicit solvers 'Radau', 'BDF', and
+                'LSODA' use the exact Jacobian of the learned operators
+                instead of a finite difference approximation.
             See https://docs.scipy.org/doc/scipy/reference/integrate.html.
 
         Returns
@@ -453,7 +820,8 @@ class _ContinuousROM(_BaseROM):
             The approximate solution to the system over the time domain `t`.
             If the basis Vr is None, return solutions in the reduced
             r-dimensional subspace (r,nt). Otherwise, map the solutions to the
-            full n-dimensional space with Vr (n,nt).
+            full n-dimensional space with Vr (n,nt), in the precision of Vr
+            (e.g., float32 if Vr is float32).
         """
         # Verify modelform.
         self._check_modelform(trained=True)
@@ -494,21 +862,153 @@ class _ContinuousROM(_BaseROM):
                                      f"({U.shape} != {(self.m,nt)}")
                 u = CubicSpline(t, U, axis=1)
 
+        # Get f_ first: it (and with it the Jacobian and the cached
+        # propagators) is rebuilt if the operators have been set since.
+        f_ = self.f_
+        fun = (lambda t,x_: f_(t, x_, u)) if self.has_inputs else f_
+
+        # Use the exact Jacobian for implicit solvers (unless given).
+        if options.get("method") in ("Radau", "BDF", "LSODA"):
+            options.setdefault("jac", self._jac)
+
         # Integrate the reduced-order model.
-        fun = (lambda t,x_: self.f_(t, x_, u)) if self.has_inputs else self.f_
-        self.sol_ = solve_ivp(fun,              # Integrate f_(t, x_, u)
-                              [t[0], t[-1]],    # over this time interval
-                              x0_,              # with this initial condition
-                              t_eval=t,         # evaluated at these points
-                              # jac=self._jac,    # with this Jacobian
-                              **options)        # with these solver options.
+        if options.get("method") == "expm":
+            self.sol_ = self._propagate(x0_, t, u, **options)
+        elif options.get("method") in _RK_METHODS:
+            if options["method"] in _IMEX:
+                fun, options["A"] = self._imex_split(u)
+            self.sol_ = integrate(fun, t, x0_, **options)
+        else:
+            self.sol_ = solve_ivp(fun,              # Integrate f_(t, x_, u)
+                                  [t[0], t[-1]],    # over this time interval
+                                  x0_,              # with this initial value
+                                  t_eval=t,         # evaluated at these points
+                                  **options)        # with these options.
+
+        # Raise warnings if the integration failed.
+        if not self.sol_.success:               # pragma: no cover
+            warnings.warn(self.sol_.message, IntegrationWarning)
+
+        # Reconstruct the approximation to the full-order model in the
+        # precision of the basis (e.g., float32).
+        if self.Vr is None:
+            return self.sol_.y
+        return self.Vr @ self.sol_.y.astype(self.Vr.dtype, copy=False)
+
+    def predict_ensemble(self, X0, t, u=None, **options):
+        """Simulate the learned ROM from several initial conditions at once
+        with a single call to scipy.integrate.solve_ivp() or to one of the
+        built-in explicit integrators (see utils.integrate()). The N ensemble
+        members are integrated as one system of dimension rN (with shared
+        time steps), so each right-hand side evaluation is one matrix-matrix
+        product.
+
+        Parameters
+        ----------
+        X0 : (n,N) or (r,N) ndarray
+            The initial state vectors of the N ensemble members (columns),
+            either full order or projected to reduced order.
+
+        t : (nt,) ndarray
+            The time domain over which to integrate the reduced-order system.
+
+        u : callable or (m,nt) or (m,nt,N) ndarray
+            The input as a function of time, returning an (m,) ndarray shared
+            by all ensemble members or an (m,N) ndarray with one column per
+            member; or the inputs at the times `t`, either shared or given for
+            each member (last axis). Arrays are interpolated with a cubic
+            spline as in predict().
+
+        options
+            Arguments for solver.integrate.solve_ivp(), see predict().
+
+        Returns
+        -------
+        X_ROM : (n,nt,N) or (r,nt,N) ndarray
+            The approximate solutions over the time domain `t`, so that
+            X_ROM[...,i] approximates predict(X0[:,i], t, u[...,i]). If the
+            basis Vr is None, return solutions in the reduced r-dimensional
+            subspace. Otherwise, map the solutions to the full n-dimensional
+            space with Vr, in the precision of Vr.
+        """
+        # Verify modelform.
+        self._check_modelform(trained=True)
+        self._check_inputargs(u, 'u')
+
+        # Project initial conditions (if needed).
+        if X0.ndim != 2:
+            raise ValueError("initial conditions X0 must be two-dimensional")
+        X0_ = self.project(X0, 'X0')
+        r, N = X0_.shape
+
+        # Verify time domain.
+        if t.ndim != 1:
+            raise ValueError("time 't' must be one-dimensional")
+        nt = t.shape[0]
+
+        # Interpret control input argument `u` (as a function of time).
+        if self.has_inputs:
+            if callable(u):
+                if np.size(u(t[0])) not in {self.m, self.m*N}:
+                    raise ValueError("input function u() must return"
+                                     f" ndarray of shape (m,)={(self.m,)}"
+                                     f" or (m,N)={(self.m,N)}")
+                _u = u
+                u = lambda s: np.reshape(_u(s), (self.m,-1))
+            else:
+                U = np.asarray(u)
+                if U.ndim == 1 and self.m == 1:
+                    U = U.reshape((1,-1))
+                if U.shape not in {(self.m,nt), (self.m,nt,N)}:
+                    raise ValueError("invalid input shape "
+                                     f"({U.shape} != {(self.m,nt)}"
+                                     f" or {(self.m,nt,N)})")
+                u = CubicSpline(t, U, axis=1)
+
+        # The built-in integrators advance the (r,N) block of states directly.
+        # (Getting f_ also rebuilds the Jacobian and propagators if needed.)
+        g_ = self.f_
+        f_ = (lambda t,X_: g_(t, X_, u)) if self.has_inputs else g_
+        if options.get("method") in _RK_METHODS + ("expm",):
+            if options["method"] == "expm":
+                self.sol_ = self._propagate(X0_, t, u, **options)
+            else:
+                if options["method"] in _IMEX:
+                    f_, options["A"] = self._imex_split(u)
+                self.sol_ = integrate(f_, t, X0_, **options)
+            if not self.sol_.success:           # pragma: no cover
+                warnings.warn(self.sol_.message, IntegrationWarning)
+            if self.Vr is None:
+                return self.sol_.y
+            X_ = self.sol_.y.astype(self.Vr.dtype).reshape((r,-1))
+            return (self.Vr @ X_).reshape((self.n,-1,N))
+
+        # Otherwise, integrate the members as one system; the state vector
+        # stacks the members one after the other, so the Jacobian is block
+        # diagonal.
+        fun = lambda t,x_: f_(t, x_.reshape((N,r)).T).T.ravel()
+        if options.get("method") in ("Radau", "BDF", "LSODA") \
+                                            and "jac" not in options:
+            if callable(self._jac):
+                options["jac"] = lambda t,x_: sparse.block_diag(
+                    [self._jac(t, y_) for y_ in x_.reshape((N,r))],
+                    format="csc")
+            else:
+                options["jac"] = sparse.kron(sparse.identity(N), self._jac,
+                                             format="csc")
+        self.sol_ = solve_ivp(fun, [t[0], t[-1]], X0_.T.ravel(),
+                              t_eval=t, **options)
 
         # Raise warnings if the integration failed.
         if not self.sol_.success:               # pragma: no cover
             warnings.warn(self.sol_.message, IntegrationWarning)
 
-        # Reconstruct the approximation to the full-order model.
-        return self.Vr @ self.sol_.y if self.Vr is not None else self.sol_.y
+        # Reconstruct the approximation to the full-order model if possible.
+        X_ = self.sol_.y.reshape((N,r,-1)).transpose((1,2,0))
+        if self.Vr is None:
+            return X_
+        X_ = X_.astype(self.Vr.dtype).reshape((r,-1))
+        return (self.Vr @ X_).reshape((self.n,-1,N))
 
 
 # Mixin for parametric / nonparametric classes (private) ======================
@@ -648,6 +1148,4 @@ class _ParametricMixin:
 # Future additions ------------------------------------------------------------
 # TODO: Account for state / input interactions (N).
 # TODO: save_model() for parametric forms.
-# TODO: jacobians for each model form in the continuous case.
 # TODO: self.p = parameter size for parametric classes (+ shape checking)
-# TODO: programmatic self.f_ = eval("lambda...")
@@ -13,15 +13,175 @@ __all__ = [
             "InferredContinuousROM",
           ]
 
+import os
+import copy
+import types
+import multiprocessing
 import numpy as np
+import scipy.sparse.linalg as spla
 
 from ._base import _DiscreteROM, _ContinuousROM, _NonparametricMixin
-from ..utils import lstsq_reg, kron2c, kron3c
+from ..utils import (lstsq_reg, lstsq_iterative, get_least_squares_size,
+                     SolverL2, kronc_size, kron2c, kron3c)
+from ..utils._solver import (_qr_append, _tsqr_reduce,
+                             _check_workers, _map)
+
+
+_DEFAULT_CHUNKSIZE = 8192
+
+
+def _working_dtype(*arrays):
+    """Floating-point type of the projected data (ignoring None entries)."""
+    return np.result_type(*[A for A in arrays if A is not None], np.float16)
+
+
+def _is_single(dtype):
+    """Return True if `dtype` is a floating-point type below float64."""
+    return np.issubdtype(dtype, np.floating) and np.finfo(dtype).bits < 64
+
+
+def _data_singular_values(sval, P, q):
+    """Recover the q = min(k,d) singular values of the (k,d) data matrix D
+    from the singular values `sval` of the regularized matrix [D; P] for a
+    scalar P, using sval^2 = s^2 + P^2. Return None if P is not a scalar or
+    if the subtraction is too inaccurate (the smallest singular value of D is
+    negligible compared to P).
+    """
+    if not np.isscalar(P):
+        return None
+    s2 = sval[:q]**2 - P**2
+    if P != 0 and s2[-1] <= np.sqrt(np.finfo(float).eps) * P**2:
+        return None
+    return np.sqrt(s2)
+
+
+def _regularization_norm(P, Otrp):
+    """Squared norm sum_j ||P_j o_j||^2 of the regularization term, where o_j
+    is the jth column of Otrp and P_j is P or the jth entry of the list P.
+    """
+    if isinstance(P, (list, tuple)):
+        return sum(_regularization_norm(Pj, oj) for Pj, oj in zip(P, Otrp.T))
+    if np.isscalar(P) or P.ndim == 1:
+        return np.sum((P * Otrp.T)**2)
+    return np.sum((P @ Otrp)**2)
+
+
+def _data_misfit(D, R, Otrp, offset, residual, regnorm):
+    """Squared data misfit ||DO^T - R||^2 (where ||R||^2 includes `offset`)
+    of the solution Otrp of the regularized least-squares problem with
+    squared residual `residual` and regularization term `regnorm`. If the
+    regularization term dominates, the difference residual - regnorm would
+    cancel catastrophically, so the misfit is computed directly with one
+    product with D (a matrix or a LinearOperator) instead.
+    """
+    misfit = residual - regnorm
+    if misfit < residual / 2:
+        misfit = np.sum((D @ Otrp - R)**2) + offset
+    return misfit
+
+
+def _lazy_diagnostic(name, doc):
+    """Property for a least-squares diagnostic stored in self._diagnostics,
+    either as a value or as a function that computes it on first access.
+    """
+    def fget(self):
+        try:
+            value = self._diagnostics[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(f"'{type(self).__name__}' object has no "
+                                 f"attribute '{name}'") from None
+        if callable(value):
+            value = self._diagnostics[name] = value()
+        return value
+
+    def fset(self, value):
+        if "_diagnostics" not in self.__dict__:
+            self._diagnostics = {}
+        self._diagnostics[name] = value
+
+    return property(fget, fset, doc=doc)
+
+
+class _UnstableError(Exception):
+    """Raised to stop the prediction of a candidate ROM that blows up."""
+
+
+# Tall-skinny QR worker processes ---------------------------------------------
+_TSQR_DATA = {}
+
+
+def _tsqr_context():
+    """Multiprocessing context for the worker processes: 'fork' where the
+    platform supports it (the workers inherit the training data without
+    copying it), otherwise the platform default (the data is pickled and
+    sent to each worker once, when it starts).
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _tsqr_initialize(ModelClass, modelform, n, r, m, Vr, X, rhs, U):
+    """Store a lightweight model and the (read-only) training data in a
+    worker process; see _tsqr_context().
+    """
+    model = ModelClass(modelform)
+    model.n, model.r, model.m, model.Vr = n, r, m, Vr
+    _TSQR_DATA.update(model=model, X=X, rhs=rhs, U=U)
+
+
+def _tsqr_factor(start, stop, chunksize):
+    """Triangular factor of the augmented data for snapshots start:stop."""
+    data = _TSQR_DATA
+    cols = slice(start, stop)
+    U = data["U"][:,cols] if data["U"] is not None else None
+    return data["model"]._update_triangular_factor(None, data["X"][:,cols],
+                                                   data["rhs"][:,cols],
+                                                   U, chunksize)
 
 
 class _InferredMixin:
     """Mixin class for reduced model classes that use Operator Inference."""
 
+    # Least-squares diagnostics, computed lazily ------------------------------
+    datacond_ = _lazy_diagnostic("datacond_",
+                                 "Condition number of the raw data matrix.")
+    dataregcond_ = _lazy_diagnostic("dataregcond_", "Condition number of the "
+                                    "regularized data matrix.")
+    misfit_ = _lazy_diagnostic("misfit_", "Squared Frobenius data misfit "
+                               "(without regularization).")
+    residual_ = _lazy_diagnostic("residual_", "Squared Frobenius residual of "
+                                 "the regularized least-squares problem.")
+
+    def _set_diagnostics(self, D, R, Otrp, offset, P, res, sval):
+        """Record the diagnostics of the solution Otrp of the least-squares
+        problem min_{O} ||DO^T - R||^2 + ||PO^T||^2 (where ||R||^2 includes
+        `offset`) from the residuals `res` and the singular values `sval` (of
+        [D; P], or of [D; P_0] for a list P) returned by lstsq_reg(). Any
+        diagnostic that cannot be recovered from them is computed from D and R
+        right away, so that the model does not keep references to them.
+        """
+        k, d = D.shape
+        P0 = P[0] if isinstance(P, list) else P
+        svals = _data_singular_values(sval, P0, min(k,d))
+        if svals is None:
+            datacond = np.linalg.cond(D)
+        else:
+            datacond = svals[0]/svals[-1] if svals[-1] > 0 else np.inf
+        regnorm = _regularization_norm(P, Otrp)
+        if res.size > 0:
+            residual = np.sum(res) + offset
+            misfit = _data_misfit(D, R, Otrp, offset, residual, regnorm)
+        else:
+            misfit = np.sum((D @ Otrp - R)**2) + offset
+            residual = misfit + regnorm
+        self._diagnostics = {
+            "datacond_": datacond,
+            "dataregcond_": abs(sval[0]/sval[-1]) if sval[-1] > 0 else np.inf,
+            "misfit_": misfit,
+            "residual_": residual,
+        }
+
     @staticmethod
     def _check_training_data_shapes(datasets):
         """Ensure that each data set has the same number of columns."""
@@ -30,7 +190,353 @@ class _InferredMixin:
             if data.shape[1] != k:
                 raise ValueError("data sets not aligned, dimension 1")
 
-    def fit(self, Vr, X, rhs, U=None, P=0):
+    def _construct_data_matrix(self, X_, U, out=None):
+        """Construct the Operator Inference data matrix
+        D = [1, X_^T, (X_ ⊗ X_)^T, (X_ ⊗ X_ ⊗ X_)^T, U^T].
+
+        The matrix is allocated once in column-major (Fortran) order, the
+        layout LAPACK expects, and each block is written directly into its
+        slice of columns.
+
+        Parameters
+        ----------
+        X_ : (r,k) ndarray
+            Column-wise projected snapshot training data.
+
+        U : (m,k) ndarray or None
+            Column-wise inputs corresponding to the snapshots.
+
+        out : (k,d) ndarray or None
+            If given, an array in which to store the data matrix (ideally in
+            Fortran order).
+
+        Returns
+        -------
+        D : (k,d) ndarray
+            The data matrix, with d = get_least_squares_size(modelform, r, m).
+        """
+        r, k = X_.shape
+        d = get_least_squares_size(self.modelform, r,
+                                   self.m if self.has_inputs else 0)
+        if out is None:
+            out = np.empty((k,d), dtype=X_.dtype, order='F')
+        elif out.shape != (k,d):
+            raise ValueError(f"out.shape = {out.shape} != {(k,d)}")
+
+        i = 0
+        if self.has_constant:
+            out[:,i] = 1
+            i += 1
+
+        if self.has_linear:
+            out[:,i:i+r] = X_.T
+            i += r
+
+        if self.has_quadratic:
+            _r2 = kronc_size(r, 2)
+            kron2c(X_, out=out[:,i:i+_r2].T)
+            i += _r2
+
+        if self.has_cubic:
+            _r3 = kronc_size(r, 3)
+            kron3c(X_, out=out[:,i:i+_r3].T)
+            i += _r3
+
+        if self.has_inputs:
+            out[:,i:] = U.T
+
+        return out
+
+    def _data_operator(self, X_, U, chunksize):
+        """Get a LinearOperator that applies the data matrix D (see
+        _construct_data_matrix()) and its transpose without forming D.
+        Each product assembles the rows of D `chunksize` snapshots at a time
+        from the cached compact Kronecker index tables, so the memory needed
+        scales with `chunksize` instead of k. If k <= `chunksize`, D is
+        simply formed once.
+
+        Parameters
+        ----------
+        X_ : (r,k) ndarray
+            Column-wise projected snapshot training data.
+
+        U : (m,k) ndarray or None
+            Column-wise inputs corresponding to the snapshots.
+
+        chunksize : int > 0
+            Number of snapshots to assemble at a time.
+
+        Returns
+        -------
+        D : (k,d) scipy.sparse.linalg.LinearOperator
+            The data matrix, with d = get_least_squares_size(modelform, r, m).
+        """
+        if not isinstance(chunksize, (int, np.integer)) or chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        r, k = X_.shape
+        if k <= chunksize:
+            return spla.aslinearoperator(self._construct_data_matrix(X_, U))
+        d = get_least_squares_size(self.modelform, r,
+                                   self.m if self.has_inputs else 0)
+
+        def _blocks():
+            # A new buffer for each product, so that threads can share D.
+            block = np.empty((chunksize,d), dtype=X_.dtype, order='F')
+            for j in range(0, k, chunksize):
+                cols = slice(j, j + chunksize)
+                kc = X_[:,cols].shape[1]
+                Uc = U[:,cols] if U is not None else None
+                yield cols, self._construct_data_matrix(X_[:,cols], Uc,
+                                                        out=block[:kc])
+
+        def matmat(V):
+            out = np.empty((k,V.shape[1]), dtype=np.result_type(X_, V))
+            for cols, Dc in _blocks():
+                out[cols] = Dc @ V
+            return out
+
+        def rmatmat(W):
+            out = np.zeros((d,W.shape[1]), dtype=np.result_type(X_, W))
+            for cols, Dc in _blocks():
+                out += Dc.T @ W[cols]
+            return out
+
+        return spla.LinearOperator((k,d),
+                                   matvec=lambda v: matmat(v.reshape((d,1))),
+                                   rmatvec=lambda w: rmatmat(w.reshape((k,1))),
+                                   matmat=matmat, rmatmat=rmatmat,
+                                   dtype=np.result_type(X_, np.float64))
+
+    def _update_triangular_factor(self, Raug, X, rhs, U, chunksize):
+        """Update the triangular factor of the augmented data [D | R] of the
+        least-squares problem min_{O} ||DO^T - R|| with new snapshots,
+        processing `chunksize` snapshots at a time so that the full data
+        matrix D is never formed.
+
+        The triangular factor is accumulated one block of rows at a time,
+        [D | R] = Q[T, S; 0, Z]. Then for any O,
+        ||DO^T - R||^2 = ||TO^T - S||^2 + ||Z||^2
+        (see _split_triangular_factor()).
+
+        Parameters
+        ----------
+        Raug : (l,d+r) ndarray or None
+            Triangular factor to update, or None to start from scratch.
+
+        X : (n,k) or (r,k) ndarray
+            Column-wise snapshot training data.
+
+        rhs : (n,k) or (r,k) ndarray
+            Column-wise next-iteration or velocity training data.
+
+        U : (m,k) ndarray or None
+            Column-wise inputs corresponding to the snapshots.
+
+        chunksize : int > 0
+            Number of snapshots to process at a time.
+
+        Returns
+        -------
+        Raug : (min(l+k,d+r),d+r) ndarray
+            Upper triangular factor of the updated augmented data.
+
+        Notes
+        -----
+        Each chunk of [D | R] is assembled in the precision of the data, but
+        the triangular factors are always accumulated in double precision.
+        """
+        if not isinstance(chunksize, (int, np.integer)) or chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        k = X.shape[1]
+        d = get_least_squares_size(self.modelform, self.r,
+                                   self.m if self.has_inputs else 0)
+        block = np.empty((min(chunksize, k), d + self.r), order='F',
+                         dtype=_working_dtype(self.Vr, X, rhs))
+        if Raug is None:
+            Raug = np.empty((0, d + self.r))    # Always in float64.
+        for j in range(0, k, chunksize):
+            chunk = slice(j, j + chunksize)
+            X_ = self.project(X[:,chunk], 'X')
+            rhs_ = self.project(rhs[:,chunk], 'rhs')
+            kc = X_.shape[1]
+            self._construct_data_matrix(X_,
+                                        U[:,chunk] if U is not None else None,
+                                        out=block[:kc,:d])
+            block[:kc,d:] = rhs_.T
+            Raug = _qr_append(Raug, block[:kc])
+        return Raug
+
+    def _tsqr_triangular_factor(self, X, rhs, U, chunksize, processes):
+        """Compute the triangular factor of the augmented data [D | R] with a
+        tall-skinny QR pipeline: each of `processes` worker processes
+        projects a contiguous slice of the snapshots, assembles the data for
+        that slice (`chunksize` snapshots at a time), and factors it locally.
+        The small triangular factors are then merged in a binary tree.
+        The workers are started with the 'fork' method where available, so
+        the training data is shared rather than copied; elsewhere it is
+        pickled to each worker.
+
+        Parameters
+        ----------
+        X : (n,k) or (r,k) ndarray
+            Column-wise snapshot training data.
+
+        rhs : (n,k) or (r,k) ndarray
+            Column-wise next-iteration or velocity training data.
+
+        U : (m,k) ndarray or None
+            Column-wise inputs corresponding to the snapshots.
+
+        chunksize : int > 0 or None
+            Number of snapshots each worker processes at a time.
+            Defaults to 8192.
+
+        processes : int > 0 or -1
+            Number of worker processes (-1 means one per CPU core).
+
+        Returns
+        -------
+        Raug : (min(k,d+r),d+r) ndarray
+            Upper triangular factor of the augmented data.
+        """
+        if processes == -1:
+            processes = os.cpu_count() or 1
+        if not isinstance(processes, (int, np.integer)) or processes < 1:
+            raise ValueError("processes must be a positive integer or -1")
+        if chunksize is None:
+            chunksize = _DEFAULT_CHUNKSIZE
+        k = X.shape[1]
+        bounds = np.linspace(0, k, min(processes, k) + 1).astype(int)
+        initargs = (type(self), self.modelform, self.n, self.r, self.m,
+                    self.Vr, X, rhs, U)
+        with _tsqr_context().Pool(processes, _tsqr_initialize,
+                                  initargs) as pool:
+            Rs = pool.starmap(_tsqr_factor,
+                              [(start, stop, chunksize)
+                               for start, stop in zip(bounds, bounds[1:])])
+            return _tsqr_reduce(Rs, pool)
+
+    def _split_triangular_factor(self, Raug):
+        """Split the triangular factor [T, S; 0, Z] of the augmented data
+        [D | R] into an equivalent least-squares problem with (at most) d rows.
+
+        Returns
+        -------
+        T : (d,d) ndarray
+            Upper triangular factor of the data matrix D.
+
+        S : (d,r) ndarray
+            The right-hand side R, rotated to match T.
+
+        offset : float
+            Squared Frobenius norm of the part of R outside the range of D.
+        """
+        d = Raug.shape[1] - self.r
+        return Raug[:d,:d], Raug[:d,d:], np.sum(Raug[d:,d:]**2)
+
+    def _fit_dimensions(self, Vr, X, rhs, U):
+        """Check the model form and training data and get the dimensions,
+        without changing any attributes.
+
+        Returns
+        -------
+        n, r, m : int or None
+            The full, reduced, and input dimensions.
+
+        U : (m,k) ndarray or None
+            The inputs, reshaped to two dimensions if needed.
+        """
+        # Check modelform and inputs.
+        self._check_modelform()
+        self._check_inputargs(U, 'U')
+
+        # Get dimensions and check that number of samples is consistent.
+        if Vr is not None:
+            n, r = Vr.shape             # Full dimension, reduced dimension.
+        else:
+            n, r = None, X.shape[0]
+        _tocheck = [X, rhs]
+        m = None
+        if self.has_inputs:             # Input dimension.
+            if U.ndim == 1:
+                U = U.reshape((1,-1))
+            m = U.shape[0]
+            _tocheck.append(U)
+        self._check_training_data_shapes(_tocheck)
+        return n, r, m, U
+
+    def _process_fit_arguments(self, Vr, X, rhs, U):
+        """Check the model form and training data and store the dimensions.
+
+        Returns
+        -------
+        U : (m,k) ndarray or None
+            The inputs, reshaped to two dimensions if needed.
+        """
+        self.n, self.r, self.m, U = self._fit_dimensions(Vr, X, rhs, U)
+        self.Vr = Vr
+        return U
+
+    def _process_regularization(self, P):
+        """Convert a regularization dictionary {term: factor}, or a list of
+        them, to the diagonal (d,) of the corresponding regularization matrix.
+        Other regularization arguments are returned unchanged.
+        """
+        if isinstance(P, (list, tuple)):
+            return [self._process_regularization(Pj) for Pj in P]
+        if not isinstance(P, dict):
+            return P
+        for key in P:
+            if key not in set(self.modelform):
+                raise ValueError(f"invalid regularization key '{key}'; "
+                                 f"options are {', '.join(self.modelform)}")
+        sizes = {'c': 1, 'A': self.r, 'H': kronc_size(self.r, 2),
+                 'G': kronc_size(self.r, 3), 'B': self.m}
+        return np.concatenate([np.full(sizes[key], P.get(key, 0), dtype=float)
+                               for key in self.modelform])
+
+    def _solve_operators(self, D, R, offset, P, solver, workers, x0=None):
+        """Solve the least-squares problem min_{O} ||DO^T - R||^2 + ||PO^T||^2
+        (where ||R||^2 is understood to include `offset`), record the
+        diagnostics, and set the reduced operators. The initial guess `x0`
+        for O^T is only used by the iterative solvers.
+        """
+        self.iterations_ = None
+
+        # With the SVD solver, factor D once and solve in refit().
+        if solver == "svd":
+            self.solver_ = SolverL2().fit(D, R)
+            self._misfit_offset = offset
+            return self.refit(P)
+        self.solver_ = None
+        if isinstance(P, (tuple, range, types.GeneratorType)):
+            P = list(P)
+
+        # Iterative solvers only apply D and D^T, so D is never factored.
+        if solver in ("lsqr", "lsmr"):
+            Otrp, res, self.iterations_ = lstsq_iterative(D, R, P, solver, x0,
+                                                          workers=workers)
+            residual = np.sum(res) + offset
+            self._diagnostics = {
+                "datacond_": np.nan,
+                "dataregcond_": np.nan,
+                "misfit_": _data_misfit(D, R, Otrp, offset, residual,
+                                        _regularization_norm(P, Otrp)),
+                "residual_": residual,
+            }
+            self._extract_operators(Otrp)
+            return self
+
+        # Solve for the reduced-order model operators via least squares.
+        Otrp, res, _, sval = lstsq_reg(D, R, P, solver, workers)
+
+        # Record info about the least squares solution.
+        self._set_diagnostics(D, R, Otrp, offset, P, res, sval)
+        self._extract_operators(Otrp)
+        return self
+
+    def fit(self, Vr, X, rhs, U=None, P=0, chunksize=None, solver="lstsq",
+            workers=None, processes=None, warm_start=False):
         """Solve for the reduced model operators via ordinary least squares.
 
         Parameters
@@ -53,83 +559,396 @@ class _InferredMixin:
             input), then U may be a one-dimensional array. Required if 'B' is
             in `modelform`; must be None if 'B' is not in `modelform`.
 
-        P : float >= 0 or (d,d) ndarray or list of r (floats or (d,d) ndarrays)
+        P : float >= 0 or dict or (d,) or (d,d) ndarray or list of r of these
             Tikhonov regularization factor(s); see utils.lstsq_reg(). Here, d
             is the number of unknowns in each decoupled least-squares problem,
-            e.g., d = r + m when `modelform`="AB".
+            e.g., d = r + m when `modelform`="AB". A dictionary maps terms of
+            the model to scalar factors, e.g., {'A': 1e-3, 'H': 1e-1}, for a
+            diagonal regularization matrix that penalizes the entries of each
+            operator separately (terms not in the dictionary are not
+            regularized). Diagonal regularization never forms a (d,d) matrix.
+
+        chunksize : int > 0 or None
+            If given, assemble the least-squares problem `chunksize` snapshots
+            at a time, accumulating a QR factorization of the data instead of
+            forming the full (k,d) data matrix. Peak memory then scales with
+            `chunksize` instead of k. If the data (Vr, X, and rhs) are all
+            single precision (float32), the data matrix is assembled in single
+            precision but the least-squares problem is always solved in double
+            precision, in chunks of 8192 snapshots by default. With an
+            iterative solver, the data matrix is never formed at all: its rows
+            are reassembled `chunksize` (default 8192) at a time whenever the
+            solver applies it.
+
+        solver : str
+            The least-squares solver backend; see utils.lstsq_reg().
+            * "lstsq" (default): SVD-based scipy.linalg.lstsq().
+            * "normal": Cholesky factorization of the regularized normal
+                equations, falling back to "lstsq" if ill-conditioned.
+            * "svd": Compute the SVD of the data matrix once (scalar P only).
+                The solution can then be recomputed cheaply for a new scalar P
+                with refit(), and the misfit / residual for many values of P
+                are available from the utils.SolverL2 object `solver_`.
+            * "lsqr", "lsmr": Matrix-free Krylov iterations with scalar P
+                (or a list of r scalars), which only apply the data matrix and
+                its transpose; see utils.lstsq_iterative(). Much cheaper in
+                time and memory than "lstsq" when d is large (e.g., cubic
+                models), especially with `warm_start`.
+
+        workers : int or None
+            Number of threads for solving the r decoupled least-squares
+            problems (one per row of the operators) concurrently when `P` is a
+            list of (d,d) ndarrays or solver="normal"; see utils.lstsq_reg().
+            If -1, use one thread per CPU core.
+
+        processes : int or None
+            If given, assemble and factor the least-squares problem with a
+            tall-skinny QR pipeline over this many worker processes (-1 means
+            one per CPU core): each process projects and factors a slice of the
+            snapshots (`chunksize` at a time, 8192 by default), and the small
+            triangular factors are merged in a tree. For very large k.
+
+        warm_start : bool or _InferredMixin
+            Initial guess for the operators when solver="lsqr" or "lsmr". If
+            True, start from the current operators of this model (if it has
+            already been fit with the same structure, e.g., before the data
+            changed slightly); if a trained model with the same `modelform`
+            and dimensions, start from its operators. If False (default),
+            start from zero. Ignored by the other solvers.
 
         Returns
         -------
         self
         """
-        # Check modelform and inputs.
-        self._check_modelform()
-        self._check_inputargs(U, 'U')
-
-        # Store dimensions and check that number of samples is consistent.
-        if Vr is not None:
-            self.n, self.r = Vr.shape   # Full dimension, reduced dimension.
-        else:
-            self.n = None
-            self.r = X.shape[0]
-        _tocheck = [X, rhs]
-        if self.has_inputs:             # Input dimension.
-            if U.ndim == 1:
-                U = U.reshape((1,-1))
-                self.m = 1
-            else:
-                self.m = U.shape[0]
-            _tocheck.append(U)
+        if solver == "svd" and not np.isscalar(P):
+            raise ValueError("solver 'svd' requires scalar P")
+        U = self._process_fit_arguments(Vr, X, rhs, U)
+        P = self._process_regularization(P)
+        self._Raug = None               # Reset partial_fit() statistics.
+        self._nsamples = X.shape[1]
+
+        # Construct the least-squares problem min_{O} ||DO^T - R||, or (if
+        # chunksize is given) an equivalent problem with d rows. Data in
+        # single precision is assembled in single precision, but reduced (in
+        # chunks) and solved in double precision.
+        iterative = solver in ("lsqr", "lsmr")
+        x0 = self._warm_start_guess(warm_start) if iterative else None
+        if processes is not None:
+            Raug = self._tsqr_triangular_factor(X, rhs, U,
+                                                chunksize, processes)
+            D, R, offset = self._split_triangular_factor(Raug)
+            return self._solve_operators(D, R, offset, P, solver, workers, x0)
+        if iterative:
+            X_ = self.project(X, 'X')
+            rhs_ = self.project(rhs, 'rhs')
+            D = self._data_operator(X_, U, chunksize or _DEFAULT_CHUNKSIZE)
+            return self._solve_operators(D, rhs_.T, 0, P, solver, workers, x0)
+        if chunksize is None and _is_single(_working_dtype(Vr, X, rhs)):
+            chunksize = _DEFAULT_CHUNKSIZE
+        if chunksize is None:
+            # Project states and rhs to the reduced subspace (if not done).
+            X_ = self.project(X, 'X')
+            rhs_ = self.project(rhs, 'rhs')
+            D = self._construct_data_matrix(X_, U)
+            R = rhs_.T
+            offset = 0
         else:
-            self.m = None
-        self._check_training_data_shapes(_tocheck)
-        k = X.shape[1]
+            Raug = self._update_triangular_factor(None, X, rhs, U, chunksize)
+            D, R, offset = self._split_triangular_factor(Raug)
 
-        # Project states and rhs to the reduced subspace (if not done already).
-        self.Vr = Vr
-        X_ = self.project(X, 'X')
-        rhs_ = self.project(rhs, 'rhs')
+        return self._solve_operators(D, R, offset, P, solver, workers)
 
-        # Construct the "Data matrix" D = [X^T, (X ⊗ X)^T, U^T, 1].
-        D_blocks = []
-        if self.has_constant:
-            D_blocks.append(np.ones((k,1)))
+    def _partial_fit(self, Vr, X, rhs, U=None, P=0, solver="lstsq",
+                     workers=None):
+        """Update the least-squares problem with a new batch of training data
+        and solve for the reduced model operators with all data seen so far.
 
-        if self.has_linear:
-            D_blocks.append(X_.T)
+        Only the triangular factor of the augmented data [D | R] (at most
+        (d+r)x(d+r)) is stored between calls, so the cost of each call depends
+        on the size of the new batch and on d, not on the number of snapshots
+        seen so far. Calling fit() discards the accumulated data.
 
-        if self.has_quadratic:
-            X2_ = kron2c(X_)
-            D_blocks.append(X2_.T)
-            _r2 = X2_.shape[0]  # = r(r+1)/2, size of compact quadratic Kron.
+        Parameters
+        ----------
+        Vr : (n,r) ndarray or None
+            The basis for the linear reduced space. Must have the same shape
+            in each call.
 
-        if self.has_cubic:
-            X3_ = kron3c(X_)
-            D_blocks.append(X3_.T)
-            _r3 = X3_.shape[0]  # = r(r+1)(r+2)/6, size of compact cubic Kron.
+        X : (n,k) or (r,k) ndarray
+            A new batch of column-wise snapshot training data.
 
-        if self.has_inputs:
-            D_blocks.append(U.T)
-            m = U.shape[0]
-            self.m = m
+        rhs : (n,k) or (r,k) ndarray
+            The corresponding next-iteration or velocity training data.
 
-        D = np.hstack(D_blocks)
-        R = rhs_.T
+        U : (m,k) or (k,) ndarray or None
+            The corresponding inputs.
 
-        # Solve for the reduced-order model operators via least squares.
-        Otrp, res, _, sval = lstsq_reg(D, R, P)
+        P : float >= 0 or dict or (d,) or (d,d) ndarray or list of r of these
+            Tikhonov regularization factor(s); see _InferredMixin.fit().
 
-        # Record info about the least squares solution.
-        # Condition number of the raw data matrix.
-        self.datacond_ = np.linalg.cond(D)
-        # Condition number of regularized data matrix.
-        self.dataregcond_ = abs(sval[0]/sval[-1]) if sval[-1] > 0 else np.inf
-        # Squared Frobenius data misfit (without regularization).
-        self.misfit_ = np.sum(((D @ Otrp) - R)**2)
-        # Squared Frobenius residual of the regularized least squares problem.
-        self.residual_ = np.sum(res) if res.size > 0 else self.misfit_
+        solver : str
+            The least-squares solver backend; see _InferredMixin.fit().
+
+        workers : int or None
+            Number of threads for the decoupled least-squares problems.
+
+        Returns
+        -------
+        self
+        """
+        if solver == "svd" and not np.isscalar(P):
+            raise ValueError("solver 'svd' requires scalar P")
+        Raug = getattr(self, "_Raug", None)
+        if Raug is not None:
+            # Check the new data before changing any attributes, so that a
+            # rejected batch leaves the accumulated problem intact.
+            n, r, m, _ = self._fit_dimensions(Vr, X, rhs, U)
+            if (n, r, m) != (self.n, self.r, self.m) \
+                    or Raug.shape[1] != get_least_squares_size(
+                        self.modelform, r, m or 0) + r:
+                raise ValueError("training data not aligned with previous "
+                                 "partial_fit() data")
+        U = self._process_fit_arguments(Vr, X, rhs, U)
+        P = self._process_regularization(P)
+
+        self._nsamples = X.shape[1] + \
+            (self._nsamples if Raug is not None else 0)
+        Raug = self._update_triangular_factor(Raug, X, rhs, U, X.shape[1])
+        self._Raug = Raug
+        D, R, offset = self._split_triangular_factor(Raug)
+        return self._solve_operators(D, R, offset, P, solver, workers)
+
+    def refit(self, P):
+        """Solve for the reduced model operators again with a new (scalar)
+        regularization factor, reusing the singular value decomposition of the
+        data matrix from the last call to fit(..., solver="svd"). The training
+        data is not needed, and the cost is independent of the number of
+        snapshots, so sweeping over many regularization factors (e.g., for an
+        L-curve) costs about as much as a single fit().
+
+        Parameters
+        ----------
+        P : float >= 0
+            Tikhonov regularization factor; see utils.lstsq_reg().
+
+        Returns
+        -------
+        self
+        """
+        if getattr(self, "solver_", None) is None:
+            raise AttributeError("refit() requires fit(..., solver='svd')")
+        if not np.isscalar(P):
+            raise ValueError("solver 'svd' requires scalar P")
+
+        # Record info about the least squares solution (on first access).
+        solver, offset = self.solver_, self._misfit_offset
+        self._diagnostics = {
+            "datacond_": solver.cond,
+            "dataregcond_": lambda: solver.regcond(P),
+            "misfit_": lambda: solver.misfit(P) + offset,
+            "residual_": lambda: solver.residual(P) + offset,
+        }
+
+        self._extract_operators(self.solver_.predict(P))
+        return self
+
+    def select_regularization(self, candidates, criterion="gcv",
+                              predict_args=None, X_val=None, growth=10,
+                              workers=None, predict_kwargs=None):
+        """Choose the (scalar) regularization factor P from a list of
+        candidates and set the reduced model operators with the best one.
+        Each criterion is evaluated with the singular value decomposition of
+        the data matrix from the last call to fit(..., solver="svd"), so the
+        training data is not assembled or factored again.
+
+        Parameters
+        ----------
+        candidates : sequence of floats >= 0
+            Candidate regularization factors, e.g., np.logspace(-6, 2, 50).
+
+        criterion : str
+            How to compare the candidates.
+            * "gcv" (default): Minimize the generalized cross-validation
+                function ||DO^T - R||_F^2 / (k - trace(H))^2, where H is the
+                influence matrix of the regularized least-squares problem.
+            * "lcurve": Maximize the curvature of the L-curve
+                (log ||DO^T - R||_F, log ||O||_F). Requires 3+ candidates.
+            * "trajectory": Minimize the relative error of the candidate
+                ROM's prediction predict(*predict_args) with respect to the
+                hold-out trajectory `X_val`. The predictions run in parallel
+                (see `workers`), and a prediction is stopped (and the
+                candidate rejected) as soon as the norm of the reduced state
+                exceeds `growth` times the largest snapshot norm in `X_val`.
+
+        predict_args : tuple
+            Arguments to predict() that produce the hold-out trajectory, e.g.,
+            (x0, t) or (x0, t, u) for a continuous model, or (x0, niters) or
+            (x0, niters, U) for a discrete model. Only used (and required) if
+            criterion="trajectory".
+
+        X_val : (n,nt) or (r,nt) ndarray
+            The hold-out trajectory, in the same space as the output of
+            predict(). Only used (and required) if criterion="trajectory".
+
+        growth : float > 0
+            Factor for detecting unstable candidates (criterion="trajectory").
+
+        workers : int or None
+            Number of threads for the candidate predictions; see
+            utils.lstsq_reg(). If -1, use one thread per CPU core.
+
+        predict_kwargs : dict or None
+            Keyword arguments to predict() for the hold-out trajectory, e.g.,
+            dict(method="ars222") for a continuous model. The bound on the
+            state is enforced with every integration method, including the
+            built-in IMEX methods. Only used if criterion="trajectory".
+
+        Returns
+        -------
+        self
+            The model with the operators for the best candidate, its
+            regularization factor `regularization_`, and the value of the
+            criterion for each candidate, `regularization_scores_`.
+        """
+        if getattr(self, "solver_", None) is None:
+            raise AttributeError("select_regularization() requires "
+                                 "fit(..., solver='svd')")
+        candidates = np.array(candidates, dtype=float)
+        if candidates.ndim != 1 or candidates.size == 0:
+            raise ValueError("candidates must be a nonempty sequence of "
+                             "scalars")
+        if np.any(candidates < 0):
+            raise ValueError("regularization parameter must be nonnegative")
+        solver, offset = self.solver_, self._misfit_offset
+
+        if criterion == "gcv":
+            phi, _ = solver._filters(candidates)
+            dof = self._nsamples - np.sum(phi, axis=1)
+            with np.errstate(divide="ignore"):
+                scores = np.where(dof > 0, (solver.misfit(candidates) + offset)
+                                  / dof**2, np.inf)
+            best = np.argmin(scores)
+
+        elif criterion == "lcurve":
+            if candidates.size < 3:
+                raise ValueError("criterion 'lcurve' requires at least "
+                                 "3 candidates")
+            # The curvature of a parametric curve does not depend on the
+            # parametrization, so differentiate with respect to the index.
+            order = np.argsort(candidates)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x = np.log(solver.misfit(candidates[order]) + offset) / 2
+                y = np.log(solver.norm(candidates[order]))
+                dx, dy = np.gradient(x), np.gradient(y)
+                ddx, ddy = np.gradient(dx), np.gradient(dy)
+                scores = np.empty_like(candidates)
+                scores[order] = (dx*ddy - ddx*dy) / (dx**2 + dy**2)**1.5
+            best = np.nanargmax(scores)
+
+        elif criterion == "trajectory":
+            if predict_args is None or X_val is None:
+                raise ValueError("criterion 'trajectory' requires "
+                                 "predict_args and X_val")
+            bound = growth * np.max(np.linalg.norm(X_val, axis=0))
+            predict_kwargs = {} if predict_kwargs is None else predict_kwargs
+            args = zip(candidates, *[[a] * candidates.size
+                                     for a in (predict_args, X_val, bound,
+                                               predict_kwargs)])
+            scores = np.array(_map(self._trajectory_error, args,
+                                   _check_workers(workers)))
+            if np.all(np.isinf(scores)):
+                raise ValueError("all candidate models are unstable")
+            best = np.argmin(scores)
+
+        else:
+            raise ValueError(f"invalid criterion '{criterion}'")
+
+        self.regularization_ = candidates[best]
+        self.regularization_scores_ = scores
+        return self.refit(self.regularization_)
+
+    def _trajectory_error(self, P, predict_args, X_val, bound,
+                          predict_kwargs):
+        """Relative error of the prediction of the ROM regularized with P with
+        respect to the trajectory X_val, or np.inf if the ROM is unstable,
+        i.e., if the norm of its reduced state exceeds `bound`. The prediction
+        is predict(*predict_args, **predict_kwargs).
+        """
+        model = copy.copy(self)
+        model._extract_operators(self.solver_.predict(P))
+
+        # Stop the prediction as soon as the state leaves the bound.
+        i = 1 if isinstance(self, _ContinuousROM) else 0
+        def _bounded(fun):
+            def _bounded_fun(*args):
+                if np.dot(args[i], args[i]) > bound**2:
+                    raise _UnstableError
+                return fun(*args)
+            return _bounded_fun
+        model.f_ = _bounded(model.f_)
+
+        # The IMEX integrators evaluate their own explicit part instead of f_.
+        if isinstance(self, _ContinuousROM):
+            imex_split = model._imex_split
+            def _bounded_imex_split(u):
+                g_, A_ = imex_split(u)
+                return _bounded(g_), A_
+            model._imex_split = _bounded_imex_split
+
+        try:
+            with np.errstate(over="ignore", invalid="ignore"):
+                X_pred = model.predict(*predict_args, **predict_kwargs)
+        except _UnstableError:
+            return np.inf
+        if X_pred.shape != X_val.shape or not np.all(np.isfinite(X_pred)):
+            return np.inf
+        # Linear discrete models are stepped forward without f_ (see
+        # _DiscreteROM.predict()), so check the bound afterwards as well.
+        if np.max(np.linalg.norm(X_pred, axis=0)) > bound:
+            return np.inf
+        return np.linalg.norm(X_pred - X_val) / np.linalg.norm(X_val)
+
+    def _warm_start_guess(self, warm_start):
+        """Get the initial guess Otrp = [c | A | Hc | Gc | B]^T for the
+        iterative solvers from this model (warm_start=True) or from another
+        trained model, or None for a cold start. Call after the dimensions of
+        the new training data have been stored.
+        """
+        if warm_start is False or warm_start is None:
+            return None
+        model = self if warm_start is True else warm_start
+        d = get_least_squares_size(self.modelform, self.r,
+                                   self.m if self.has_inputs else 0)
+        try:
+            model._check_modelform(trained=True)
+            Otrp = model._operator_matrix()
+        except AttributeError:
+            if model is self:           # Not trained yet: start from zero.
+                return None
+            raise
+        if model.modelform != self.modelform or Otrp.shape != (d,self.r):
+            if model is self:           # Structure changed: start from zero.
+                return None
+            raise ValueError("warm start model not aligned with training data")
+        return Otrp
+
+    def _operator_matrix(self):
+        """Stack the reduced operators into the transposed operator matrix
+        Otrp = [c | A | Hc | Gc | B]^T (the inverse of _extract_operators()).
+        """
+        blocks = [self.c_.reshape((-1,1))] if self.has_constant else []
+        blocks += [O for O in (self.A_, self.Hc_, self.Gc_) if O is not None]
+        if self.has_inputs:
+            blocks.append(self.B_.reshape((self.r,-1)))
+        return np.hstack(blocks).T
 
+    def _extract_operators(self, Otrp):
+        """Extract the reduced operators from the transposed operator matrix
+        Otrp = [c | A | Hc | Gc | B]^T and construct the reduced model f_.
+        """
         # Extract the reduced operators from Otrp.
+        _r2 = kronc_size(self.r, 2)     # Size of compact quadratic Kron.
+        _r3 = kronc_size(self.r, 3)     # Size of compact cubic Kron.
         i = 0
         if self.has_constant:
             self.c_ = Otrp[i:i+1][0]        # Note that c_ is one-dimensional.
@@ -162,7 +981,6 @@ class _InferredMixin:
             self.B_ = None
 
         self._construct_f_()
-        return self
 
 
 # Nonparametric Operator Inference models -------------------------------------
@@ -218,7 +1036,8 @@ class InferredDiscreteROM(_InferredMixin, _NonparametricMixin, _DiscreteROM):
         The basis for the linear reduced space (e.g., POD basis matrix).
 
     datacond_ : float
-        Condition number of the raw data matrix for the least-squares problem.
+        Condition number of the raw data matrix for the least-squares problem
+        (NaN with an iterative solver, which never factors the data matrix).
 
     dataregcond_ : float
         Condition number of the regularized data matrix for the least-squares
@@ -232,6 +1051,22 @@ class InferredDiscreteROM(_InferredMixin, _NonparametricMixin, _DiscreteROM):
         The squared Frobenius-norm data misfit of the (nonregularized)
         least-squares problem for computing the reduced-order model operators.
 
+    solver_ : utils.SolverL2 or None
+        Singular value decomposition of the data matrix, from which the
+        misfit and residual for any scalar regularization are cheap to compute.
+        Only set by fit(..., solver="svd"); used by refit().
+
+    iterations_ : (r,) ndarray of ints or None
+        Number of iterations used to solve each least-squares problem with
+        fit(..., solver="lsqr") or fit(..., solver="lsmr"); otherwise None.
+
+    regularization_ : float
+        Regularization factor chosen by select_regularization().
+
+    regularization_scores_ : ndarray
+        Value of the criterion for each candidate regularization factor in the
+        last call to select_regularization().
+
     c_ : (r,) ndarray or None
         Learned ROM constant term, or None if 'c' is not in `modelform`.
 
@@ -265,7 +1100,8 @@ class InferredDiscreteROM(_InferredMixin, _NonparametricMixin, _DiscreteROM):
         f_(x_, u) if 'B' is in `modelform`. That is, f_ maps reduced state
         (and inputs if appropriate) to reduced state. Calculated in fit().
     """
-    def fit(self, Vr, X, U=None, P=0):
+    def fit(self, Vr, X, U=None, P=0, chunksize=None, solver="lstsq",
+            workers=None, processes=None, warm_start=False):
         """Solve for the reduced model operators via ordinary least squares.
 
         Parameters
@@ -283,10 +1119,34 @@ class InferredDiscreteROM(_InferredMixin, _NonparametricMixin, _DiscreteROM):
             input), then U may be a one-dimensional array. Required if 'B' is
             in `modelform`; must be None if 'B' is not in `modelform`.
 
-        P : float >= 0 or (d,d) ndarray or list of r (floats or (d,d) ndarrays)
+        P : float >= 0 or dict or (d,) or (d,d) ndarray or list of r of these
             Tikhonov regularization factor(s); see utils.lstsq_reg(). Here, d
             is the number of unknowns in each decoupled least-squares problem,
-            e.g., d = r + m when `modelform`="AB".
+            e.g., d = r + m when `modelform`="AB". A dictionary maps terms of
+            the model to scalar factors, e.g., {'A': 1e-3, 'H': 1e-1}, for a
+            diagonal regularization matrix that penalizes the entries of each
+            operator separately (terms not in the dictionary are not
+            regularized). Diagonal regularization never forms a (d,d) matrix.
+
+        chunksize : int > 0 or None
+            If given, assemble the least-squares problem `chunksize` snapshots
+            at a time; see _InferredMixin.fit().
+
+        solver : str
+            The least-squares solver backend, "lstsq" (default), "normal",
+            "svd", "lsqr", or "lsmr"; see _InferredMixin.fit().
+
+        workers : int or None
+            Number of threads for solving the decoupled least-squares problems
+            concurrently; see utils.lstsq_reg().
+
+        processes : int or None
+            Number of worker processes for assembling and factoring the
+            least-squares problem in parallel; see _InferredMixin.fit().
+
+        warm_start : bool or _InferredMixin
+            Initial guess for the operators with an iterative solver
+            ("lsqr" or "lsmr"); see _InferredMixin.fit().
 
         Returns
         -------
@@ -295,7 +1155,49 @@ class InferredDiscreteROM(_InferredMixin, _NonparametricMixin, _DiscreteROM):
         return _InferredMixin.fit(self, Vr,
                                   X[:,:-1], X[:,1:],    # x_j's and x_{j+1}'s.
                                   U[...,:X.shape[1]-1] if U is not None else U,
-                                  P)
+                                  P, chunksize, solver, workers, processes,
+                                  warm_start)
+
+    def partial_fit(self, Vr, X, U=None, P=0, solver="lstsq", workers=None):
+        """Update the reduced model operators with a new batch of snapshots,
+        without revisiting the snapshots from previous calls. Only a compact
+        triangular factor of the data (independent of the number of snapshots)
+        is stored between calls; fit() discards it.
+
+        Parameters
+        ----------
+        Vr : (n,r) ndarray or None
+            The basis for the linear reduced space (e.g., POD basis matrix).
+            If None, X is assumed to already be projected (r,k). Must have
+            the same shape in each call.
+
+        X : (n,k) or (r,k) ndarray
+            New column-wise snapshot training data. The pairs (x_j, x_{j+1})
+            are taken within the batch, so consecutive batches of a single
+            trajectory should overlap by one snapshot.
+
+        U : (m,k-1) or (k-1,) ndarray or None
+            Column-wise inputs corresponding to the snapshots.
+
+        P : float >= 0 or dict or (d,) or (d,d) ndarray or list of r of these
+            Tikhonov regularization factor(s); see _InferredMixin.fit().
+
+        solver : str
+            The least-squares solver backend, "lstsq" (default), "normal",
+            "svd", "lsqr", or "lsmr"; see _InferredMixin.fit().
+
+        workers : int or None
+            Number of threads for solving the decoupled least-squares problems
+            concurrently; see utils.lstsq_reg().
+
+        Returns
+        -------
+        self
+        """
+        return _InferredMixin._partial_fit(self, Vr,
+                                  X[:,:-1], X[:,1:],    # x_j's and x_{j+1}'s.
+                                  U[...,:X.shape[1]-1] if U is not None else U,
+                                  P, solver, workers)
 
 
 class InferredContinuousROM(_InferredMixin, _NonparametricMixin,
@@ -350,7 +1252,8 @@ class InferredContinuousROM(_InferredMixin, _NonparametricMixin,
         The basis for the linear reduced space (e.g., POD basis matrix).
 
     datacond_ : float
-        Condition number of the raw data matrix for the least-squares problem.
+        Condition number of the raw data matrix for the least-squares problem
+        (NaN with an iterative solver, which never factors the data matrix).
 
     dataregcond_ : float
         Condition number of the regularized data matrix for the least-squares
@@ -364,6 +1267,22 @@ class InferredContinuousROM(_InferredMixin, _NonparametricMixin,
         The squared Frobenius-norm data misfit of the (nonregularized)
         least-squares problem for computing the reduced-order model operators.
 
+    solver_ : utils.SolverL2 or None
+        Singular value decomposition of the data matrix, from which the
+        misfit and residual for any scalar regularization are cheap to compute.
+        Only set by fit(..., solver="svd"); used by refit().
+
+    iterations_ : (r,) ndarray of ints or None
+        Number of iterations used to solve each least-squares problem with
+        fit(..., solver="lsqr") or fit(..., solver="lsmr"); otherwise None.
+
+    regularization_ : float
+        Regularization factor chosen by select_regularization().
+
+    regularization_scores_ : ndarray
+        Value of the criterion for each candidate regularization factor in the
+        last call to select_regularization().
+
     c_ : (r,) ndarray or None
         Learned ROM constant term, or None if 'c' is not in `modelform`.
 
@@ -401,7 +1320,8 @@ class InferredContinuousROM(_InferredMixin, _NonparametricMixin,
         of integrating the learned ROM in predict(). For more details, see
         https://docs.scipy.org/doc/scipy/reference/integrate.html.
     """
-    def fit(self, Vr, X, Xdot, U=None, P=0):
+    def fit(self, Vr, X, Xdot, U=None, P=0, chunksize=None,
+            solver="lstsq", workers=None, processes=None, warm_start=False):
         """Solve for the reduced model operators via ordinary least squares.
 
         Parameters
@@ -423,13 +1343,80 @@ class InferredContinuousROM(_InferredMixin, _NonparametricMixin,
             input), then U may be a one-dimensional array. Required if 'B' is
             in `modelform`; must be None if 'B' is not in `modelform`.
 
-        P : float >= 0 or (d,d) ndarray or list of r (floats or (d,d) ndarrays)
+        P : float >= 0 or dict or (d,) or (d,d) ndarray or list of r of these
             Tikhonov regularization factor(s); see utils.lstsq_reg(). Here, d
             is the number of unknowns in each decoupled least-squares problem,
-            e.g., d = r + m when `modelform`="AB".
+            e.g., d = r + m when `modelform`="AB". A dictionary maps terms of
+            the model to scalar factors, e.g., {'A': 1e-3, 'H': 1e-1}, for a
+            diagonal regularization matrix that penalizes the entries of each
+            operator separately (terms not in the dictionary are not
+            regularized). Diagonal regularization never forms a (d,d) matrix.
+
+        chunksize : int > 0 or None
+            If given, assemble the least-squares problem `chunksize` snapshots
+            at a time; see _InferredMixin.fit().
+
+        solver : str
+            The least-squares solver backend, "lstsq" (default), "normal",
+            "svd", "lsqr", or "lsmr"; see _InferredMixin.fit().
+
+        workers : int or None
+            Number of threads for solving the decoupled least-squares problems
+            concurrently; see utils.lstsq_reg().
+
+        processes : int or None
+            Number of worker processes for assembling and factoring the
+            least-squares problem in parallel; see _InferredMixin.fit().
+
+        warm_start : bool or _InferredMixin
+            Initial guess for the operators with an iterative solver
+            ("lsqr" or "lsmr"); see _InferredMixin.fit().
+
+        Returns
+        -------
+        self
+        """
+        return _InferredMixin.fit(self, Vr, X, Xdot, U, P,
+                                  chunksize, solver, workers, processes,
+                                  warm_start)
+
+    def partial_fit(self, Vr, X, Xdot, U=None, P=0, solver="lstsq",
+                    workers=None):
+        """Update the reduced model operators with a new batch of snapshots,
+        without revisiting the snapshots from previous calls. Only a compact
+        triangular factor of the data (independent of the number of snapshots)
+        is stored between calls; fit() discards it.
+
+        Parameters
+        ----------
+        Vr : (n,r) ndarray or None
+            The basis for the linear reduced space (e.g., POD basis matrix).
+            If None, X and Xdot are assumed to already be projected (r,k).
+            Must have the same shape in each call.
+
+        X : (n,k) or (r,k) ndarray
+            New column-wise snapshot training data.
+
+        Xdot : (n,k) or (r,k) ndarray
+            The corresponding column-wise velocity training data.
+
+        U : (m,k) or (k,) ndarray or None
+            Column-wise inputs corresponding to the snapshots.
+
+        P : float >= 0 or dict or (d,) or (d,d) ndarray or list of r of these
+            Tikhonov regularization factor(s); see _InferredMixin.fit().
+
+        solver : str
+            The least-squares solver backend, "lstsq" (default), "normal",
+            "svd", "lsqr", or "lsmr"; see _InferredMixin.fit().
+
+        workers : int or None
+            Number of threads for solving the decoupled least-squares problems
+            concurrently; see utils.lstsq_reg().
 
         Returns
         -------
         self
         """
-        return _InferredMixin.fit(self, Vr, X, Xdot, U, P)
+        return _InferredMixin._partial_fit(self, Vr, X, Xdot, U, P,
+                                           solver, workers)
@@ -18,6 +18,7 @@ from scipy.interpolate import CubicSpline
 
 from ._base import _InterpolatedMixin
 from .._base import _DiscreteROM, _ContinuousROM
+from ...utils import expand_Hc as Hc2H, expand_Gc as Gc2G
 from .._inferred import (_InferredMixin,
                         InferredDiscreteROM,
                         InferredContinuousROM)
@@ -127,13 +128,14 @@ class _InterpolatedInferredMixin(_InferredMixin, _InterpolatedMixin):
             model.parameter = µ
             self.models_.append(model)
 
-        # Construct interpolators.
+        # Construct interpolators. The full quadratic / cubic operators are
+        # linear in the compact ones, so only expand them on request.
         self.c_ = CubicSpline(µs, self.cs_)  if self.has_constant  else None
         self.A_ = CubicSpline(µs, self.As_)  if self.has_linear    else None
         self.Hc_= CubicSpline(µs, self.Hcs_) if self.has_quadratic else None
-        self.H_ = CubicSpline(µs, self.Hs_)  if self.has_quadratic else None
+        self.H_ = (lambda µ: Hc2H(self.Hc_(µ))) if self.has_quadratic else None
         self.Gc_= CubicSpline(µs, self.Gcs_) if self.has_cubic     else None
-        self.G_ = CubicSpline(µs, self.Gs_)  if self.has_cubic     else None
+        self.G_ = (lambda µ: Gc2G(self.Gc_(µ))) if self.has_cubic else None
         self.B_ = CubicSpline(µs, self.Bs_)  if self.has_inputs    else None
 
         return self
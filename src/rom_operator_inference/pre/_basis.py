@@ -55,6 +55,8 @@ def pod_basis(X, r=None, mode="dense", **options):
     -------
     Vr : (n,r) ndarray
         The first r POD basis vectors of X. Each column is one basis vector.
+        Has the same floating-point precision as X (e.g., float32 snapshots
+        give a float32 basis), so that projections stay in that precision.
 
     svdvals : (r,) ndarray
         The first r singular values of X (highest magnitute first).
@@ -95,7 +97,9 @@ def pod_basis(X, r=None, mode="dense", **options):
     else:
         raise NotImplementedError(f"invalid mode '{mode}'")
 
-    # Return the first 'r' values.
+    # Return the first 'r' values in the precision of the data.
+    if np.issubdtype(X.dtype, np.floating):
+        V = V.astype(X.dtype, copy=False)
     return V[:,:r], svdvals[:r]
 
 
@@ -3,3 +3,4 @@
 
 from ._solver import *
 from ._kronecker import *
+from ._integrate import *
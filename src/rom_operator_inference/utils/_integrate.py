@@ -0,0 +1,341 @@
+# utils/_integrate.py
+"""Low-overhead explicit Runge-Kutta integrators for small reduced models."""
+
+__all__ = [
+            "integrate",
+          ]
+
+import numpy as np
+import scipy.linalg as la
+from scipy.optimize import OptimizeResult
+
+
+# Fixed-step methods ==========================================================
+def _euler(fun, t, x, h, f):
+    """One forward Euler step (f = fun(t, x))."""
+    return x + h*f
+
+
+def _ssprk3(fun, t, x, h, f):
+    """One step of the three-stage, third-order strong stability preserving
+    Runge-Kutta method of Shu and Osher (f = fun(t, x)).
+    """
+    x1 = x + h*f
+    x2 = .75*x + .25*(x1 + h*fun(t + h, x1))
+    return x/3 + (2/3)*(x2 + h*fun(t + h/2, x2))
+
+
+def _rk4(fun, t, x, h, f):
+    """One step of the classical fourth-order Runge-Kutta method
+    (f = fun(t, x)).
+    """
+    k2 = fun(t + h/2, x + (h/2)*f)
+    k3 = fun(t + h/2, x + (h/2)*k2)
+    k4 = fun(t + h, x + h*k3)
+    return x + (h/6)*(f + 2*(k2 + k3) + k4)
+
+
+# Number of right-hand side evaluations per step (including f = fun(t, x)).
+_FIXED = {"euler": (_euler, 1), "ssprk3": (_ssprk3, 3), "rk4": (_rk4, 4)}
+# Implicit weight gamma of each IMEX method, i.e., every implicit solve is
+# with the matrix I - gamma*h*A for the step size h.
+_IMEX = {"imex_euler": 1, "cnab2": 1/2, "ars222": 1 - 1/np.sqrt(2)}
+_METHODS = tuple(_FIXED) + ("dopri5",) + tuple(_IMEX)
+
+
+def _integrate_fixed(fun, t, x0, method, max_step):
+    """Step on the grid `t`, subdividing each interval into the fewest equal
+    steps no longer than max_step.
+    """
+    step, nstages = _FIXED[method]
+    X = np.empty((t.size,) + x0.shape, dtype=x0.dtype)
+    X[0] = x = x0
+    nfev = 0
+    for k in range(t.size - 1):
+        dt = t[k+1] - t[k]
+        nsub = max(1, int(np.ceil(abs(dt) / max_step - 1e-10)))
+        h, s = dt / nsub, t[k]
+        for _ in range(nsub):
+            x = step(fun, s, x, h, fun(s, x))
+            s += h
+        X[k+1] = x
+        nfev += nsub * nstages
+    return X, nfev, 0, \
+        "The solver successfully reached the end of the integration interval."
+
+
+# Implicit-explicit methods ===================================================
+def _integrate_imex(fun, A, t, x0, method, max_step):
+    """Step on the grid `t` as in _integrate_fixed(), treating the linear
+    term A x implicitly and fun(t, x) explicitly. The LU factorization of
+    I - gamma*h*A is computed once for each distinct step size h.
+    """
+    gamma = _IMEX[method]
+    I = np.eye(A.shape[0])
+    factors = {}
+    # Step sizes that differ only by rounding share a factorization.
+    hmax = np.max(np.abs(np.diff(t))) if t.size > 1 else 1
+
+    def solve(h, rhs):
+        """Solve (I - gamma*h*A) x = rhs."""
+        key = int(round(h / hmax * 1e12))
+        if key not in factors:
+            factors[key] = la.lu_factor(I - (gamma*h)*A)
+        return la.lu_solve(factors[key], rhs)
+
+    X = np.empty((t.size,) + x0.shape, dtype=x0.dtype)
+    X[0] = x = x0
+    nfev, gprev = 0, None
+    if method == "ars222":
+        delta = 1 - 1/(2*gamma)
+    for k in range(t.size - 1):
+        dt = t[k+1] - t[k]
+        nsub = max(1, int(np.ceil(abs(dt) / max_step - 1e-10)))
+        h, s = dt / nsub, t[k]
+        for _ in range(nsub):
+            g = fun(s, x)
+            if method == "imex_euler":
+                # Forward-backward Euler.
+                x = solve(h, x + h*g)
+            elif method == "ars222":
+                # Ascher-Ruuth-Spiteri (2,2,2), L-stable and stiffly accurate.
+                x1 = solve(h, x + (gamma*h)*g)
+                g1 = fun(s + gamma*h, x1)
+                nfev += 1
+                x = solve(h, x + h*(delta*g + (1 - delta)*g1
+                                    + (1 - gamma)*(A @ x1)))
+            elif gprev is None:
+                # Crank-Nicolson with forward Euler to start CNAB2.
+                x = solve(h, x + (h/2)*(A @ x) + h*g)
+            else:
+                # Crank-Nicolson with (variable step) Adams-Bashforth 2.
+                w = h / hprev
+                x = solve(h, x + (h/2)*(A @ x)
+                             + h*((1 + w/2)*g - (w/2)*gprev))
+            gprev, hprev = g, h
+            s += h
+            nfev += 1
+        X[k+1] = x
+    return X, nfev, len(factors), \
+        "The solver successfully reached the end of the integration interval."
+
+
+# Adaptive method (Dormand-Prince 5(4)) =======================================
+_DP_C = [0, 1/5, 3/10, 4/5, 8/9, 1]
+_DP_A = [np.array([]),
+         np.array([1/5]),
+         np.array([3/40, 9/40]),
+         np.array([44/45, -56/15, 32/9]),
+         np.array([19372/6561, -25360/2187, 64448/6561, -212/729]),
+         np.array([9017/3168, -355/33, 46732/5247, 49/176, -5103/18656])]
+_DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+# Difference between the fifth- and fourth-order weights (7 stages, FSAL).
+_DP_E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525,
+                  -1/40])
+# Coefficients of the quartic continuous extension (Shampine, 1986).
+_DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608,
+     -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933,
+     87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304,
+     -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408,
+     701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423]])
+
+
+def _rms(x):
+    """Root mean square of the entries of the one-dimensional array x."""
+    return np.sqrt(np.dot(x, x) / x.size)
+
+
+def _initial_step(fun, t0, x0, f0, direction, rtol, atol):
+    """Estimate a good first step size (Hairer, Norsett & Wanner, II.4)."""
+    scale = atol + rtol*np.abs(x0)
+    d0, d1 = _rms(x0 / scale), _rms(f0 / scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else .01 * d0 / d1
+    f1 = fun(t0 + direction*h0, x0 + direction*h0*f0)
+    d2 = _rms((f1 - f0) / scale) / h0
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0*1e-3)
+    else:
+        h1 = (.01 / max(d1, d2))**(1/5)
+    return min(100*h0, h1)
+
+
+def _integrate_dopri5(fun, t, x0, rtol, atol, max_step, first_step):
+    """Integrate with error control, evaluating the solution at the times `t`
+    with the continuous extension of the method (as solve_ivp() does), so the
+    step sizes do not depend on the spacing of `t`.
+    """
+    # Work with flat states (and reshape only to call fun()).
+    shape = x0.shape
+    if x0.ndim > 1:
+        _fun = fun
+        fun = lambda s, x: _fun(s, x.reshape(shape)).ravel()
+    X = np.empty((t.size, x0.size), dtype=x0.dtype)
+    X[0] = x = x0.ravel()
+    K = np.empty((7, x.size), dtype=x0.dtype)
+    direction = 1 if t[-1] >= t[0] else -1
+    s, f = t[0], fun(t[0], x)
+    nfev = 1
+    if first_step is None:
+        h = _initial_step(fun, s, x, f, direction, rtol, atol)
+        nfev += 1
+    else:
+        h = first_step
+    h, k = min(h, max_step), 1
+
+    while k < t.size:
+        if h < 10*np.abs(np.spacing(s)):
+            return X[:k].reshape((k,) + shape), nfev, 1, \
+                "Required step size is less than spacing between numbers."
+        # Shorten the step to land on the final time (up to rounding, which
+        # would otherwise leave a negligible last step).
+        last = abs(t[-1] - s) <= h + 10*np.abs(np.spacing(t[-1]))
+        hs = direction*(abs(t[-1] - s) if last else h)
+
+        # Runge-Kutta stages, using the first-same-as-last property.
+        K[0] = f
+        for i in range(1, 6):
+            K[i] = fun(s + _DP_C[i]*hs, x + hs*(_DP_A[i] @ K[:i]))
+        xnew = x + hs*(_DP_B @ K[:6])
+        K[6] = fnew = fun(s + hs, xnew)
+        nfev += 6
+
+        # Error control.
+        scale = atol + rtol*np.maximum(np.abs(x), np.abs(xnew))
+        err = _rms(hs*(_DP_E @ K) / scale)
+        if not np.isfinite(err):
+            h *= .2
+            continue
+        factor = 10 if err == 0 else min(10, max(.2, .9 * err**(-1/5)))
+        if err > 1:
+            h = abs(hs) * min(1, factor)
+            continue
+
+        # Accept the step and interpolate at the output times it covers.
+        snew = t[-1] if last else s + hs
+        l = k
+        while l < t.size and direction*(t[l] - snew) <= 0:
+            l += 1
+        if l > k:
+            theta = (t[k:l] - s) / hs
+            powers = np.cumprod(np.repeat(theta[:,np.newaxis], 4, axis=1),
+                                axis=1)
+            X[k:l] = x + hs*((powers @ _DP_P.T) @ K)
+            if last:
+                X[-1] = xnew
+            k = l
+        s, x, f = snew, xnew, fnew
+        h = min(abs(hs)*factor if not last else h, max_step)
+
+    return X.reshape((t.size,) + shape), nfev, 0, \
+        "The solver successfully reached the end of the integration interval."
+
+
+# Public interface ============================================================
+def integrate(fun, t, x0, method="rk4", max_step=np.inf, rtol=1e-3,
+              atol=1e-6, first_step=None, A=None):
+    """Integrate the system dx / dt = fun(t, x) with a built-in explicit
+    Runge-Kutta method, or the system dx / dt = A x + fun(t, x) with a
+    built-in implicit-explicit (IMEX) method. These avoid most of the
+    per-step overhead of scipy.integrate.solve_ivp(), which dominates the cost
+    of integrating small systems (r <= 30 or so). The state may be a single
+    vector or a block of N vectors (one per column) that are advanced
+    together.
+
+    Parameters
+    ----------
+    fun : callable
+        The right-hand side fun(t, x), returning an array with the shape of x.
+        For IMEX methods, only the (non-stiff) part of the right-hand side
+        that is treated explicitly.
+
+    t : (nt,) ndarray
+        The (monotonic) times at which to report the solution. The initial
+        condition is given at t[0].
+
+    x0 : (r,) or (r,N) ndarray
+        The initial state (or states, as columns).
+
+    method : str
+        The integration method.
+        * 'euler': forward Euler (first order).
+        * 'ssprk3': Shu-Osher strong stability preserving Runge-Kutta method
+            (third order).
+        * 'rk4' (default): Classical Runge-Kutta method (fourth order).
+        * 'dopri5': Dormand-Prince embedded Runge-Kutta method of order 5(4)
+            with adaptive step size control. The solution at the times `t` is
+            interpolated, so dense output does not shorten the steps.
+        * 'imex_euler': Forward-backward Euler IMEX method (first order).
+        * 'cnab2': Crank-Nicolson / Adams-Bashforth IMEX method (second
+            order, A-stable but not L-stable, so stiff components that the
+            step size does not resolve decay slowly, with oscillations).
+        * 'ars222': Ascher-Ruuth-Spiteri (2,2,2) IMEX Runge-Kutta method
+            (second order, L-stable).
+        The fixed-step methods (all but 'dopri5') take one step per interval
+        of `t` unless the interval is longer than `max_step`.
+
+    max_step : float > 0
+        The largest allowed step size.
+
+    rtol, atol : float > 0
+        Relative and absolute error tolerances ('dopri5' only).
+
+    first_step : float > 0 or None
+        The initial step size ('dopri5' only). If None, it is estimated.
+
+    A : (r,r) ndarray
+        The (stiff) linear operator treated implicitly (IMEX methods only).
+        Each implicit stage solves a system with I - gamma*h*A for the step
+        size h and a constant gamma of the method; its LU factorization is
+        computed once per distinct step size.
+
+    Returns
+    -------
+    sol : scipy.optimize.OptimizeResult
+        Bunch object (like the result of solve_ivp()) with the attributes
+        * t : (nt,) ndarray, the times at which the solution was computed.
+        * y : (r,nt) or (r,nt,N) ndarray, the solution at those times.
+        * nfev : int, the number of evaluations of fun().
+        * nlu : int, the number of LU factorizations (IMEX methods).
+        * status : int, 0 on success, 1 if the step size became too small.
+        * message : str, description of the termination reason.
+        * success : bool, True if status is 0.
+    """
+    t = np.asarray(t)
+    if t.ndim != 1:
+        raise ValueError("time 't' must be one-dimensional")
+    if max_step <= 0:
+        raise ValueError("max_step must be positive")
+    x0 = np.asarray(x0)
+    x0 = x0.astype(np.result_type(x0.dtype, float), copy=False)
+
+    nlu = 0
+    if method in _FIXED:
+        X, nfev, status, message = _integrate_fixed(fun, t, x0, method,
+                                                    max_step)
+    elif method == "dopri5":
+        X, nfev, status, message = _integrate_dopri5(fun, t, x0, rtol, atol,
+                                                     max_step, first_step)
+    elif method in _IMEX:
+        if A is None:
+            raise ValueError(f"method '{method}' requires the linear"
+                             " operator A")
+        A = np.asarray(A)
+        if A.shape != (x0.shape[0],)*2:
+            raise ValueError("A must be (r,r) with r = x0.shape[0]")
+        X, nfev, nlu, message = _integrate_imex(fun, A, t, x0, method,
+                                                max_step)
+        status = 0
+    else:
+        raise ValueError(f"invalid method '{method}'; options are "
+                         + ", ".join(_METHODS))
+
+    return OptimizeResult(t=t[:X.shape[0]], y=np.moveaxis(X, 0, 1),
+                          nfev=nfev, njev=0, nlu=nlu, status=status,
+                          message=message, success=(status == 0))
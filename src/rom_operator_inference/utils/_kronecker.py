@@ -2,8 +2,12 @@
 """Utility functions for compact / full Kronecker products."""
 
 __all__ = [
+            "kronc_size",
+            "kronc",
             "kron2c",
             "kron3c",
+            "compress_operator",
+            "expand_operator",
             "compress_H",
             "expand_Hc",
             "compress_G",
@@ -11,12 +15,271 @@ __all__ = [
           ]
 
 import itertools
+import functools
 import numpy as np
 import scipy.special as special
+import scipy.sparse as sparse
+import scipy.sparse.linalg as spla
+
+
+# Index plans =================================================================
+def kronc_size(r, p):
+    """Calculate the number of unique terms in the compact Kronecker product
+    of an r-vector with itself p times, i.e., binom(r+p-1, p).
+
+    Parameters
+    ----------
+    r : int
+        The dimension of the vector x.
+
+    p : int
+        The degree of the product (2 = quadratic, 3 = cubic, etc.).
+
+    Returns
+    -------
+    s : int
+        The number of unique terms, e.g., r(r+1)/2 for p = 2.
+    """
+    return special.comb(r + p - 1, p, exact=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _kronc_indices(r, p):
+    """Get the index tables (i, j) for the compact Kronecker product of an
+    r-vector with itself p >= 2 times, so that
+    kronc(x, p) = x[i] * kronc(x, p-1)[j]. Cached for each (r,p).
+
+    Parameters
+    ----------
+    r : int
+        The dimension of the vector x.
+
+    p : int
+        The degree of the product (2 = quadratic, 3 = cubic, etc.).
+
+    Returns
+    -------
+    i, j : (s,) ndarrays of ints
+        The row indices of x and of kronc(x, p-1), respectively, making up
+        each term of the compact product. Here s = kronc_size(r, p).
+    """
+    # The terms with leading index i are x[i] * kronc(x, p-1)[:lens[i]].
+    lens = [kronc_size(l+1, p-1) for l in range(r)]
+    i = np.repeat(np.arange(r), lens)
+    j = np.concatenate([np.arange(l) for l in lens])
+    i.flags.writeable = False
+    j.flags.writeable = False
+    return i, j
+
+
+@functools.lru_cache(maxsize=None)
+def _kronc_terms(r, p):
+    """Get the indices (i_1, ..., i_p), i_1 >= ... >= i_p, of x making up each
+    term x[i_1] * ... * x[i_p] of the compact Kronecker product kronc(x, p).
+    Cached for each (r,p).
+
+    Returns
+    -------
+    terms : (p,s) ndarray of ints
+        The indices of each term (columns) in the order of kronc(x, p).
+    """
+    if p == 1:
+        terms = np.arange(r).reshape((1,r))
+    else:
+        i, j = _kronc_indices(r, p)
+        terms = np.vstack((i, _kronc_terms(r, p-1)[:,j]))
+    terms.flags.writeable = False
+    return terms
+
+
+def _kron2c_indices(r):
+    """Get the index tables (i, j) such that kron2c(x) = x[i] * x[j]."""
+    return _kronc_indices(r, 2)
+
+
+def _kron3c_indices(r):
+    """Get the index tables (i, j) such that kron3c(x) = x[i] * kron2c(x)[j].
+    """
+    return _kronc_indices(r, 3)
+
+
+@functools.lru_cache(maxsize=None)
+def _operator_indices(r, p):
+    """Get the index maps between the full matricized operator (r**p columns)
+    and the compact matricized operator (one column per unique term of the
+    degree-p compact Kronecker product). Cached for each (r,p).
+
+    Parameters
+    ----------
+    r : int
+        The dimension of the state vector x.
+
+    p : int
+        The degree of the Kronecker product (2 = quadratic, 3 = cubic, etc.).
+
+    Returns
+    -------
+    perms : (p!,s) ndarray of ints
+        Full column indices of each permutation of each compact term, e.g.,
+        for p = 2 the compact term (i,j) appears in full columns i*r + j and
+        j*r + i. Repeated terms (e.g., i == j) appear more than once.
+
+    mult : (s,) ndarray of ints
+        The number of distinct full columns corresponding to each compact
+        column, i.e., the number of unique rows in each column of `perms`.
+
+    full2compact : (r**p,) ndarray of ints
+        The compact column index corresponding to each full column index.
+    """
+    terms = _kronc_terms(r, p)
+    s = terms.shape[1]
+    perms = np.array([np.ravel_multi_index(terms[list(sigma)], (r,)*p)
+                      for sigma in itertools.permutations(range(p))])
+    ordered = np.sort(perms, axis=0)
+    mult = 1 + np.count_nonzero(np.diff(ordered, axis=0), axis=0)
+    full2compact = np.empty(r**p, dtype=int)
+    full2compact[perms] = np.arange(s)
+
+    for indices in (perms, mult, full2compact):
+        indices.flags.writeable = False
+    return perms, mult, full2compact
+
+
+@functools.lru_cache(maxsize=None)
+def _kronc_jacobian_indices(r, p):
+    """Get the sparsity structure of the (s,r) Jacobian of the compact
+    Kronecker product kronc(x, p), in CSR format. Cached for each (r,p).
+
+    The derivative of the term x[i_1] * ... * x[i_p] with respect to x[k] is
+    c * kronc(x, p-1)[l], where c is the number of times k appears in
+    (i_1, ..., i_p) and l is the compact index of the remaining p-1 factors.
+
+    Parameters
+    ----------
+    r : int
+        The dimension of the vector x.
+
+    p : int
+        The degree of the product (2 = quadratic, 3 = cubic, etc.).
+
+    Returns
+    -------
+    indptr : (s+1,) ndarray of ints
+        The CSR row pointers, s = kronc_size(r, p).
+
+    indices : (nnz,) ndarray of ints
+        The column index k of each nonzero entry.
+
+    columns : (nnz,) ndarray of ints
+        The row index l of kronc(x, p-1) for each nonzero entry.
+
+    counts : (nnz,) ndarray of ints
+        The multiplicity c of each nonzero entry.
+    """
+    terms = _kronc_terms(r, p)
+    s = terms.shape[1]
+    full2compact = _operator_indices(r, p-1)[2]
+
+    # Differentiate each term with respect to each of its p factors.
+    rows = np.tile(np.arange(s), p)
+    derivs = terms.ravel()
+    rest = np.concatenate([
+        full2compact[np.ravel_multi_index(np.delete(terms, l, axis=0),
+                                          (r,)*(p-1))]
+        for l in range(p)])
+
+    # Repeated factors give the same entry (with the same remaining factors).
+    keys, first, counts = np.unique(rows*r + derivs,
+                                    return_index=True, return_counts=True)
+    indptr = np.searchsorted(keys // r, np.arange(s+1))
+    indices, columns = keys % r, rest[first]
+
+    for arr in (indptr, indices, columns, counts):
+        arr.flags.writeable = False
+    return indptr, indices, columns, counts
+
+
+@functools.lru_cache(maxsize=None)
+def _expansion_matrix(r, p):
+    """Get the sparse (s,r**p) matrix E such that the full matricized operator
+    of degree p is given by O = Oc @ E, where Oc is the compact matricized
+    operator. Cached for each (r,p).
+    """
+    _, mult, full2compact = _operator_indices(r, p)
+    return sparse.csr_matrix(((1 / mult)[full2compact],
+                              (full2compact, np.arange(r**p))),
+                             shape=(mult.size, r**p))
+
+
+def _compress(O, p):
+    """Sum the columns of the full operator O that correspond to the same
+    unique term of the degree-p compact Kronecker product.
+    """
+    perms, mult, _ = _operator_indices(O.shape[0], p)
+    Oc = O[:,perms[0]]
+    for cols in perms[1:]:
+        Oc += O[:,cols]
+    return Oc * (mult / perms.shape[0])
+
+
+def _expand(Oc, p, mode="dense"):
+    """Distribute the columns of the compact operator Oc evenly among the
+    columns of the full operator that correspond to the same unique term.
+    See expand_Hc() for the `mode` options.
+    """
+    r = Oc.shape[0]
+    if mode == "dense":
+        _, mult, full2compact = _operator_indices(r, p)
+        return (Oc / mult)[:,full2compact]
+    elif mode == "sparse":
+        # Only the nonzero entries of Oc are expanded (Oc may be sparse).
+        return sparse.csr_matrix(Oc) @ _expansion_matrix(r, p)
+    elif mode == "operator":
+        E = _expansion_matrix(r, p)
+        return spla.aslinearoperator(Oc).dot(spla.aslinearoperator(E))
+    else:
+        raise NotImplementedError(f"invalid mode '{mode}'")
 
 
 # Kronecker (Khatri-Rao) products =============================================
-def kron2c(x, checkdim=False):
+def kronc(x, p, checkdim=False, out=None):
+    """Calculate the unique terms of the Kronecker product of x with itself
+    p times, x ⊗ ... ⊗ x.
+
+    Parameters
+    ----------
+    x : (n,) or (n,k) ndarray
+        If two-dimensional, the product is computed column-wise (Khatri-Rao).
+
+    p : int >= 1
+        The degree of the product (2 = quadratic, 3 = cubic, etc.).
+
+    checkdim : bool
+        If true, check that the input `x` is one- or two-dimensional.
+
+    out : (s,) or (s,k) ndarray or None
+        If given, an array in which to store the result (avoiding a new
+        allocation for the output). Here s = kronc_size(n, p).
+
+    Returns
+    -------
+    x ⊗ ... ⊗ x : (s,) or (s,k) ndarray
+        The "compact" Kronecker product of x with itself p times.
+    """
+    if checkdim and x.ndim not in (1,2):
+        raise ValueError("x must be one- or two-dimensional")
+    if not isinstance(p, (int, np.integer)) or p < 1:
+        raise ValueError(f"invalid degree p = {p}")
+    if p == 1:
+        if out is None:
+            return x
+        out[...] = x
+        return out
+    i, j = _kronc_indices(x.shape[0], p)
+    return np.multiply(x[i], kronc(x, p-1)[j], out=out)
+
+
+def kron2c(x, checkdim=False, out=None):
     """Calculate the unique terms of the quadratic Kronecker product x ⊗ x.
 
     Parameters
@@ -27,17 +290,19 @@ def kron2c(x, checkdim=False):
     checkdim : bool
         If true, check that the input `x` is one- or two-dimensional.
 
+    out : (n(n+1)/2,) or (n(n+1)/2,k) ndarray or None
+        If given, an array in which to store the result (avoiding a new
+        allocation for the output).
+
     Returns
     -------
     x ⊗ x : (n(n+1)/2,) or (n(n+1)/2,k) ndarray
         The "compact" Kronecker product of x with itself.
     """
-    if checkdim and x.ndim not in (1,2):
-        raise ValueError("x must be one- or two-dimensional")
-    return np.concatenate([x[i] * x[:i+1] for i in range(x.shape[0])], axis=0)
+    return kronc(x, 2, checkdim, out)
 
 
-def kron3c(x, checkdim=False):
+def kron3c(x, checkdim=False, out=None):
     """Calculate the unique terms of the cubic Kronecker product x ⊗ x ⊗ x.
 
     Parameters
@@ -48,20 +313,76 @@ def kron3c(x, checkdim=False):
     checkdim : bool
         If true, check that the input `x` is one- or two-dimensional.
 
+    out : (n(n+1)(n+2)/6,) or (n(n+1)(n+2)/6,k) ndarray or None
+        If given, an array in which to store the result (avoiding a new
+        allocation for the output).
+
     Returns
     -------
     x ⊗ x : (n(n+1)(n+2)/6,) or (n(n+1)(n+2)/6,k) ndarray
         The "compact" Kronecker product of x with itself three times.
     """
-    if checkdim and x.ndim not in (1,2):
-        raise ValueError("x must be one- or two-dimensional")
-    x2 = kron2c(x, False)
-    lens = special.binom(np.arange(2, len(x)+2), 2).astype(int)
-    return np.concatenate([x[i] * x2[:lens[i]]
-                           for i in range(x.shape[0])], axis=0)
+    return kronc(x, 3, checkdim, out)
 
 
 # Matricized tensor management ================================================
+def compress_operator(O, p):
+    """Calculate the matricized degree-p operator that operates on the compact
+    Kronecker product kronc(x, p).
+
+    Parameters
+    ----------
+    O : (r,r**p) ndarray
+        The matricized tensor that operates on the full p-fold Kronecker
+        product. This should be a symmetric operator in the sense that each
+        layer of O.reshape((r,)*(p+1)) is a symmetric tensor, but it is not
+        required.
+
+    p : int >= 2
+        The degree of the operator (2 = quadratic, 3 = cubic, etc.).
+
+    Returns
+    -------
+    Oc : (r,s) ndarray
+        The matricized tensor that operates on the compact Kronecker product.
+        Here s = kronc_size(r, p).
+    """
+    r, a = O.shape
+    if a != r**p:
+        raise ValueError(f"invalid shape (r,a) = {(r,a)} with a != r**{p}")
+    return _compress(O, p)
+
+
+def expand_operator(Oc, p, mode="dense"):
+    """Calculate the matricized degree-p operator that operates on the full
+    p-fold Kronecker product.
+
+    Parameters
+    ----------
+    Oc : (r,s) ndarray
+        The matricized tensor that operates on the compact Kronecker product
+        kronc(x, p). Here s = kronc_size(r, p).
+
+    p : int >= 2
+        The degree of the operator (2 = quadratic, 3 = cubic, etc.).
+
+    mode : str
+        The format of the output; see expand_Hc().
+
+    Returns
+    -------
+    O : (r,r**p) ndarray, csr_matrix, or LinearOperator
+        The matricized tensor that operates on the full Kronecker product.
+        This is a symmetric operator in the sense that each layer of
+        O.reshape((r,)*(p+1)) is a symmetric tensor.
+    """
+    r, s = Oc.shape
+    if s != kronc_size(r, p):
+        raise ValueError(f"invalid shape (r,s) = {(r,s)} "
+                         f"with s != binom(r+{p-1},{p})")
+    return _expand(Oc, p, mode)
+
+
 def compress_H(H):
     """Calculate the matricized quadratic operator that operates on the compact
     Kronecker product.
@@ -84,35 +405,33 @@ def compress_H(H):
     r2 = H.shape[1]
     if r2 != r**2:
         raise ValueError(f"invalid shape (r,a) = {(r,r2)} with a != r**2")
-    s = r * (r+1) // 2
-    Hc = np.empty((r, s))
-
-    fj = 0
-    for i in range(r):
-        for j in range(i+1):
-            if i == j:      # Place column for unique term.
-                Hc[:,fj] = H[:,(i*r)+j]
-            else:           # Combine columns for repeated terms.
-                fill = H[:,(i*r)+j] + H[:,(j*r)+i]
-                Hc[:,fj] = fill
-            fj += 1
-
-    return Hc
+    return _compress(H, 2)
 
 
-def expand_Hc(Hc):
+def expand_Hc(Hc, mode="dense"):
     """Calculate the matricized quadratic operator that operates on the full
     Kronecker product.
 
     Parameters
     ----------
-    Hc : (r,s) ndarray
+    Hc : (r,s) ndarray (or scipy.sparse matrix if mode="sparse")
         The matricized quadratic tensor that operates on the compact Kronecker
         product. Here s = r * (r+1) / 2.
 
+    mode : str
+        The format of the output. Options:
+        * "dense" (default): a dense ndarray.
+        * "sparse": a scipy.sparse.csr_matrix, which only stores the nonzero
+            entries. Hc may also be a scipy.sparse matrix. This only saves
+            memory if most entries of Hc are zero; for a dense Hc (e.g., a
+            learned operator), the index arrays make it larger than "dense",
+            so use "operator" instead.
+        * "operator": a scipy.sparse.linalg.LinearOperator that applies the
+            full operator through Hc without ever forming it.
+
     Returns
     -------
-    H : (r,r**2) ndarray
+    H : (r,r**2) ndarray, csr_matrix, or LinearOperator
         The matricized quadratic tensor that operates on the full Kronecker
         product. This is a symmetric operator in the sense that each layer of
         H.reshape((r,r,r)) is a symmetric (r,r) matrix.
@@ -120,20 +439,7 @@ def expand_Hc(Hc):
     r,s = Hc.shape
     if s != r*(r+1)//2:
         raise ValueError(f"invalid shape (r,s) = {(r,s)} with s != r(r+1)/2")
-
-    H = np.empty((r,r**2))
-    fj = 0
-    for i in range(r):
-        for j in range(i+1):
-            if i == j:      # Place column for unique term.
-                H[:,(i*r)+j] = Hc[:,fj]
-            else:           # Distribute columns for repeated terms.
-                fill = Hc[:,fj] / 2
-                H[:,(i*r)+j] = fill
-                H[:,(j*r)+i] = fill
-            fj += 1
-
-    return H
+    return _expand(Hc, 2, mode)
 
 
 def compress_G(G):
@@ -158,35 +464,33 @@ def compress_G(G):
     r3 = G.shape[1]
     if r3 != r**3:
         raise ValueError(f"invalid shape (r,a) = {(r,r3)} with a != r**3")
-    s = r * (r+1) * (r+2) // 6
-    Gc = np.empty((r, s))
-
-    fj = 0
-    for i in range(r):
-        for j in range(i+1):
-            for k in range(j+1):
-                idxs = set(itertools.permutations((i,j,k),3))
-                Gc[:,fj] = np.sum([G[:,(a*r**2)+(b*r)+c] for a,b,c in idxs],
-                                  axis=0)
-                fj += 1
+    return _compress(G, 3)
 
-    # assert fj == s
-    return Gc
 
-
-def expand_Gc(Gc):
+def expand_Gc(Gc, mode="dense"):
     """Calculate the matricized quadratic operator that operates on the full
     cubic Kronecker product.
 
     Parameters
     ----------
-    Gc : (r,s) ndarray
+    Gc : (r,s) ndarray (or scipy.sparse matrix if mode="sparse")
         The matricized quadratic tensor that operates on the compact cubic
         Kronecker product. Here s = r * (r+1) * (r+2) / 6.
 
+    mode : str
+        The format of the output. Options:
+        * "dense" (default): a dense ndarray.
+        * "sparse": a scipy.sparse.csr_matrix, which only stores the nonzero
+            entries. Gc may also be a scipy.sparse matrix. This only saves
+            memory if most entries of Gc are zero; for a dense Gc (e.g., a
+            learned operator), the index arrays make it larger than "dense",
+            so use "operator" instead.
+        * "operator": a scipy.sparse.linalg.LinearOperator that applies the
+            full operator through Gc without ever forming it.
+
     Returns
     -------
-    G : (r,r**3) ndarray
+    G : (r,r**3) ndarray, csr_matrix, or LinearOperator
         The matricized quadratic tensor that operates on the full cubic
         Kronecker product. This is a symmetric operator in the sense that each
         layer of G.reshape((r,r,r,r)) is a symmetric (r,r,r) matrix.
@@ -195,17 +499,4 @@ def expand_Gc(Gc):
     if s != r * (r+1) * (r+2) // 6:
         raise ValueError(f"invalid shape (r,s) = {(r,s)}"
                          " with s != r(r+1)(r+2)/6")
-
-    G = np.empty((r,r**3))
-    fj = 0
-    for i in range(r):
-        for j in range(i+1):
-            for k in range(j+1):
-                idxs = set(itertools.permutations((i,j,k),3))
-                fill = Gc[:,fj] / len(idxs)
-                for a,b,c in idxs:
-                    G[:,(a*r**2)+(b*r)+c] = fill
-                fj += 1
-
-    # assert fj == s
-    return G
+    return _expand(Gc, 3, mode)
@@ -4,13 +4,21 @@
 __all__ = [
             "get_least_squares_size",
             "lstsq_reg",
+            "lstsq_iterative",
+            "SolverL2",
           ]
 
+import os
 import types
 import warnings
 import itertools
 import numpy as np
 import scipy.linalg as la
+import scipy.sparse.linalg as spla
+from concurrent.futures import ThreadPoolExecutor
+from threadpoolctl import threadpool_limits
+
+from ._kronecker import kronc_size
 
 
 def get_least_squares_size(modelform, r, m=0, affines=None):
@@ -67,10 +75,10 @@ def get_least_squares_size(modelform, r, m=0, affines=None):
     qG = len(affines['G']) if 'G' in affines else 1 if 'G' in modelform else 0
     qB = len(affines['B']) if 'B' in affines else 1 if 'B' in modelform else 0
 
-    return qc + qA*r + qH*r*(r+1)//2 + qG*r*(r+1)*(r+2)//6 + qB*m
+    return qc + qA*r + qH*kronc_size(r, 2) + qG*kronc_size(r, 3) + qB*m
 
 
-def lstsq_reg(A, b, P=0):
+def lstsq_reg(A, b, P=0, solver="lstsq", workers=None):
     """Solve the l2-norm Tikhonov-regularized ordinary least-squares problem
 
         min_{x} ||Ax - b||_2^2 + ||Px||_2^2
@@ -80,8 +88,11 @@ def lstsq_reg(A, b, P=0):
                 || [ A ]    _  [ b ] ||^2
         min_{x} || [ P ] x     [ 0 ] ||_2,
 
-    with scipy.linalg.lstsq() (equivalent to numpy.linalg.lstsq()).
-    See https://docs.scipy.org/doc/scipy/reference/linalg.html.
+    with scipy.linalg.lstsq() (equivalent to numpy.linalg.lstsq()), or by
+    solving the regularized normal equations (A^T A + P^T P)x = A^T b.
+    See https://docs.scipy.org/doc/scipy/reference/linalg.html. If P is
+    diagonal (given as a float or a (d,) ndarray), A is never stacked: the
+    regularization is applied to the (d,d) triangular factor of [A | b].
 
     Parameters
     ----------
@@ -92,14 +103,33 @@ def lstsq_reg(A, b, P=0):
         The "right-hand side" vector. If a two-dimensional array, then r
         independent least-squares problems are solved.
 
-    P : float >= 0 or (d,d) ndarray or list of r (floats or (d,d) ndarrays)
+    P : float >= 0 or (d,) or (d,d) ndarray or list of r of these
         Tikhonov regularization factor(s). The regularization matrix in the
         least-squares problem depends on the format of the argument:
         * float >= 0: `P`*I, a scaled identity matrix.
+        * (d,) ndarray: the diagonal matrix diag(`P`).
         * (d,d) ndarray: the matrix `P`.
-        * list of r floats or (d,d) ndarrays: the jth entry in the list is the
-            regularization factor for the jth column of `b`. Only valid if `b`
-            is two-dimensional and has r columns.
+        * list of r floats or (d,) or (d,d) ndarrays: the jth entry in the
+            list is the regularization factor for the jth column of `b`. Only
+            valid if `b` is two-dimensional and has r columns.
+
+    solver : str
+        The strategy for solving the least-squares problem. Options:
+        * "lstsq" (default): Use scipy.linalg.lstsq() on the stacked system.
+        * "normal": Form A^T A once, add P^T P, and solve the normal equations
+            with a Cholesky factorization. Much faster when k >> d, but the
+            normal equations square the condition number of the problem, so
+            this falls back to "lstsq" if the estimated condition number of
+            A^T A + P^T P exceeds 1/sqrt(machine epsilon).
+
+    workers : int or None
+        Number of threads for solving the decoupled problems concurrently
+        when `P` is a list of (d,d) ndarrays (or the solver is "normal"). The
+        threads share A, and the number of BLAS threads is limited so that
+        `workers` * (BLAS threads) does not exceed the number of CPU cores.
+        If -1, use one worker per core. If None (default) or 1, solve the
+        problems serially. A list of scalar regularizations is always solved
+        with a single (vectorized) factorization, so is not affected.
 
     Returns
     -------
@@ -122,51 +152,909 @@ def lstsq_reg(A, b, P=0):
     # Check dimensions of b.
     if b.ndim not in {1,2}:
         raise ValueError("`b` must be one- or two-dimensional")
+    if solver not in {"lstsq", "normal"}:
+        raise ValueError(f"invalid solver '{solver}'")
+    workers = _check_workers(workers)
     k,d = A.shape
 
+    # For the normal equations, compute A^T A once for all problems.
+    AtA = A.T @ A if solver == "normal" else None
+
     # If P is a sequence, decouple the problem by column.
     if isinstance(P, (list, tuple, range, types.GeneratorType)):
         # Check that the problem can be properly decoupled.
         if b.ndim != 2:
             raise ValueError("`b` must be two-dimensional with multiple P")
         r = b.shape[1]
-        if hasattr(P, "__len__") and len(P) != r:
-            raise ValueError("multiple P requires exactly r entries "
-                             "with r = number of columns of b")
 
-        # Solve each independent problem (iteratively for now).
-        argszip = zip(itertools.repeat(A), b.T, P)
-        result = [lstsq_reg(*args) for args in argszip]
-        if len(result) != r:
+        # Solve the independent problems, sharing one factorization of A.
+        P = list(P)
+        if len(P) != r:
             raise ValueError("multiple P requires exactly r entries "
                              "with r = number of columns of b")
+        if solver == "lstsq":
+            if all(np.isscalar(Pj) for Pj in P):
+                return _lstsq_reg_filters(A, b, np.array(P, dtype=float))
+            return _lstsq_reg_shared_qr(A, b, P, workers)
+
+        # Normal equations: solve each problem with the shared A^T A.
+        argszip = zip(itertools.repeat(A), b.T, P, itertools.repeat(AtA))
+        result = _map(_lstsq_reg_single, argszip, workers)
 
-        # Unpack and return the results.
+        # Unpack and return the results. If a problem fell back to lstsq()
+        # and it did not report the residual (because the stacked matrix is
+        # rank deficient), compute the residual directly.
         X = np.empty((d,r))
         residuals = np.empty(r)
         for j,(x, res, rnk, ss) in enumerate(result):
             X[:,j] = x
-            residuals[j] = 0 if isinstance(res ,np.ndarray) else res
+            if np.size(res) == 1:
+                residuals[j] = np.ravel(res)[0]
+            else:
+                Pj = P[j]
+                penalty = Pj*x if np.isscalar(Pj) else _apply_regularizer(Pj, x)
+                residuals[j] = np.sum((A @ x - b[:,j])**2) + np.sum(penalty**2)
         rank, s = result[0][-2:]
         # TODO: better treatment of rank, s
         return X, residuals, rank, s
 
-    # If P is a scalar, construct the default regularization matrix P*I.
+    return _lstsq_reg_single(A, b, P, AtA)
+
+
+def _lstsq_reg_single(A, b, P, AtA=None):
+    """Solve the least-squares problem of lstsq_reg() with a single
+    regularization factor P (float or (d,d) ndarray). If AtA = A^T A is
+    given, try to solve the regularized normal equations first.
+    """
+    k,d = A.shape
+
+    # If P is a scalar, use the diagonal of the regularization matrix P*I.
+    P0 = P
     if np.isscalar(P):
         # Default case: fall back to default scipy.linalg.lstsq().
-        if P == 0:
+        if P == 0 and AtA is None:
             if k < d:   # Warn the user if the system is underdetermined.
                 warnings.warn("least squares system is underdetermined",
-                               la.LinAlgWarning, stacklevel=2)
+                               la.LinAlgWarning, stacklevel=3)
             return la.lstsq(A, b)
         elif P < 0:
             raise ValueError("regularization parameter must be nonnegative")
-        P = np.diag(np.full(d, P))                # regularizer * identity
-    if P.shape != (d,d):
-        raise ValueError("P must be (d,d) with d = number of columns of A")
+        P = np.full(d, P, dtype=float)            # regularizer * identity
+    _check_regularizer(P, d)
+
+    if AtA is not None:
+        result = _lstsq_normal(A, b, P, AtA)
+        if result is not None:
+            return result
+        # The normal equations are too ill-conditioned; use lstsq().
+        return _lstsq_reg_single(A, b, P0)
+
+    if P.ndim == 1:
+        return _lstsq_reg_diagonal(A, b, P)
 
     pad = np.zeros(d) if b.ndim == 1 else np.zeros((d,b.shape[1]))
     lhs = np.vstack((A, P))
     rhs = np.concatenate((b, pad))
 
     return la.lstsq(lhs, rhs)
+
+
+def _check_regularizer(P, d):
+    """Check the shape of a regularization matrix P, (d,d), or of the
+    diagonal of a diagonal regularization matrix, (d,) and nonnegative.
+    """
+    if P.ndim == 1:
+        if P.shape != (d,):
+            raise ValueError("diagonal P must be (d,) with d = number of "
+                             "columns of A")
+        if np.any(P < 0):
+            raise ValueError("regularization parameter must be nonnegative")
+    elif P.shape != (d,d):
+        raise ValueError("P must be (d,d) with d = number of columns of A")
+
+
+def _apply_regularizer(P, x):
+    """Compute Px for a (d,d) matrix P or a diagonal matrix with diagonal P
+    (a (d,) ndarray), where x is (d,) or (d,r).
+    """
+    return P @ x if P.ndim == 2 else (P * x.T).T
+
+
+def _lstsq_reg_diagonal(A, b, p):
+    """Solve the least-squares problem of lstsq_reg() with the diagonal
+    regularization matrix diag(p), min_{x} ||Ax - b||^2 + ||diag(p)x||^2.
+
+    Rather than stacking [A; diag(p)], compute the triangular factor
+    [A | b] = Q[T, S; 0, Z] (in a single column-major copy of [A | b]) and
+    solve the small problem min_{x} ||Tx - S||^2 + ||diag(p)x||^2 with
+    _lstsq_triangular_diagonal(). The residual also includes ||Z||^2.
+
+    Returns
+    -------
+    Same as lstsq_reg(), where the rank and singular values are those of the
+    stacked matrix [A; diag(p)].
+    """
+    k,d = A.shape
+    B = b.reshape((k,-1))
+    AB = np.empty((k,d+B.shape[1]), order='F')
+    AB[:,:d], AB[:,d:] = A, B
+    Raug = la.qr(AB, mode="r", overwrite_a=True, check_finite=False)[0]
+    del AB
+    T, S = Raug[:d,:d], Raug[:d,d:]
+    outside = np.sum(Raug[d:,d:]**2, axis=0)
+
+    X, residuals, rank, s = _lstsq_triangular_diagonal(T, S, p)
+    residuals += outside
+    if b.ndim == 1:
+        return X[:,0], residuals[0], rank, s
+    return X, residuals, rank, s
+
+
+def _lstsq_triangular_diagonal(T, S, p):
+    """Solve min_{X} ||TX - S||^2 + ||diag(p)X||^2 for a (q,d) triangular
+    factor T (q <= d) without forming diag(p) or the stacked matrix
+    [T; diag(p)].
+
+    The Cholesky factor L of T^T T + diag(p)^2 is the triangular factor of
+    [T; diag(p)], so the problem is solved with the seminormal equations
+    L^T L X = T^T S and one step of iterative refinement (the corrected
+    seminormal equations), which recovers the accuracy of a QR-based solve
+    unless the problem is very ill-conditioned. If L does not (numerically)
+    exist, e.g., if T is rank deficient where p is zero, solve the stacked
+    problem with only the nonzero rows of diag(p) instead.
+
+    Returns
+    -------
+    X : (d,r) ndarray
+        The least-squares solutions.
+
+    residuals : (r,) ndarray
+        ||TX - S||^2 + ||diag(p)X||^2 for each column.
+
+    rank : int
+        Effective rank of [T; diag(p)].
+
+    s : (d,) ndarray
+        Singular values of [T; diag(p)] (those of L).
+    """
+    d = T.shape[1]
+    G = T.T @ T
+    G[np.diag_indices(d)] += p**2
+    Gnorm = la.norm(G, 1)
+    try:
+        L = la.cholesky(G, lower=False, overwrite_a=True, check_finite=False)
+        pocon, = la.get_lapack_funcs(("pocon",), (L,))
+        rcond, info = pocon(L, Gnorm)
+        if info != 0 or rcond < 10 * d * np.finfo(L.dtype).eps:
+            raise la.LinAlgError("ill-conditioned")
+    except la.LinAlgError:
+        nonzero = np.flatnonzero(p)
+        Prows = np.zeros((nonzero.size,d))
+        Prows[np.arange(nonzero.size),nonzero] = p[nonzero]
+        X, _, rank, s = la.lstsq(np.vstack((T, Prows)),
+                                 np.vstack((S, np.zeros((nonzero.size,
+                                                         S.shape[1])))),
+                                 overwrite_a=True, check_finite=False)
+    else:
+        X = la.cho_solve((L, False), T.T @ S, check_finite=False)
+        X += la.cho_solve((L, False), T.T @ (S - T @ X) - (p**2 * X.T).T,
+                          check_finite=False)
+        s = la.svdvals(L, overwrite_a=True, check_finite=False)
+        rank = np.count_nonzero(s > np.finfo(s.dtype).eps * 2*d * s[0])
+    residuals = np.sum((T @ X - S)**2, axis=0) \
+        + np.sum(_apply_regularizer(p, X)**2, axis=0)
+    return X, residuals, rank, s
+
+
+def _lstsq_reg_filters(A, B, λs):
+    """Solve the problems of lstsq_reg() with one scalar regularization
+    factor per column of B, min_{x_j} ||Ax_j - b_j||^2 + ||λ_j x_j||^2, with
+    a single SVD A = U diag(s) V^T and the filter factors s/(s^2 + λ_j^2).
+
+    Returns
+    -------
+    Same as lstsq_reg(), where the rank and singular values are those of the
+    stacked matrix [A; λ_0 I] for the first column.
+    """
+    k,d = A.shape
+    if np.any(λs < 0):
+        raise ValueError("regularization parameter must be nonnegative")
+    if k < d and np.any(λs == 0):
+        warnings.warn("least squares system is underdetermined",
+                       la.LinAlgWarning, stacklevel=3)
+
+    U, s, Vt = la.svd(A, full_matrices=False)
+    UtB = U.T @ B
+    outside = np.sum((B - U @ UtB)**2, axis=0)
+    mask = (s > np.finfo(s.dtype).eps * max(k,d) * s[0])[:,np.newaxis]
+
+    # Filter factors phi = s^2/(s^2 + λ^2) and psi = s/(s^2 + λ^2).
+    λ2 = λs**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = s[:,np.newaxis]**2 + λ2
+        phi = np.where(mask, s[:,np.newaxis]**2 / denom, 0)
+        psi = np.where(mask, s[:,np.newaxis] / denom, 0)
+    X = Vt.T @ (psi * UtB)
+    residuals = np.sum(((1 - phi)*UtB)**2, axis=0) + outside \
+                + λ2 * np.sum((psi*UtB)**2, axis=0)
+
+    # Singular values and rank of [A; λ_0 I].
+    s0 = np.sqrt(np.concatenate((s**2, np.zeros(d - s.size))) + λ2[0])
+    s0[::-1].sort()
+    rank = np.count_nonzero(s0 > np.finfo(s0.dtype).eps * (k+d) * s0[0])
+    return X, residuals, rank, s0
+
+
+def _lstsq_reg_shared_qr(A, B, Ps, workers=None):
+    """Solve the problems of lstsq_reg() with one regularization factor per
+    column of B, min_{x_j} ||Ax_j - b_j||^2 + ||P_j x_j||^2. The thin QR
+    decomposition A = QR is computed once, reducing each problem to the small
+    stacked problem min_{x_j} ||[R; P_j]x_j - [Q^T b_j; 0]||^2.
+
+    Returns
+    -------
+    Same as lstsq_reg(), where the rank and singular values are those of the
+    stacked matrix [A; P_0] for the first column.
+    """
+    k,d = A.shape
+    Q, R = la.qr(A, mode="economic")
+    QtB = Q.T @ B
+    outside = np.sum((B - Q @ QtB)**2, axis=0)
+    pad = np.zeros(d)
+    del Q
+
+    def _solve(c, Pj):
+        """Solve min_{x} ||Rx - c||^2 + ||P_j x||^2."""
+        if np.isscalar(Pj):
+            if Pj < 0:
+                raise ValueError("regularization parameter must be "
+                                 "nonnegative")
+            if Pj == 0 and k < d:
+                warnings.warn("least squares system is underdetermined",
+                               la.LinAlgWarning, stacklevel=4)
+            Pj = np.full(d, Pj, dtype=float)
+        _check_regularizer(Pj, d)
+        if Pj.ndim == 1:
+            x, res, rnk, ss = _lstsq_triangular_diagonal(R, c[:,np.newaxis],
+                                                         Pj)
+            return x[:,0], res[0], rnk, ss
+        x, _, rnk, ss = la.lstsq(np.vstack((R, Pj)), np.concatenate((c, pad)))
+        res = np.sum((R @ x - c)**2) + np.sum(_apply_regularizer(Pj, x)**2)
+        return x, res, rnk, ss
+
+    result = _map(_solve, zip(QtB.T, Ps), workers)
+    X = np.column_stack([x for x, _, _, _ in result])
+    residuals = np.array([res for _, res, _, _ in result]) + outside
+    return X, residuals, result[0][2], result[0][3]
+
+
+def _check_workers(workers):
+    """Validate the number of workers (-1 means one per CPU core)."""
+    if workers is None:
+        return 1
+    if workers == -1:
+        return os.cpu_count() or 1
+    if not isinstance(workers, (int, np.integer)) or workers < 1:
+        raise ValueError("workers must be a positive integer or -1")
+    return workers
+
+
+def _map(func, argszip, workers=1):
+    """Return [func(*args) for args in argszip], evaluated concurrently with
+    `workers` threads (which share the arguments) if workers > 1. While the
+    threads run, each BLAS call is limited to cpu_count // workers threads so
+    that the pool does not oversubscribe the CPU cores.
+    """
+    if workers == 1:
+        return [func(*args) for args in argszip]
+    blas_threads = max(1, (os.cpu_count() or 1) // workers)
+    with threadpool_limits(limits=blas_threads, user_api="blas"):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda args: func(*args), argszip))
+
+
+def _lstsq_normal(A, b, P, AtA):
+    """Solve min_{x} ||Ax - b||_2^2 + ||Px||_2^2 via a Cholesky factorization
+    of the normal equations (A^T A + P^T P)x = A^T b.
+
+    Returns
+    -------
+    Same as scipy.linalg.lstsq(), or None if A^T A + P^T P is not (safely)
+    positive definite.
+    """
+    d = AtA.shape[0]
+    if P.ndim == 1:
+        G = AtA.copy()
+        G[np.diag_indices(d)] += P**2
+    else:
+        G = AtA + P.T @ P
+    try:
+        L = la.cholesky(G, lower=False, check_finite=False)
+    except la.LinAlgError:
+        return None
+    pocon, = la.get_lapack_funcs(("pocon",), (L,))
+    rcond, info = pocon(L, la.norm(G, 1))
+    if info != 0 or rcond < np.sqrt(np.finfo(L.dtype).eps):
+        return None
+
+    x = la.cho_solve((L, False), A.T @ b, check_finite=False)
+    residual = np.sum((A @ x - b)**2, axis=0) \
+        + np.sum(_apply_regularizer(P, x)**2, axis=0)
+
+    # The singular values of [A; P] are the singular values of L.
+    return x, residual, d, la.svdvals(L, check_finite=False)
+
+
+def lstsq_iterative(A, b, P=0, solver="lsqr", x0=None, tol=1e-10,
+                    maxiter=None, workers=None):
+    """Solve the l2-norm ordinary least-squares problem with scalar Tikhonov
+    regularization,
+
+        min_{x} ||Ax - b||_2^2 + ||Px||_2^2,        P = λI, λ >= 0,
+
+    with a Krylov method (LSQR or LSMR) that only needs the products Av and
+    A^T w. Unlike lstsq_reg(), A does not have to be formed explicitly, and
+    the cost of each iteration is one product with A and one with A^T (the
+    solver never factors A). A good initial guess `x0`, e.g., the solution of
+    a nearby problem, can reduce the number of iterations dramatically.
+
+    Parameters
+    ----------
+    A : (k,d) ndarray or scipy.sparse.linalg.LinearOperator
+        The "left-hand side" matrix, or an object that applies it.
+
+    b : (k,) or (k,r) ndarray
+        The "right-hand side" vector. If a two-dimensional array, then r
+        independent least-squares problems are solved.
+
+    P : float >= 0 or list of r floats >= 0
+        Tikhonov regularization factor(s) (damping). If a list, the jth entry
+        is the regularization factor for the jth column of `b`.
+
+    solver : str
+        The Krylov method (see scipy.sparse.linalg). Options:
+        * "lsqr" (default): LSQR (conjugate gradients on the normal
+            equations, implemented stably via Golub-Kahan bidiagonalization).
+        * "lsmr": LSMR, which decreases ||A^T(b - Ax)|| monotonically and so
+            can usually be stopped sooner than LSQR.
+
+    x0 : (d,) or (d,r) ndarray or None
+        Initial guess for the solution(s). If None, start from zero.
+
+    tol : float > 0
+        Relative stopping tolerance (the `atol` and `btol` of the solver).
+
+    maxiter : int > 0 or None
+        Maximum number of iterations for each problem. If None (default),
+        use 2d. A warning is issued if a problem does not converge within
+        `maxiter` iterations.
+
+    workers : int or None
+        The r problems are advanced together, so each iteration applies A and
+        A^T once to a block of (not yet converged) columns instead of once
+        per problem. If `workers` > 1, the columns are split into `workers`
+        blocks that are solved concurrently in threads (see lstsq_reg()).
+        The threads share A, so applying A must be thread-safe.
+
+    Returns
+    -------
+    x : (d,) or (d,r) ndarray
+        The least-squares solution(s).
+
+    residual : float or (r,) ndarray
+        The squared residual ||Ax - b||_2^2 + ||Px||_2^2 of each problem.
+
+    iterations : int or (r,) ndarray of ints
+        The number of iterations used for each problem.
+    """
+    if b.ndim not in {1,2}:
+        raise ValueError("`b` must be one- or two-dimensional")
+    if solver not in {"lsqr", "lsmr"}:
+        raise ValueError(f"invalid solver '{solver}'")
+    workers = _check_workers(workers)
+    k,d = A.shape
+    if b.shape[0] != k:
+        raise ValueError("A and b not aligned, dimension 0")
+    if x0 is not None and x0.shape != (d,) + b.shape[1:]:
+        raise ValueError(f"x0.shape = {x0.shape} != {(d,) + b.shape[1:]}")
+
+    # Broadcast the problem to r columns.
+    B = b.reshape((k,-1))
+    r = B.shape[1]
+    if isinstance(P, (list, tuple, range, types.GeneratorType)):
+        P = list(P)
+        if b.ndim != 2 or len(P) != r:
+            raise ValueError("multiple P requires exactly r entries "
+                             "with r = number of columns of b")
+    elif np.isscalar(P):
+        P = [P] * r
+    else:
+        raise ValueError("iterative solvers require scalar P")
+    if any(Pj < 0 for Pj in P):
+        raise ValueError("regularization parameter must be nonnegative")
+    if maxiter is None:
+        maxiter = 2*d
+
+    # Solve the r damped problems, one block of columns per worker.
+    A = spla.aslinearoperator(A)
+    P = np.array(P, dtype=float)
+    krylov = _lsqr_block if solver == "lsqr" else _lsmr_block
+
+    def _solve(cols):
+        Pc = P[cols]
+        if x0 is None:
+            return krylov(lambda V, _: A.matmat(V), lambda W, _: A.rmatmat(W),
+                          B[:,cols], Pc, tol, tol, maxiter)
+        # Damping would apply to the correction x - x0 instead of x, so
+        # solve min ||[A; PI]dx - [b - Ax0; -Px0]|| for dx = x - x0.
+        X0c = x0.reshape((d,-1))[:,cols]
+        dX, istop, itn = krylov(
+            lambda V, j: np.vstack((A.matmat(V), V * Pc[j])),
+            lambda W, j: A.rmatmat(W[:k]) + W[k:] * Pc[j],
+            np.vstack((B[:,cols] - A.matmat(X0c), -X0c * Pc)),
+            np.zeros_like(Pc), tol, tol, maxiter)
+        return X0c + dX, istop, itn
+
+    blocks = [cols for cols in np.array_split(np.arange(r), min(workers, r))]
+    result = _map(_solve, zip(blocks), workers)
+    X = np.empty((d,r))
+    istops, iterations = np.empty(r, dtype=int), np.empty(r, dtype=int)
+    for cols, (Xc, istop, itn) in zip(blocks, result):
+        X[:,cols], istops[cols], iterations[cols] = Xc, istop, itn
+    if np.any(istops == 7):
+        warnings.warn(f"{solver} reached the iteration limit without "
+                      "converging", la.LinAlgWarning, stacklevel=2)
+
+    # Compute the residuals exactly (one more product with A).
+    residuals = np.sum((A.matmat(X) - B)**2, axis=0) \
+        + P**2 * np.sum(X**2, axis=0)
+
+    if b.ndim == 1:
+        return X[:,0], residuals[0], iterations[0]
+    return X, residuals, iterations
+
+
+def _sym_ortho(a, b):
+    """Vectorized stable Givens rotation: c, s, r with [c s; -s c][a; b] =
+    [r; 0] and r >= 0 (c = s = r = 0 where a = b = 0).
+    """
+    r = np.hypot(a, b)
+    c = np.divide(a, r, out=np.zeros_like(r), where=(r > 0))
+    s = np.divide(b, r, out=np.zeros_like(r), where=(r > 0))
+    return c, s, r
+
+
+def _stopping_code(itn, maxiter, test1, rtol, test2, atol, test3, t1, ctol):
+    """Stopping criteria of LSQR and LSMR (the `istop` codes of
+    scipy.sparse.linalg.lsqr()), evaluated for each column.
+    """
+    istop = np.zeros(test1.shape, dtype=int)
+    istop[itn >= maxiter] = 7
+    istop[1 + test3 <= 1] = 6
+    istop[1 + test2 <= 1] = 5
+    istop[1 + t1 <= 1] = 4
+    istop[test3 <= ctol] = 3
+    istop[test2 <= atol] = 2
+    istop[test1 <= rtol] = 1
+    return istop
+
+
+def _lsqr_block(matmat, rmatmat, B, damp, atol, btol, maxiter, conlim=1e8):
+    """Solve the problems min_{x_j} ||Ax_j - b_j||^2 + damp_j^2 ||x_j||^2 for
+    the columns of B with LSQR (the algorithm of scipy.sparse.linalg.lsqr()),
+    advancing all columns together so that each iteration applies A and A^T
+    once to a block of vectors. Converged columns are dropped from the block.
+
+    Parameters
+    ----------
+    matmat, rmatmat : callables
+        matmat(V, j) = A @ V and rmatmat(W, j) = A^T @ W, where the columns of
+        V and W belong to the problems with indices j (columns of B).
+
+    B : (k,r) ndarray
+        The right-hand sides.
+
+    damp : (r,) ndarray
+        The damping (regularization) factors.
+
+    atol, btol, maxiter, conlim
+        See scipy.sparse.linalg.lsqr().
+
+    Returns
+    -------
+    X : (d,r) ndarray
+        The solutions.
+
+    istop, itn : (r,) ndarrays
+        The reason for termination and the number of iterations per column.
+    """
+    r = B.shape[1]
+    eps = np.finfo(float).eps
+    ctol = 1 / conlim if conlim > 0 else 0
+
+    def _normalize(M, norms):
+        M[:,norms > 0] /= norms[norms > 0]
+        return M
+
+    ids = np.arange(r)
+    beta = la.norm(B, axis=0)
+    u = _normalize(B.astype(float, copy=True), beta)
+    v = rmatmat(u, ids)
+    alfa = la.norm(v, axis=0)
+    v = _normalize(v, alfa)
+    X = np.zeros((v.shape[0],r))
+    istops, itns = np.zeros(r, dtype=int), np.zeros(r, dtype=int)
+
+    # Columns with A^T b = 0 are solved by x = 0.
+    keep = (alfa * beta != 0)
+    ids, u, v, alfa, beta, damp = \
+        ids[keep], u[:,keep], v[:,keep], alfa[keep], beta[keep], damp[keep]
+    Xa, w = np.zeros_like(v), v.copy()
+    bnorm, rhobar, phibar = beta.copy(), alfa.copy(), beta.copy()
+    zeros = lambda: np.zeros(ids.size)
+    anorm, ddnorm, res2, xxnorm, z, sn2 = (zeros() for _ in range(6))
+    cs2 = -np.ones(ids.size)
+    dampsq = damp**2
+
+    itn = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        while ids.size > 0:
+            itn += 1
+            u = matmat(v, ids) - alfa * u
+            beta = la.norm(u, axis=0)
+            nz = beta > 0
+            u = _normalize(u, beta)
+            anorm = np.where(nz, np.sqrt(anorm**2 + alfa**2 + beta**2
+                                         + dampsq), anorm)
+            vnew = rmatmat(u, ids) - beta * v
+            alfanew = la.norm(vnew, axis=0)
+            v = np.where(nz, _normalize(vnew, alfanew), v)
+            alfa = np.where(nz, alfanew, alfa)
+
+            # Plane rotation to eliminate the damping parameter.
+            damped = damp > 0
+            rhobar1 = np.where(damped, np.sqrt(rhobar**2 + dampsq), rhobar)
+            cs1 = np.where(damped, rhobar / rhobar1, 1)
+            sn1 = np.where(damped, damp / rhobar1, 0)
+            psi = sn1 * phibar
+            phibar = cs1 * phibar
+
+            # Plane rotation to eliminate the subdiagonal of the bidiagonal.
+            cs, sn, rho = _sym_ortho(rhobar1, beta)
+            theta = sn * alfa
+            rhobar = -cs * alfa
+            phi = cs * phibar
+            phibar = sn * phibar
+            tau = sn * phi
+
+            # Update x and w.
+            ddnorm = ddnorm + np.sum(w**2, axis=0) / rho**2
+            Xa = Xa + (phi / rho) * w
+            w = v - (theta / rho) * w
+
+            # Estimate the norms for the stopping criteria.
+            delta = sn2 * rho
+            gambar = -cs2 * rho
+            rhs = phi - delta * z
+            xnorm = np.sqrt(xxnorm + (rhs / gambar)**2)
+            gamma = np.sqrt(gambar**2 + theta**2)
+            cs2, sn2, z = gambar / gamma, theta / gamma, rhs / gamma
+            xxnorm = xxnorm + z**2
+            acond = anorm * np.sqrt(ddnorm)
+            res2 = res2 + psi**2
+            rnorm = np.sqrt(phibar**2 + res2)
+            arnorm = alfa * np.abs(tau)
+
+            test1 = rnorm / bnorm
+            test2 = arnorm / (anorm * rnorm + eps)
+            test3 = 1 / (acond + eps)
+            istop = _stopping_code(itn, maxiter, test1,
+                                   btol + atol * anorm * xnorm / bnorm,
+                                   test2, atol, test3,
+                                   test1 / (1 + anorm * xnorm / bnorm), ctol)
+
+            # Record the converged columns and drop them from the block.
+            done = istop != 0
+            X[:,ids[done]], istops[ids[done]], itns[ids[done]] = \
+                Xa[:,done], istop[done], itn
+            keep = ~done
+            ids, u, v, w, Xa = ids[keep], u[:,keep], v[:,keep], w[:,keep], \
+                Xa[:,keep]
+            alfa, damp, dampsq, bnorm, rhobar, phibar, anorm, ddnorm, res2, \
+                xxnorm, z, cs2, sn2 = (a[keep] for a in (alfa, damp, dampsq,
+                    bnorm, rhobar, phibar, anorm, ddnorm, res2, xxnorm, z,
+                    cs2, sn2))
+
+    return X, istops, itns
+
+
+def _lsmr_block(matmat, rmatmat, B, damp, atol, btol, maxiter, conlim=1e8):
+    """Solve the problems min_{x_j} ||Ax_j - b_j||^2 + damp_j^2 ||x_j||^2 for
+    the columns of B with LSMR (the algorithm of scipy.sparse.linalg.lsmr()),
+    advancing all columns together. See _lsqr_block() for the arguments and
+    return values.
+    """
+    r = B.shape[1]
+    ctol = 1 / conlim if conlim > 0 else 0
+
+    def _normalize(M, norms):
+        M[:,norms > 0] /= norms[norms > 0]
+        return M
+
+    ids = np.arange(r)
+    beta = la.norm(B, axis=0)
+    u = _normalize(B.astype(float, copy=True), beta)
+    v = rmatmat(u, ids)
+    alpha = la.norm(v, axis=0)
+    v = _normalize(v, alpha)
+    X = np.zeros((v.shape[0],r))
+    istops, itns = np.zeros(r, dtype=int), np.zeros(r, dtype=int)
+
+    # Columns with A^T b = 0 are solved by x = 0.
+    keep = (alpha * beta != 0)
+    ids, u, v, alpha, beta, damp = \
+        ids[keep], u[:,keep], v[:,keep], alpha[keep], beta[keep], damp[keep]
+    n = ids.size
+    Xa, h, hbar = np.zeros_like(v), v.copy(), np.zeros_like(v)
+    normb, betadd = beta.copy(), beta.copy()
+    zetabar, alphabar = alpha * beta, alpha.copy()
+    rho, rhobar, cbar, rhodold = np.ones(n), np.ones(n), np.ones(n), np.ones(n)
+    sbar, betad, tautildeold, thetatilde, zeta, dsum, maxrbar = \
+        (np.zeros(n) for _ in range(7))
+    minrbar = np.full(n, 1e100)
+    normA2 = alpha**2
+
+    itn = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        while ids.size > 0:
+            itn += 1
+            u = matmat(v, ids) - alpha * u
+            beta = la.norm(u, axis=0)
+            nz = beta > 0
+            u = _normalize(u, beta)
+            vnew = rmatmat(u, ids) - beta * v
+            alphanew = la.norm(vnew, axis=0)
+            v = np.where(nz, _normalize(vnew, alphanew), v)
+            alpha = np.where(nz, alphanew, alpha)
+
+            # Rotations to eliminate the damping and the subdiagonal.
+            chat, shat, alphahat = _sym_ortho(alphabar, damp)
+            rhoold = rho
+            c, s, rho = _sym_ortho(alphahat, beta)
+            thetanew = s * alpha
+            alphabar = c * alpha
+            rhobarold, zetaold = rhobar, zeta
+            thetabar = sbar * rho
+            rhotemp = cbar * rho
+            cbar, sbar, rhobar = _sym_ortho(cbar * rho, thetanew)
+            zeta = cbar * zetabar
+            zetabar = -sbar * zetabar
+
+            # Update h, hbar, and x.
+            hbar = h - (thetabar * rho / (rhoold * rhobarold)) * hbar
+            Xa = Xa + (zeta / (rho * rhobar)) * hbar
+            h = v - (thetanew / rho) * h
+
+            # Estimate ||r||.
+            betaacute = chat * betadd
+            betacheck = -shat * betadd
+            betahat = c * betaacute
+            betadd = -s * betaacute
+            thetatildeold = thetatilde
+            ctildeold, stildeold, rhotildeold = _sym_ortho(rhodold, thetabar)
+            thetatilde = stildeold * rhobar
+            rhodold = ctildeold * rhobar
+            betad = -stildeold * betad + ctildeold * betahat
+            tautildeold = (zetaold - thetatildeold * tautildeold) / rhotildeold
+            taud = (zeta - thetatilde * tautildeold) / rhodold
+            dsum = dsum + betacheck**2
+            normr = np.sqrt(dsum + (betad - taud)**2 + betadd**2)
+
+            # Estimate ||A|| and cond(A).
+            normA = np.sqrt(normA2 + beta**2)
+            normA2 = normA2 + beta**2 + alpha**2
+            maxrbar = np.maximum(maxrbar, rhobarold)
+            if itn > 1:
+                minrbar = np.minimum(minrbar, rhobarold)
+            condA = np.maximum(maxrbar, rhotemp) / np.minimum(minrbar, rhotemp)
+
+            normx = la.norm(Xa, axis=0)
+            test1 = normr / normb
+            test2 = np.where(normA * normr != 0,
+                             np.abs(zetabar) / (normA * normr), np.inf)
+            test3 = 1 / condA
+            istop = _stopping_code(itn, maxiter, test1,
+                                   btol + atol * normA * normx / normb,
+                                   test2, atol, test3,
+                                   test1 / (1 + normA * normx / normb), ctol)
+
+            # Record the converged columns and drop them from the block.
+            done = istop != 0
+            X[:,ids[done]], istops[ids[done]], itns[ids[done]] = \
+                Xa[:,done], istop[done], itn
+            keep = ~done
+            ids, u, v, h, hbar, Xa = ids[keep], u[:,keep], v[:,keep], \
+                h[:,keep], hbar[:,keep], Xa[:,keep]
+            alpha, damp, normb, betadd, zetabar, alphabar, rho, rhobar, cbar, \
+                rhodold, sbar, betad, tautildeold, thetatilde, zeta, dsum, \
+                maxrbar, minrbar, normA2 = (a[keep] for a in (alpha, damp,
+                    normb, betadd, zetabar, alphabar, rho, rhobar, cbar,
+                    rhodold, sbar, betad, tautildeold, thetatilde, zeta, dsum,
+                    maxrbar, minrbar, normA2))
+
+    return X, istops, itns
+
+
+class SolverL2:
+    """Solve the l2-norm ordinary least-squares problem with scalar Tikhonov
+    regularization,
+
+        min_{X} ||AX - B||_F^2 + ||λX||_F^2,        λ >= 0,
+
+    for many values of λ with a single thin singular value decomposition
+    A = UΣV^T. With Σ = diag(s), the solution is X = V diag(s/(s^2 + λ^2)) U^T B,
+    so after the SVD the solution costs O(d^2 r) to form and the misfit and
+    residual cost O(dr) to evaluate for each λ (no dependence on k).
+    The regularization factor λ plays the same role as a scalar P in
+    lstsq_reg().
+
+    Examples
+    --------
+    >>> solver = SolverL2().fit(A, B)
+    >>> misfits = solver.misfit(np.logspace(-8, 2, 100))   # Cheap sweep.
+    >>> X = solver.predict(1e-3)
+    """
+    def fit(self, A, B):
+        """Compute the SVD of A and project B onto the left singular vectors.
+
+        Parameters
+        ----------
+        A : (k,d) ndarray
+            The "left-hand side" matrix.
+
+        B : (k,) or (k,r) ndarray
+            The "right-hand side" vector or matrix.
+
+        Returns
+        -------
+        self
+        """
+        if B.ndim not in {1,2}:
+            raise ValueError("`B` must be one- or two-dimensional")
+        if B.shape[0] != A.shape[0]:
+            raise ValueError("A and B not aligned, dimension 0")
+        U, s, Vt = la.svd(A, full_matrices=False)
+        self.k, self.d = A.shape
+        self._s, self._Vt = s, Vt
+        self._UtB = U.T @ B
+        # Squared norm of the part of B outside the range of A.
+        self._const = np.sum((B - U @ self._UtB)**2)
+        # Treat singular values below the lstsq() cutoff as zero.
+        self._mask = s > np.finfo(s.dtype).eps * max(A.shape) * s[0]
+        return self
+
+    def _filters(self, λ):
+        """Filter factors s^2/(s^2 + λ^2) and s/(s^2 + λ^2), shape (...,d)."""
+        λ = np.asarray(λ, dtype=float)
+        if np.any(λ < 0):
+            raise ValueError("regularization parameter must be nonnegative")
+        λ2 = λ[...,np.newaxis]**2
+        s, mask = self._s, self._mask
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = s**2 + λ2
+            phi = np.where(mask, s**2 / denom, 0)
+            psi = np.where(mask, s / denom, 0)
+        return phi, psi
+
+    def _weighted_sum(self, weights):
+        """Sum over singular values (and columns of B) of weights*(U^T B)^2."""
+        UtB2 = self._UtB**2 if self._UtB.ndim == 1 else \
+               np.sum(self._UtB**2, axis=1)
+        return weights @ UtB2
+
+    def predict(self, λ):
+        """Solve the regularized least-squares problem.
+
+        Parameters
+        ----------
+        λ : float >= 0
+            Regularization factor.
+
+        Returns
+        -------
+        X : (d,) or (d,r) ndarray
+            The least-squares solution.
+        """
+        _, psi = self._filters(λ)
+        if psi.ndim != 1:
+            raise ValueError("predict() requires a scalar regularization")
+        if self._UtB.ndim == 1:
+            return self._Vt.T @ (psi * self._UtB)
+        return self._Vt.T @ (psi[:,np.newaxis] * self._UtB)
+
+    def misfit(self, λ):
+        """Squared Frobenius data misfit ||AX - B||_F^2 of the solution X
+        of the problem regularized with λ (float or array of floats).
+        """
+        phi, _ = self._filters(λ)
+        return self._weighted_sum((1 - phi)**2) + self._const
+
+    def residual(self, λ):
+        """Squared Frobenius residual ||AX - B||_F^2 + ||λX||_F^2 of the
+        solution X of the problem regularized with λ (float or array of floats).
+        """
+        _, psi = self._filters(λ)
+        λ2 = np.asarray(λ, dtype=float)**2
+        return self.misfit(λ) + λ2 * self._weighted_sum(psi**2)
+
+    def norm(self, λ):
+        """Frobenius norm ||X||_F of the solution X of the problem regularized
+        with λ (float or array of floats).
+        """
+        _, psi = self._filters(λ)
+        return np.sqrt(self._weighted_sum(psi**2))
+
+    def cond(self):
+        """Condition number of A."""
+        return self._s[0] / self._s[-1] if self._s[-1] > 0 else np.inf
+
+    def regcond(self, λ):
+        """Condition number of the regularized matrix [A; λI]."""
+        λ2 = np.asarray(λ, dtype=float)**2
+        smin2 = self._s[-1]**2 if self.k >= self.d else 0
+        with np.errstate(divide="ignore"):
+            return np.sqrt((self._s[0]**2 + λ2) / (smin2 + λ2))
+
+
+def _qr_append(R, A):
+    """Return the upper triangular factor of the QR decomposition of [R; A],
+    i.e., update the triangular factor R of a matrix M so that it becomes the
+    triangular factor of [M; A].
+
+    Parameters
+    ----------
+    R : (l,d) ndarray or None
+        Upper triangular factor to update. If None, factor A alone.
+
+    A : (k,d) ndarray
+        Block of rows to append.
+
+    Returns
+    -------
+    R : (min(l+k,d),d) ndarray
+        Upper triangular factor of [R; A].
+    """
+    stacked = R is not None
+    if stacked:
+        A = np.vstack((R, A))
+    R = la.qr(A, mode="r", overwrite_a=stacked, check_finite=False)[0]
+    return R[:min(R.shape)]
+
+
+def _tsqr_reduce(Rs, pool=None):
+    """Combine the triangular factors of several blocks of rows into the
+    triangular factor of the stacked blocks with a binary reduction tree
+    (tall-skinny QR).
+
+    Parameters
+    ----------
+    Rs : list of (l_i,d) ndarrays
+        Upper triangular factors of the blocks, in order.
+
+    pool : multiprocessing.pool.Pool or None
+        If given, merge the pairs at each level of the tree concurrently.
+
+    Returns
+    -------
+    R : (min(sum(l_i),d),d) ndarray
+        Upper triangular factor of the stacked blocks.
+    """
+    Rs = list(Rs)
+    while len(Rs) > 1:
+        pairs = list(zip(Rs[0::2], Rs[1::2]))
+        leftover = Rs[-1:] if len(Rs) % 2 else []
+        if pool is None:
+            Rs = [_qr_append(*pair) for pair in pairs] + leftover
+        else:
+            Rs = pool.starmap(_qr_append, pairs) + leftover
+    return Rs[0]
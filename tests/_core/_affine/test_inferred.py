@@ -81,11 +81,24 @@ class TestAffineInferredMixin:
             assert model.c_.shape == (r,)
             assert model.B_.shape == (r,m)
             assert hasattr(model, "residual_")
+            assert model.misfit_ <= model.residual_
+            assert model.dataregcond_ <= model.datacond_
+            assert not hasattr(model, "_D_")
 
         model.modelform = "cAHB"
         model.fit(*args, Us=Us)
         _test_output_shapes(model)
 
+        # One regularization factor per row of the operators, as a list or a
+        # tuple.
+        Ps = [1e-2*j for j in range(1, r+1)]
+        model.fit(*args, Us=Us, P=Ps)
+        A_list, misfit_list = model.A_, model.misfit_
+        model.fit(*args, Us=Us, P=tuple(Ps))
+        assert np.allclose(model.A_, A_list)
+        assert np.isclose(model.misfit_, misfit_list)
+        assert model.misfit_ <= model.residual_
+
         # Fit the model with 1D inputs (1D array for B)
         model.modelform = "cAHB"
         model.fit(*args, Us=np.ones((s,k)))
@@ -151,6 +151,36 @@ class TestBaseROM:
         assert np.allclose(model.Gc_, Gc)
         assert np.allclose(model.B_, B)
 
+    def test_set_operator_attributes(self, r=5, m=2):
+        """Test that setting an operator attribute of _core._base._BaseROM
+        directly rebuilds f_ (and the cached Jacobian and propagators).
+        """
+        Vr = np.random.random((20,r))
+        x, u = np.random.random(r), np.random.random(m)
+        A = np.random.random((r,r))
+
+        model = _trainedmodel(False, "cAB", Vr, m)
+        model.A_ = A
+        assert np.allclose(model.f_(x, u), model.c_ + A @ x + model.B_ @ u)
+        del model.c_
+        with pytest.raises(AttributeError) as ex:
+            model.f_
+        assert ex.value.args[0] == \
+            "attribute 'c_' missing; call fit() to train model"
+
+        model = _trainedmodel(True, "AH", Vr, None)
+        model.A_ = -np.eye(r)
+        model.Hc_ = np.zeros_like(model.Hc_)
+        assert np.allclose(model.f_(0, x), -x)
+        assert np.allclose(model._jac(0, x), -np.eye(r))
+        t = np.linspace(0, 1, 11)
+        model.modelform = "A"
+        model.Hc_ = None
+        model.predict(x, t, method="expm")
+        model.A_ = -2*np.eye(r)
+        X_ = model.predict(x, t, method="expm")
+        assert np.allclose(X_[:,-1], np.exp(-2)*(Vr @ x))
+
     def test_check_inputargs(self):
         """Test _BaseROM._check_inputargs()."""
 
@@ -224,6 +254,57 @@ class TestDiscreteROM:
         assert ex.value.args[0] == \
             "<lambda>() missing 1 required positional argument: 'u'"
 
+    def test_construct_f_scratch(self, r=6):
+        """Test that _core._base.DiscreteROM._construct_f_() reuses scratch
+        space for the Kronecker products without aliasing the outputs.
+        """
+        Vr = np.random.random((20,r))
+        model = _trainedmodel(False, "HG", Vr, None)
+        model.Hc_ = np.random.random(model.Hc_.shape)
+        model.Gc_ = np.random.random(model.Gc_.shape)
+        model._construct_f_()
+        x1, x2 = np.random.random((2,r))
+        y1, y2 = model.f_(x1), model.f_(x2)
+        assert y1 is not y2
+        assert np.allclose(y1, model.Hc_ @ roi.utils.kron2c(x1)
+                               + model.Gc_ @ roi.utils.kron3c(x1))
+        assert np.allclose(y2, model.Hc_ @ roi.utils.kron2c(x2)
+                               + model.Gc_ @ roi.utils.kron3c(x2))
+
+        # Two-dimensional inputs are evaluated column-wise.
+        X = np.column_stack([x1, x2])
+        assert np.allclose(model.f_(X), np.column_stack([y1, y2]))
+
+    def test_construct_f_fused(self, r=5, m=3, k=4):
+        """Test that _core._base.DiscreteROM._construct_f_() agrees with the
+        sum of the individual operator actions for each model form.
+        """
+        Vr = np.random.random((20,r))
+        x, X = np.random.random(r), np.random.random((r,k))
+        u, U = np.random.random(m), np.random.random((m,k))
+        for form in _MODEL_FORMS:
+            model = _trainedmodel(False, form, Vr, m if "B" in form else None)
+
+            def f(x_, u_):
+                out = np.zeros((r,) + x_.shape[1:])
+                if "c" in form:
+                    out = (out.T + model.c_).T
+                if "A" in form:
+                    out += model.A_ @ x_
+                if "H" in form:
+                    out += model.Hc_ @ roi.utils.kron2c(x_)
+                if "G" in form:
+                    out += model.Gc_ @ roi.utils.kron3c(x_)
+                if "B" in form:
+                    out += model.B_ @ u_
+                return out
+
+            args = ((x, u), (X, U)) if "B" in form else ((x,), (X,))
+            y1, y2 = model.f_(*args[0]), model.f_(*args[0])
+            assert y1 is not y2
+            assert np.allclose(y1, f(x, u))
+            assert np.allclose(model.f_(*args[1]), f(X, U))
+
     def test_fit(self):
         """Test _core._base._DiscreteROM.fit()."""
         model = roi._core._base._DiscreteROM("A")
@@ -312,6 +393,82 @@ class TestDiscreteROM:
         assert out.shape == (r,niters)
 
 
+    def test_predict_ensemble(self, r=5, m=2, N=4, niters=10):
+        """Test _core._base._DiscreteROM.predict_ensemble()."""
+        Vr = la.qr(np.random.random((30,r)), mode="economic")[0]
+        X0 = np.random.random((30,N)) / 10
+
+        # Try to predict with a one-dimensional initial condition.
+        model = _trainedmodel(False, "cAH", Vr, None)
+        with pytest.raises(ValueError) as ex:
+            model.predict_ensemble(X0[:,0], niters)
+        assert ex.value.args[0] == \
+            "initial conditions X0 must be two-dimensional"
+
+        # Each member agrees with predict().
+        for form in _MODEL_FORMS:
+            if "B" in form:
+                continue
+            model = _trainedmodel(False, form, Vr, None)
+            out = model.predict_ensemble(X0, niters)
+            assert out.shape == (30,niters,N)
+            for i in range(N):
+                assert np.allclose(out[...,i], model.predict(X0[:,i], niters))
+
+        # Shared and per-member inputs.
+        model = _trainedmodel(False, "cAHB", Vr, m)
+        U, Us = np.random.random((m,niters-1)), np.random.random((m,niters-1,N))
+        out1 = model.predict_ensemble(Vr.T @ X0, niters, U)
+        out2 = model.predict_ensemble(X0, niters, Us)
+        assert out1.shape == (30,niters,N)
+        for i in range(N):
+            assert np.allclose(out1[...,i], model.predict(X0[:,i], niters, U))
+            assert np.allclose(out2[...,i],
+                               model.predict(X0[:,i], niters, Us[...,i]))
+
+        with pytest.raises(ValueError) as ex:
+            model.predict_ensemble(X0, niters, Us[...,1:])
+        assert ex.value.args[0] == \
+            f"invalid input shape ({(m,niters-1,N-1)} != {(m,niters-1)}" \
+            f" or {(m,niters-1,N)})"
+
+    def test_predict_linear(self, r=6, m=2, N=3):
+        """Test _core._base._DiscreteROM.predict() and predict_ensemble() for
+        linear models, which use a blocked scan instead of stepping f_.
+        """
+        A = np.random.standard_normal((r,r))
+        A *= .95 / np.max(np.abs(la.eigvals(A)))
+        c, B = np.random.standard_normal(r), np.random.standard_normal((r,m))
+        operators = dict(c_=c, A_=A, B_=B)
+
+        def step(model, x0, niters, U=None):
+            """Step forward with f_ one iteration at a time."""
+            X = np.empty(x0.shape[:1] + (niters,) + x0.shape[1:])
+            X[:,0] = x0
+            for j in range(niters-1):
+                X[:,j+1] = model.f_(X[:,j], U[:,j]) if U is not None \
+                                                    else model.f_(X[:,j])
+            return X
+
+        for form in ("A", "cA", "AB", "cAB"):
+            model = roi.InferredDiscreteROM(form)
+            model._set_operators(None, **{key: val for key, val in
+                                          operators.items() if key[0] in form})
+            for niters in (1, 2, 5, 16, 17, 200):
+                x0 = np.random.standard_normal(r)
+                U = np.random.standard_normal((m,niters+1)) \
+                                                    if "B" in form else None
+                out = model.predict(x0, niters, U)
+                assert out.shape == (r,niters)
+                assert np.allclose(out, step(model, x0, niters, U))
+
+            X0 = np.random.standard_normal((r,N))
+            U = np.random.standard_normal((m,49,N)) if "B" in form else None
+            out = model.predict_ensemble(X0, 50, U)
+            assert out.shape == (r,50,N)
+            assert np.allclose(out, step(model, X0, 50, U))
+
+
 class TestContinuousROM:
     """Test _core._base._ContinuousROM."""
     def test_construct_f_(self):
@@ -328,6 +485,143 @@ class TestContinuousROM:
         assert ex.value.args[0] == \
             "<lambda>() missing 1 required positional argument: 'x_'"
 
+    def test_jacobian(self, r=6, m=3):
+        """Test the Jacobian built by _core._base.ContinuousROM._construct_f_().
+        """
+        Vr = la.qr(np.random.random((20,r)), mode="economic")[0]
+        x_, h = np.random.random(r), 1e-6
+        u = lambda t: np.ones(m)
+        for form in _MODEL_FORMS:
+            model = _trainedmodel(True, form, Vr, m if "B" in form else None)
+            f_ = (lambda x: model.f_(0, x, u)) if "B" in form else \
+                 (lambda x: model.f_(0, x))
+            jac = model._jac(0, x_) if callable(model._jac) else model._jac
+            assert jac.shape == (r,r)
+
+            # Compare to a centered finite difference approximation.
+            jac_fd = np.column_stack([(f_(x_ + h*e) - f_(x_ - h*e)) / (2*h)
+                                      for e in np.eye(r)])
+            assert np.allclose(jac, jac_fd, atol=1e-6)
+
+        # Implicit solvers use the Jacobian (and agree with explicit ones).
+        model = _trainedmodel(True, "cAHG", Vr, None)
+        t = np.linspace(0, .01, 5)
+        out1 = model.predict(Vr @ x_, t, method="RK45", rtol=1e-10)
+        for method in ("BDF", "Radau", "LSODA"):
+            out2 = model.predict(Vr @ x_, t, method=method, rtol=1e-10)
+            assert np.allclose(out1, out2, atol=1e-6)
+            if method != "LSODA":
+                assert model.sol_.njev > 0
+
+    def test_predict_builtin(self, r=6, m=2):
+        """Test _core._base._ContinuousROM.predict() with the built-in
+        integrators.
+        """
+        Vr = la.qr(np.random.random((30,r)), mode="economic")[0]
+        x0 = np.random.random(30) / 10
+        t = np.linspace(0, .1, 11)
+        u = lambda s: np.ones(m) * s
+        for form, inputs in [("cAHG", None), ("AHB", u)]:
+            model = _trainedmodel(True, form, Vr, m if inputs else None)
+            out1 = model.predict(x0, t, inputs, rtol=1e-10, atol=1e-12)
+            for method in ("ssprk3", "rk4", "dopri5"):
+                out2 = model.predict(x0, t, inputs, method=method,
+                                     max_step=1e-3, rtol=1e-10, atol=1e-12)
+                assert model.sol_.success
+                assert out2.shape == (30,t.size)
+                assert np.allclose(out1, out2)
+            for method in ("imex_euler", "cnab2", "ars222"):
+                out2 = model.predict(x0, t, inputs, method=method,
+                                     max_step=1e-4)
+                assert model.sol_.nlu == 1
+                assert np.allclose(out1, out2, atol=1e-4)
+
+        # IMEX methods also work without a linear term.
+        model = _trainedmodel(True, "cH", Vr, None)
+        out1 = model.predict(x0, t, rtol=1e-10, atol=1e-12)
+        out2 = model.predict(x0, t, method="ars222", max_step=1e-3)
+        assert np.allclose(out1, out2, atol=1e-6)
+
+        # Ensembles.
+        model = _trainedmodel(True, "cAH", Vr, None)
+        X0 = np.column_stack([x0, 2*x0])
+        out1 = model.predict_ensemble(X0, t, method="cnab2", max_step=1e-3)
+        out2 = model.predict(2*x0, t, method="cnab2", max_step=1e-3)
+        assert np.allclose(out1[...,1], out2)
+
+    def test_predict_expm(self, r=5, m=2, N=3):
+        """Test _core._base._ContinuousROM.predict() with exact integration
+        of linear models (method='expm').
+        """
+        A = np.random.standard_normal((r,r))
+        A = A - A.T - np.eye(r)
+        c, B = np.random.standard_normal(r), np.random.standard_normal((r,m))
+        x0 = np.random.standard_normal(r)
+        t = np.linspace(0, 1, 21)
+        model = roi.InferredContinuousROM("cAB")._set_operators(None, c_=c,
+                                                                 A_=A, B_=B)
+
+        # Try with bad arguments.
+        with pytest.raises(ValueError) as ex:
+            model.predict(x0, t, np.ones((m,t.size)), method="expm",
+                          hold="spline")
+        assert ex.value.args[0] == "invalid hold 'spline'; options are zoh, foh"
+        qmodel = roi.InferredContinuousROM("AH")._set_operators(None, A_=A,
+                                                    Hc_=np.zeros((r,r*(r+1)//2)))
+        with pytest.raises(ValueError) as ex:
+            qmodel.predict(x0, t, method="expm")
+        assert ex.value.args[0] == \
+            "method 'expm' requires a linear model (no 'H' or 'G' terms)"
+
+        # Without inputs, x(t) = exp(A t) (x0 + A^{-1} c) - A^{-1} c.
+        model2 = roi.InferredContinuousROM("cA")._set_operators(None, c_=c,
+                                                                 A_=A)
+        out = model2.predict(x0, t, method="expm")
+        assert model2.sol_.success
+        Ainvc = la.solve(A, c)
+        exact = np.column_stack([la.expm(A*s) @ (x0 + Ainvc) - Ainvc
+                                 for s in t])
+        assert np.allclose(out, exact)
+
+        # First-order hold is exact for linear-in-time inputs, also on
+        # nonuniform grids and for arrays of inputs.
+        u = lambda s: np.array([1 - s, 2*s])[:m]
+        tn = np.sort(np.concatenate(([0, 1], np.random.random(15))))
+        for tt in (t, tn):
+            exact = model.predict(x0, tt, u, rtol=1e-12, atol=1e-12)
+            for inputs in (u, np.column_stack([u(s) for s in tt])):
+                out = model.predict(x0, tt, inputs, method="expm")
+                assert out.shape == (r,tt.size)
+                assert np.allclose(out, exact, atol=1e-8)
+        # Zero-order hold is first-order accurate in the step size.
+        exact = model.predict(x0, t, u, rtol=1e-12, atol=1e-12)
+        errors = [np.max(np.abs(model.predict(x0, tt, u, method="expm",
+                                              hold="zoh")[:,-1] - exact[:,-1]))
+                  for tt in (t, np.linspace(0, 1, 2*t.size - 1))]
+        assert np.log2(errors[0] / errors[1]) > .5
+
+        # The propagators are cached across calls with the same step size.
+        model._propagators.clear()
+        model.predict(x0, t, u, method="expm")
+        model.predict(x0, t[:11], u, method="expm")
+        assert len(model._propagators) == 1
+        model.predict(x0, t, u, method="expm", hold="zoh")
+        assert len(model._propagators) == 2
+        model._set_operators(None, c_=c, A_=2*A, B_=B)
+        assert len(model._propagators) == 0
+
+        # Ensembles, with shared or per-member inputs.
+        X0 = np.random.standard_normal((r,N))
+        U = np.random.standard_normal((m,t.size,N))
+        out1 = model.predict_ensemble(X0, t, u, method="expm")
+        out2 = model.predict_ensemble(X0, t, U, method="expm")
+        assert out1.shape == out2.shape == (r,t.size,N)
+        for i in range(N):
+            assert np.allclose(out1[...,i], model.predict(X0[:,i], t, u,
+                                                          method="expm"))
+            assert np.allclose(out2[...,i], model.predict(X0[:,i], t, U[...,i],
+                                                          method="expm"))
+
     def test_fit(self):
         """Test _core._base._ContinuousROM.fit()."""
         model = roi._core._base._ContinuousROM("A")
@@ -452,6 +746,65 @@ class TestContinuousROM:
                 assert out.shape == (n,nt)
 
 
+    def test_predict_ensemble(self, r=5, m=2, N=3):
+        """Test _core._base._ContinuousROM.predict_ensemble()."""
+        Vr = la.qr(np.random.random((30,r)), mode="economic")[0]
+        X0 = np.random.random((30,N)) / 10
+        t = np.linspace(0, .01, 6)
+        options = dict(rtol=1e-10, atol=1e-12)
+
+        model = _trainedmodel(True, "cAHG", Vr, None)
+        with pytest.raises(ValueError) as ex:
+            model.predict_ensemble(X0[:,0], t)
+        assert ex.value.args[0] == \
+            "initial conditions X0 must be two-dimensional"
+
+        # Each member agrees with predict(), with explicit or implicit solvers.
+        for method in ("RK45", "BDF"):
+            out = model.predict_ensemble(X0, t, method=method, **options)
+            assert out.shape == (30,t.size,N)
+            for i in range(N):
+                assert np.allclose(out[...,i],
+                                   model.predict(X0[:,i], t, **options))
+
+        # Built-in integrators advance the block of states directly.
+        for method in ("rk4", "dopri5"):
+            out = model.predict_ensemble(X0, t, method=method, **options)
+            assert out.shape == (30,t.size,N)
+            for i in range(N):
+                assert np.allclose(out[...,i],
+                                   model.predict(X0[:,i], t, **options))
+
+        # Shared and per-member inputs, as functions or arrays.
+        model = _trainedmodel(True, "AHB", Vr, m)
+        Us = np.random.random((m,t.size,N))
+        u = lambda s: np.ones(m)
+        us = lambda s: np.outer(np.arange(1, m+1), np.arange(N)) * s
+        out1 = model.predict_ensemble(Vr.T @ X0, t, u, **options)
+        out2 = model.predict_ensemble(X0, t, us, **options)
+        out3 = model.predict_ensemble(X0, t, Us, **options)
+        assert out1.shape == (30,t.size,N)
+        for i in range(N):
+            assert np.allclose(out1[...,i],
+                               model.predict(X0[:,i], t, u, **options))
+            assert np.allclose(out2[...,i],
+                               model.predict(X0[:,i], t,
+                                             lambda s: us(s)[:,i], **options))
+            assert np.allclose(out3[...,i],
+                               model.predict(X0[:,i], t, Us[...,i], **options))
+
+        with pytest.raises(ValueError) as ex:
+            model.predict_ensemble(X0, t, lambda s: np.ones(m+1))
+        assert ex.value.args[0] == \
+            f"input function u() must return ndarray of shape (m,)={(m,)}" \
+            f" or (m,N)={(m,N)}"
+        with pytest.raises(ValueError) as ex:
+            model.predict_ensemble(X0, t, Us[:,1:])
+        assert ex.value.args[0] == \
+            f"invalid input shape ({(m,t.size-1,N)} != {(m,t.size)}" \
+            f" or {(m,t.size,N)})"
+
+
 class TestNonparametricMixin:
     """Test _core._base._NonparametricMixin."""
     def test_str(self):
@@ -1,6 +1,8 @@
 # _core/test_inferred.py
 """Tests for rom_operator_inference._core._inferred.py."""
 
+import multiprocessing
+
 import pytest
 import numpy as np
 from scipy import linalg as la
@@ -33,6 +35,273 @@ class TestInferredMixin:
         model._check_training_data_shapes([X, Xdot])
         model._check_training_data_shapes([X, Xdot, U])
 
+    def test_construct_data_matrix(self):
+        """Test _core._inferred._InferredMixin._construct_data_matrix()."""
+        k, m, r = 50, 3, 6
+        X_ = np.random.random((r,k))
+        U = np.random.random((m,k))
+        model = roi.InferredContinuousROM("cAHGB")
+        model.r, model.m = r, m
+
+        D = model._construct_data_matrix(X_, U)
+        assert D.flags.f_contiguous
+        assert np.allclose(D, np.hstack([np.ones((k,1)), X_.T,
+                                         roi.utils.kron2c(X_).T,
+                                         roi.utils.kron3c(X_).T, U.T]))
+
+        # Write into a given array.
+        out = np.empty_like(D, order='F')
+        assert model._construct_data_matrix(X_, U, out=out) is out
+        assert np.allclose(out, D)
+        with pytest.raises(ValueError) as ex:
+            model._construct_data_matrix(X_, U, out=out[:,:-1])
+        assert ex.value.args[0] == \
+            f"out.shape = {(k,D.shape[1]-1)} != {D.shape}"
+
+        # Try without inputs.
+        model.modelform, model.m = "AH", None
+        D = model._construct_data_matrix(X_, None)
+        assert np.allclose(D, np.hstack([X_.T, roi.utils.kron2c(X_).T]))
+
+    def test_fit_single_precision(self):
+        """Test _core._inferred._InferredMixin.fit() with float32 data."""
+        n, k, r = 60, 300, 5
+        X, Xdot, _ = _get_data(n, k, 2)
+        Vr = la.svd(X)[0][:,:r]
+        X32, Xdot32, Vr32 = [A.astype(np.float32) for A in (X, Xdot, Vr)]
+
+        # Data is assembled in float32 but solved in float64.
+        model1 = roi.InferredContinuousROM("cAH").fit(Vr32, X32, Xdot32)
+        model2 = roi.InferredContinuousROM("cAH").fit(Vr32.astype(float),
+                                                      X32.astype(float),
+                                                      Xdot32.astype(float))
+        for attr in ["c_", "A_", "Hc_"]:
+            assert getattr(model1, attr).dtype == np.float64
+            assert np.allclose(getattr(model1, attr), getattr(model2, attr),
+                               rtol=1e-4, atol=1e-6)
+        assert np.isclose(model1.misfit_, model2.misfit_, rtol=1e-4)
+
+        # Reconstructions are in the precision of the basis.
+        t = np.linspace(0, .01, 10)
+        assert model1.predict(X32[:,0], t).dtype == np.float32
+        assert model2.predict(X[:,0], t).dtype == np.float64
+
+        model = roi.InferredDiscreteROM("cA").fit(Vr32, X32)
+        assert model.A_.dtype == np.float64
+        assert model.predict(X32[:,0], 10).dtype == np.float32
+
+    def test_refit(self):
+        """Test _core._inferred._InferredMixin.fit(solver="svd") and refit()."""
+        n, k, m, r = 60, 200, 3, 5
+        X, Xdot, _ = _get_data(n, k, m)
+        U = np.random.random((m,k))
+        Vr = la.svd(X)[0][:,:r]
+
+        model = roi.InferredContinuousROM("cAHB")
+        with pytest.raises(AttributeError) as ex:
+            model.refit(1)
+        assert ex.value.args[0] == "refit() requires fit(..., solver='svd')"
+        with pytest.raises(ValueError) as ex:
+            model.fit(Vr, X, Xdot, U, P=[1]*r, solver="svd")
+        assert ex.value.args[0] == "solver 'svd' requires scalar P"
+
+        model.fit(Vr, X, Xdot, U, P=1e-2, solver="svd")
+        assert isinstance(model.solver_, roi.utils.SolverL2)
+        with pytest.raises(ValueError) as ex:
+            model.refit(np.eye(3))
+        assert ex.value.args[0] == "solver 'svd' requires scalar P"
+
+        for P in [0, 1e-3, 1]:
+            model1 = roi.InferredContinuousROM("cAHB").fit(Vr, X, Xdot, U, P)
+            for chunksize in [None, 40]:
+                model2 = roi.InferredContinuousROM("cAHB").fit(Vr, X, Xdot, U,
+                                        P, chunksize=chunksize, solver="svd")
+                assert model.refit(P) is model
+                for mdl in model, model2:
+                    for attr in ["c_", "A_", "Hc_", "B_"]:
+                        assert np.allclose(getattr(model1, attr),
+                                           getattr(mdl, attr))
+                    for attr in ["datacond_", "dataregcond_",
+                                 "misfit_", "residual_"]:
+                        assert np.isclose(getattr(model1, attr),
+                                          getattr(mdl, attr))
+
+        # Other solvers reset the stored SVD.
+        model.fit(Vr, X, Xdot, U)
+        assert model.solver_ is None
+
+    def test_select_regularization(self):
+        """Test _core._inferred._InferredMixin.select_regularization()."""
+        k, r = 100, 3
+        X_ = np.random.standard_normal((r,k))
+        Xdot_ = -X_ + 1e-2*np.random.standard_normal((r,k))
+        candidates = np.logspace(-4, 2, 13)
+
+        model = roi.InferredContinuousROM("cA")
+        with pytest.raises(AttributeError) as ex:
+            model.select_regularization(candidates)
+        assert ex.value.args[0] == \
+            "select_regularization() requires fit(..., solver='svd')"
+        model.fit(None, X_, Xdot_)
+        with pytest.raises(AttributeError) as ex:
+            model.select_regularization(candidates)
+        assert ex.value.args[0] == \
+            "select_regularization() requires fit(..., solver='svd')"
+
+        # Invalid arguments.
+        model.fit(None, X_, Xdot_, solver="svd")
+        with pytest.raises(ValueError) as ex:
+            model.select_regularization([])
+        assert ex.value.args[0] == \
+            "candidates must be a nonempty sequence of scalars"
+        with pytest.raises(ValueError) as ex:
+            model.select_regularization([1, -1])
+        assert ex.value.args[0] == \
+            "regularization parameter must be nonnegative"
+        with pytest.raises(ValueError) as ex:
+            model.select_regularization(candidates, "aic")
+        assert ex.value.args[0] == "invalid criterion 'aic'"
+        with pytest.raises(ValueError) as ex:
+            model.select_regularization([1, 2], "lcurve")
+        assert ex.value.args[0] == \
+            "criterion 'lcurve' requires at least 3 candidates"
+        with pytest.raises(ValueError) as ex:
+            model.select_regularization(candidates, "trajectory")
+        assert ex.value.args[0] == \
+            "criterion 'trajectory' requires predict_args and X_val"
+
+        # GCV, also with a chunked fit.
+        D = np.column_stack((np.ones(k), X_.T))
+        for chunksize in [None, 30]:
+            model.fit(None, X_, Xdot_, chunksize=chunksize, solver="svd")
+            assert model.select_regularization(candidates) is model
+            for P, score in zip(candidates, model.regularization_scores_):
+                H = D @ la.solve(D.T @ D + P**2*np.eye(r+1), D.T)
+                misfit = np.sum((H @ Xdot_.T - Xdot_.T)**2)
+                assert np.isclose(score, misfit / (k - np.trace(H))**2)
+            best = candidates[np.argmin(model.regularization_scores_)]
+            assert model.regularization_ == best
+            model1 = roi.InferredContinuousROM("cA").fit(None, X_, Xdot_,
+                                                         P=best)
+            assert np.allclose(model.A_, model1.A_)
+            assert np.isclose(model.residual_, model1.residual_)
+
+        # L-curve.
+        model.select_regularization(candidates, "lcurve")
+        assert model.regularization_scores_.shape == candidates.shape
+        assert model.regularization_ == \
+            candidates[np.nanargmax(model.regularization_scores_)]
+
+        # Hold-out trajectory of a discrete model, with unstable candidates.
+        A = 0.99 * la.qr(np.random.standard_normal((r,r)))[0]
+        X_ = np.empty((r,k))
+        X_[:,0] = np.random.standard_normal(r)
+        for j in range(k-1):
+            X_[:,j+1] = A @ X_[:,j]
+        Xnoisy_ = X_ + 1e-1*np.random.standard_normal((r,k))
+        model = roi.InferredDiscreteROM("A").fit(None, Xnoisy_, solver="svd")
+        candidates = np.array([0, 1e-2, 1, 1e2])
+        model.select_regularization(candidates, "trajectory",
+                                    predict_args=(X_[:,0], k), X_val=X_,
+                                    workers=2)
+        scores = model.regularization_scores_
+        bound = 10 * np.max(la.norm(X_, axis=0))
+        for P, score in zip(candidates, scores):
+            model1 = roi.InferredDiscreteROM("A").fit(None, Xnoisy_, P=P)
+            with np.errstate(over="ignore", invalid="ignore"):
+                X_pred = model1.predict(X_[:,0], k)
+            if np.isinf(score):
+                assert not np.all(la.norm(X_pred, axis=0) <= bound)
+            else:
+                assert np.isclose(score, la.norm(X_pred - X_) / la.norm(X_))
+        assert model.regularization_ == candidates[np.argmin(scores)]
+
+        # Everything unstable.
+        with pytest.raises(ValueError) as ex:
+            model.select_regularization(candidates, "trajectory",
+                                        predict_args=(X_[:,0], k),
+                                        X_val=X_, growth=1e-3)
+        assert ex.value.args[0] == "all candidate models are unstable"
+
+        # The bound also stops the explicit part of the IMEX integrators.
+        t = np.linspace(0, 1, 101)
+        X_ = np.exp(-t) * np.random.standard_normal((r,1))
+        model = roi.InferredContinuousROM("AH").fit(None, X_, -X_,
+                                                    solver="svd")
+        imex_split = roi.InferredContinuousROM._imex_split
+        calls = []
+        def _counted_imex_split(self, u):
+            g_, A_ = imex_split(self, u)
+            return (lambda t, x_: calls.append(t) or g_(t, x_)), A_
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(roi.InferredContinuousROM, "_imex_split",
+                       _counted_imex_split)
+            for method in ["imex_euler", "ars222"]:
+                calls.clear()
+                with pytest.raises(ValueError) as ex:
+                    model.select_regularization(candidates, "trajectory",
+                                    predict_args=(X_[:,0], t), X_val=X_,
+                                    growth=1e-3,
+                                    predict_kwargs=dict(method=method))
+                assert ex.value.args[0] == "all candidate models are unstable"
+                assert not calls
+
+            # Stable candidates are scored with the given method.
+            model.select_regularization(candidates, "trajectory",
+                                        predict_args=(X_[:,0], t), X_val=X_,
+                                        predict_kwargs=dict(method="ars222"))
+            assert len(calls) > candidates.size*t.size
+        assert np.all(np.isfinite(model.regularization_scores_))
+
+    def test_partial_fit(self):
+        """Test InferredContinuousROM.partial_fit() and
+        InferredDiscreteROM.partial_fit().
+        """
+        n, k, m, r = 60, 300, 2, 5
+        X, Xdot, _ = _get_data(n, k, m)
+        U = np.random.random((m,k))
+        Vr = la.svd(X)[0][:,:r]
+
+        # Batches of data give the same operators as all of the data at once.
+        model1 = roi.InferredContinuousROM("cAHB").fit(Vr, X, Xdot, U, 1e-2)
+        model2 = roi.InferredContinuousROM("cAHB")
+        for j in range(0, k, 70):
+            batch = slice(j, j+70)
+            model2.partial_fit(Vr, X[:,batch], Xdot[:,batch], U[:,batch],
+                               1e-2)
+        assert model2._Raug.shape == (1 + r + r*(r+1)//2 + m + r,)*2
+        for attr in ["c_", "A_", "Hc_", "B_"]:
+            assert np.allclose(getattr(model1, attr), getattr(model2, attr))
+        for attr in ["datacond_", "dataregcond_", "misfit_", "residual_"]:
+            assert np.isclose(getattr(model1, attr), getattr(model2, attr))
+
+        # The data must stay consistent between calls.
+        with pytest.raises(ValueError) as ex:
+            model2.partial_fit(Vr[:,:-1], X, Xdot, U)
+        assert ex.value.args[0] == \
+            "training data not aligned with previous partial_fit() data"
+
+        # A rejected batch leaves the model unchanged.
+        assert model2.r == r
+        assert model2.Vr is Vr
+        model2.partial_fit(Vr, X[:,:70], Xdot[:,:70], U[:,:70], 1e-2)
+        assert model2._nsamples == k + 70
+
+        # fit() discards the accumulated data.
+        model2.fit(Vr, X[:,:100], Xdot[:,:100], U[:,:100])
+        assert model2._Raug is None
+        model2.partial_fit(Vr[:,:-1], X, Xdot, U)
+        assert model2.r == r - 1
+
+        # Discrete model with overlapping batches.
+        X_ = Vr.T @ X
+        model1 = roi.InferredDiscreteROM("AH").fit(None, X_)
+        model2 = roi.InferredDiscreteROM("AH")
+        model2.partial_fit(None, X_[:,:151])
+        model2.partial_fit(None, X_[:,150:], solver="svd")
+        assert np.allclose(model1.A_, model2.A_)
+        assert np.allclose(model1.Hc_, model2.Hc_)
+
     def _test_fit(self, ModelClass):
         """Test _core._inferred._InferredMixin.fit(), the parent method for
         _core._inferred.InferredDiscreteROM.fit() and
@@ -95,6 +364,273 @@ class TestInferredMixin:
         assert model.n is None
         assert model.Vr is None
 
+    def test_diagnostics(self):
+        """Test the least-squares diagnostics of
+        _core._inferred._InferredMixin.fit().
+        """
+        k, m, r = 200, 2, 4
+        X_, Xdot_ = np.random.standard_normal((2,r,k))
+        U = np.random.standard_normal((m,k))
+        model = roi.InferredContinuousROM("cAHB")
+        with pytest.raises(AttributeError) as ex:
+            model.datacond_
+        assert ex.value.args[0] == \
+            "'InferredContinuousROM' object has no attribute 'datacond_'"
+
+        model._process_fit_arguments(None, X_, Xdot_, U)
+        D = model._construct_data_matrix(X_, U)
+        d = D.shape[1]
+        I = np.eye(d)
+        for solver in ["lstsq", "normal"]:
+            for P in [0, 1e-2, 10, 2*I, [1e-2]*r, (0, 1, 2, 3),
+                      [j*I for j in range(1, r+1)]]:
+                model.fit(None, X_, Xdot_, U, P, solver=solver)
+                Otrp = model._operator_matrix()
+                misfit = np.sum((D @ Otrp - Xdot_.T)**2)
+                assert np.isclose(model.datacond_, np.linalg.cond(D))
+                assert np.isclose(model.misfit_, misfit)
+                assert model.misfit_ <= model.residual_
+                assert model.dataregcond_ <= model.datacond_
+
+                # Nothing is left to compute, so D is not kept alive.
+                for value in model._diagnostics.values():
+                    assert not callable(value)
+
+        # Noise-free data: the misfit is tiny compared to the regularization,
+        # so it must not be computed as the difference residual - ||PO||^2.
+        A = np.random.standard_normal((r,r))
+        model.modelform = "A"
+        D = X_.T
+        for solver in ["lstsq", "normal"]:
+            for P in [1e-6, 1e-4, [1e-4]*r]:
+                model.fit(None, X_, A @ X_, P=P, solver=solver)
+                misfit = np.sum((D @ model.A_.T - (A @ X_).T)**2)
+                assert np.isclose(model.misfit_, misfit, rtol=1e-6, atol=0)
+        model.modelform = "cAHB"
+
+        # Underdetermined problem: computed from the data right away.
+        with pytest.warns(la.LinAlgWarning):
+            model.fit(None, X_[:,:10], Xdot_[:,:10], U[:,:10])
+        for value in model._diagnostics.values():
+            assert not callable(value)
+        D = model._construct_data_matrix(X_[:,:10], U[:,:10])
+        misfit = np.sum((D @ model._operator_matrix() - Xdot_[:,:10].T)**2)
+        assert np.isclose(model.misfit_, misfit)
+        assert np.isclose(model.residual_, model.misfit_)
+
+        # The diagnostics can be set directly.
+        model.datacond_ = 5
+        assert model.datacond_ == 5
+
+    def test_fit_regularization_dict(self):
+        """Test _core._inferred._InferredMixin.fit() with a dictionary of
+        regularization factors.
+        """
+        k, m, r = 200, 2, 4
+        X_, Xdot_ = np.random.standard_normal((2,r,k))
+        U = np.random.standard_normal((m,k))
+        model = roi.InferredContinuousROM("cAHB")
+
+        with pytest.raises(ValueError) as ex:
+            model.fit(None, X_, Xdot_, U, {'A': 1, 'G': 1})
+        assert ex.value.args[0] == \
+            "invalid regularization key 'G'; options are c, A, H, B"
+        with pytest.raises(ValueError) as ex:
+            model.fit(None, X_, Xdot_, U, {'cA': 1})
+        assert ex.value.args[0] == \
+            "invalid regularization key 'cA'; options are c, A, H, B"
+
+        # Terms missing from the dictionary are not regularized.
+        s = r*(r+1)//2
+        Pdiag = np.concatenate(([0], np.full(r, 1e-2), np.full(s, 1),
+                                np.full(m, 1e-3)))
+        P = {'A': 1e-2, 'H': 1, 'B': 1e-3}
+        model1 = roi.InferredContinuousROM("cAHB").fit(None, X_, Xdot_, U,
+                                                       np.diag(Pdiag))
+        for solver in ["lstsq", "normal"]:
+            for chunksize in [None, 50]:
+                for PP in [P, [P]*r]:
+                    model.fit(None, X_, Xdot_, U, PP,
+                              chunksize=chunksize, solver=solver)
+                    for attr in ["c_", "A_", "Hc_", "B_"]:
+                        assert np.allclose(getattr(model1, attr),
+                                           getattr(model, attr))
+                    for attr in ["datacond_", "dataregcond_",
+                                 "misfit_", "residual_"]:
+                        assert np.isclose(getattr(model1, attr),
+                                          getattr(model, attr))
+
+        # Also with partial_fit().
+        model2 = roi.InferredContinuousROM("cAHB")
+        model2.partial_fit(None, X_[:,:100], Xdot_[:,:100], U[:,:100], P)
+        model2.partial_fit(None, X_[:,100:], Xdot_[:,100:], U[:,100:], P)
+        assert np.allclose(model1.Hc_, model2.Hc_)
+
+    def test_fit_chunked(self):
+        """Test _core._inferred._InferredMixin.fit() with `chunksize`."""
+        n, k, m, r = 60, 200, 3, 5
+        X, Xdot, U = _get_data(n, k, m)
+        U = np.random.random((m,k))
+        Vr = la.svd(X)[0][:,:r]
+
+        # Try to fit with an invalid chunk size.
+        model = roi.InferredContinuousROM("cAHGB")
+        for chunksize in [0, -10, 2.5]:
+            with pytest.raises(ValueError) as ex:
+                model.fit(Vr, X, Xdot, U, chunksize=chunksize)
+            assert ex.value.args[0] == "chunksize must be a positive integer"
+
+        # Chunked and unchunked fits should solve the same problem.
+        for P in [0, 1e-2, [1e-2]*r]:
+            model1 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U, P)
+            for chunksize in [1, 37, k, 2*k]:
+                model2 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot,
+                                                   U, P, chunksize=chunksize)
+                for attr in ["c_", "A_", "Hc_", "Gc_", "B_"]:
+                    assert np.allclose(getattr(model1, attr),
+                                       getattr(model2, attr))
+                for attr in ["datacond_", "dataregcond_",
+                             "misfit_", "residual_"]:
+                    assert np.isclose(getattr(model1, attr),
+                                      getattr(model2, attr))
+
+        # Chunked fit with the normal equations solver.
+        model3 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U, 1e-2,
+                                                        chunksize=50,
+                                                        solver="normal")
+        model1 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U, 1e-2)
+        for attr in ["c_", "A_", "Hc_", "Gc_", "B_"]:
+            assert np.allclose(getattr(model1, attr), getattr(model3, attr))
+        assert np.isclose(model1.residual_, model3.residual_)
+
+        # Decoupled problems solved in parallel.
+        model4 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U,
+                                                        [1e-2]*r, chunksize=50,
+                                                        solver="normal",
+                                                        workers=2)
+        for attr in ["c_", "A_", "Hc_", "Gc_", "B_"]:
+            assert np.allclose(getattr(model1, attr), getattr(model4, attr))
+
+        # Try with a discrete model and projected data.
+        X_ = Vr.T @ X
+        model1 = roi.InferredDiscreteROM("AH").fit(None, X_)
+        model2 = roi.InferredDiscreteROM("AH").fit(None, X_, chunksize=20)
+        assert np.allclose(model1.A_, model2.A_)
+        assert np.allclose(model1.Hc_, model2.Hc_)
+
+    def test_fit_processes(self):
+        """Test _core._inferred._InferredMixin.fit() with `processes`."""
+        n, k, m, r = 60, 200, 3, 5
+        X, Xdot, U = _get_data(n, k, m)
+        Vr = la.svd(X)[0][:,:r]
+
+        # Try to fit with an invalid number of processes.
+        model = roi.InferredContinuousROM("cAHGB")
+        for processes in [0, -2, 1.5]:
+            with pytest.raises(ValueError) as ex:
+                model.fit(Vr, X, Xdot, U, processes=processes)
+            assert ex.value.args[0] == \
+                "processes must be a positive integer or -1"
+
+        # The TSQR pipeline should solve the same problem as the serial fit.
+        model1 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U, 1e-2)
+        for processes, chunksize in [(1, None), (2, 30), (3, 7)]:
+            model2 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U,
+                                                  1e-2, chunksize=chunksize,
+                                                  processes=processes)
+            for attr in ["c_", "A_", "Hc_", "Gc_", "B_"]:
+                assert np.allclose(getattr(model1, attr),
+                                   getattr(model2, attr))
+            # (D is numerically singular here, so skip datacond_.)
+            for attr in ["dataregcond_", "misfit_", "residual_"]:
+                assert np.isclose(getattr(model1, attr),
+                                  getattr(model2, attr))
+
+        # The workers are forked where possible; the spawned workers used
+        # elsewhere receive a pickled copy of the data.
+        context = roi._core._inferred._tsqr_context()
+        if "fork" in multiprocessing.get_all_start_methods():
+            assert context.get_start_method() == "fork"
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(roi._core._inferred, "_tsqr_context",
+                       lambda: multiprocessing.get_context("spawn"))
+            model2 = roi.InferredContinuousROM("cAHGB").fit(Vr, X, Xdot, U,
+                                                  1e-2, processes=2)
+        assert np.allclose(model1.A_, model2.A_)
+
+        # Try with a discrete model and projected data.
+        X_ = Vr.T @ X
+        model1 = roi.InferredDiscreteROM("AH").fit(None, X_)
+        model2 = roi.InferredDiscreteROM("AH").fit(None, X_, processes=2)
+        assert np.allclose(model1.A_, model2.A_)
+        assert np.allclose(model1.Hc_, model2.Hc_)
+
+    def test_fit_iterative(self):
+        """Test _core._inferred._InferredMixin.fit() with solver="lsqr" and
+        solver="lsmr".
+        """
+        k, m, r = 300, 2, 4
+        X_, Xdot_ = np.random.standard_normal((2,r,k))
+        U = np.random.standard_normal((m,k))
+
+        # Try with a non-scalar regularizer.
+        model = roi.InferredContinuousROM("cAHGB")
+        d = roi.utils.get_least_squares_size("cAHGB", r, m)
+        with pytest.raises(ValueError) as ex:
+            model.fit(None, X_, Xdot_, U, np.eye(d), solver="lsqr")
+        assert ex.value.args[0] == "iterative solvers require scalar P"
+
+        # Matrix-free iterations should solve the same problem as "lstsq".
+        model1 = roi.InferredContinuousROM("cAHGB").fit(None, X_, Xdot_, U,
+                                                        1e-2)
+        for solver in ["lsqr", "lsmr"]:
+            for chunksize in [None, 70]:
+                model2 = roi.InferredContinuousROM("cAHGB").fit(None, X_,
+                                                      Xdot_, U, 1e-2,
+                                                      chunksize=chunksize,
+                                                      solver=solver)
+                for attr in ["c_", "A_", "Hc_", "Gc_", "B_"]:
+                    assert np.allclose(getattr(model1, attr),
+                                       getattr(model2, attr))
+                for attr in ["misfit_", "residual_"]:
+                    assert np.isclose(getattr(model1, attr),
+                                      getattr(model2, attr))
+                assert np.isnan(model2.datacond_)
+                assert model2.iterations_.shape == (r,)
+
+            # Warm starts from this model and from another model.
+            Xdot2_ = Xdot_ + 1e-4*np.random.random((r,k))
+            model1.fit(None, X_, Xdot2_, U, 1e-2)
+            model3 = roi.InferredContinuousROM("cAHGB").fit(None, X_, Xdot2_,
+                                                            U, 1e-2,
+                                                            solver=solver,
+                                                            warm_start=model2)
+            model2.fit(None, X_, Xdot2_, U, 1e-2, solver=solver,
+                       chunksize=70, warm_start=True)
+            for mdl in [model2, model3]:
+                assert np.allclose(model1.Gc_, mdl.Gc_)
+                assert np.all(mdl.iterations_ < d)
+            model1.fit(None, X_, Xdot_, U, 1e-2)
+
+        # Try to warm start from a model with a different structure.
+        model4 = roi.InferredContinuousROM("cAHB").fit(None, X_, Xdot_, U)
+        with pytest.raises(ValueError) as ex:
+            model.fit(None, X_, Xdot_, U, solver="lsqr", warm_start=model4)
+        assert ex.value.args[0] == \
+            "warm start model not aligned with training data"
+
+        # Warm start from an untrained model.
+        with pytest.raises(AttributeError):
+            model.fit(None, X_, Xdot_, U, solver="lsqr",
+                      warm_start=roi.InferredContinuousROM("cAHGB"))
+
+        # Ignored by the direct solvers and on the first fit.
+        model5 = roi.InferredDiscreteROM("AH").fit(None, X_, solver="lsmr",
+                                                   warm_start=True)
+        model6 = roi.InferredDiscreteROM("AH").fit(None, X_, warm_start=True)
+        assert np.allclose(model5.Hc_, model6.Hc_)
+        assert model6.iterations_ is None
+
 
 # Useable classes (public) ====================================================
 class TestInferredDiscreteROM:
@@ -64,6 +64,13 @@ def test_pod_basis(set_up_basis_data):
         assert svdvals.shape == (r,)
         assert la.norm(svdvals - vals_r) < 3
 
+    # Single-precision data should give a single-precision basis.
+    X32 = X.astype(np.float32)
+    for mode in ["dense", "sparse", "randomized"]:
+        Vr, svdvals = roi.pre.pod_basis(X32, 5, mode=mode)
+        assert Vr.dtype == np.float32
+        assert Vr.shape == (n,5)
+
 
 # Reduced dimension selection =================================================
 def test_svdval_decay(set_up_basis_data):
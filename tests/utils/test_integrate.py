@@ -0,0 +1,110 @@
+# utils/test_integrate.py
+"""Tests for rom_operator_inference.utils._integrate.py."""
+
+import pytest
+import numpy as np
+from scipy import linalg as la
+
+import rom_operator_inference as roi
+
+
+def _linear_system(r):
+    """A stable linear system dx / dt = Ax and its exact solution."""
+    A = np.random.standard_normal((r,r))
+    A = A - A.T - np.eye(r)
+    return (lambda t, x: A @ x), (lambda t, x0: la.expm(A*t) @ x0)
+
+
+def test_integrate(r=5, N=3):
+    """Test utils._integrate.integrate()."""
+    fun, exact = _linear_system(r)
+    x0, X0 = np.random.standard_normal(r), np.random.standard_normal((r,N))
+    t = np.linspace(0, 1, 11)
+
+    # Try with bad arguments.
+    with pytest.raises(ValueError) as ex:
+        roi.utils.integrate(fun, t, x0, method="rk5")
+    assert ex.value.args[0] == \
+        "invalid method 'rk5'; options are euler, ssprk3, rk4, dopri5," \
+        " imex_euler, cnab2, ars222"
+
+    with pytest.raises(ValueError) as ex:
+        roi.utils.integrate(fun, np.vstack((t,t)), x0)
+    assert ex.value.args[0] == "time 't' must be one-dimensional"
+
+    with pytest.raises(ValueError) as ex:
+        roi.utils.integrate(fun, t, x0, max_step=0)
+    assert ex.value.args[0] == "max_step must be positive"
+
+    # Fixed-step methods converge with the expected order.
+    for method, order in [("euler", 1), ("ssprk3", 3), ("rk4", 4)]:
+        errors = []
+        for max_step in (.02, .01):
+            sol = roi.utils.integrate(fun, t, x0, method, max_step=max_step)
+            assert sol.success
+            assert sol.y.shape == (r,t.size)
+            assert np.allclose(sol.y[:,0], x0)
+            errors.append(la.norm(sol.y[:,-1] - exact(t[-1], x0)))
+        assert np.log2(errors[0] / errors[1]) > order - .5
+
+    # The adaptive method meets the requested tolerance.
+    for rtol in (1e-4, 1e-8):
+        sol = roi.utils.integrate(fun, t, x0, "dopri5", rtol=rtol, atol=rtol)
+        assert sol.success
+        Y = np.column_stack([exact(s, x0) for s in t])
+        assert np.max(np.abs(sol.y - Y)) < 100*rtol
+
+    # Blocks of states are advanced column-wise.
+    for method in ("rk4", "dopri5"):
+        sol = roi.utils.integrate(fun, t, X0, method, rtol=1e-8, atol=1e-8)
+        assert sol.y.shape == (r,t.size,N)
+        for i in range(N):
+            soli = roi.utils.integrate(fun, t, X0[:,i], method,
+                                       rtol=1e-8, atol=1e-8)
+            assert np.allclose(sol.y[...,i], soli.y)
+
+    # Backward in time.
+    sol = roi.utils.integrate(fun, t[::-1], x0, "dopri5", rtol=1e-8, atol=1e-8)
+    assert np.allclose(sol.y[:,-1], exact(-t[-1], x0))
+
+    # IMEX methods treat A implicitly and fun explicitly.
+    A = -np.diag(np.logspace(0, 1, r))
+    B = np.random.standard_normal((r,r)) / 2
+    Xexact = la.expm(A + B) @ X0
+    with pytest.raises(ValueError) as ex:
+        roi.utils.integrate(fun, t, x0, "ars222")
+    assert ex.value.args[0] == "method 'ars222' requires the linear operator A"
+    with pytest.raises(ValueError) as ex:
+        roi.utils.integrate(fun, t, x0, "ars222", A=A[1:])
+    assert ex.value.args[0] == "A must be (r,r) with r = x0.shape[0]"
+    for method, order in [("imex_euler", 1), ("cnab2", 2), ("ars222", 2)]:
+        errors = []
+        for max_step in (.02, .01):
+            sol = roi.utils.integrate(lambda t, x: B @ x, t, X0, method,
+                                      max_step=max_step, A=A)
+            assert sol.success
+            assert sol.y.shape == (r,t.size,N)
+            assert sol.nlu == 1
+            errors.append(la.norm(sol.y[:,-1] - Xexact))
+        assert np.log2(errors[0] / errors[1]) > order - .5
+
+    # Stiff linear terms do not restrict the IMEX step size.
+    A = -np.diag(np.logspace(0, 6, r))
+    for method in ("imex_euler", "ars222"):
+        sol = roi.utils.integrate(lambda t, x: np.zeros_like(x), t, x0,
+                                  method, A=A)
+        assert np.all(np.abs(sol.y[:,-1]) <= np.abs(x0))
+
+    # Failure is reported (not raised) if the solution blows up.
+    sol = roi.utils.integrate(lambda t, x: x**2, [0, 2], np.ones(1), "dopri5")
+    assert not sol.success
+    assert sol.status == 1
+    assert sol.y.shape == (1,1)
+
+    # ...also at negative times, forward and backward.
+    for t, x0 in [([-2, 0], 1), ([0, -2], -1)]:
+        sol = roi.utils.integrate(lambda t, x: x**2, t, np.full(1, x0),
+                                  "dopri5")
+        assert not sol.success
+        assert sol.status == 1
+        assert sol.y.shape == (1,1)
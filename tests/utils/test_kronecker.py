@@ -3,10 +3,66 @@
 
 import pytest
 import numpy as np
+from scipy import sparse
 
 import rom_operator_inference as roi
 
 
+# Index tables ================================================================
+def test_kron_indices(r=7):
+    """Test utils._kronecker._kron2c_indices() and _kron3c_indices()."""
+    x = np.random.random(r)
+
+    # Check the quadratic index tables.
+    i, j = roi.utils._kronecker._kron2c_indices(r)
+    assert i.shape == j.shape == (r*(r+1)//2,)
+    assert np.all(j <= i)
+    assert np.allclose(x[i] * x[j],
+                       np.concatenate([x[l] * x[:l+1] for l in range(r)]))
+
+    # Check the cubic index tables.
+    i, j = roi.utils._kronecker._kron3c_indices(r)
+    assert i.shape == j.shape == (r*(r+1)*(r+2)//6,)
+    x2 = roi.utils.kron2c(x)
+    assert np.allclose(x[i] * x2[j],
+                       np.concatenate([x[l] * x2[:(l+1)*(l+2)//2]
+                                       for l in range(r)]))
+
+    # Check that the tables are cached and protected.
+    assert roi.utils._kronecker._kron2c_indices(r)[0] is \
+        roi.utils._kronecker._kron2c_indices(r)[0]
+    with pytest.raises(ValueError):
+        i[0] = 1
+
+
+def test_operator_indices(r=6):
+    """Test utils._kronecker._operator_indices()."""
+    # Quadratic: diagonal terms have one full column, the others two.
+    perms, mult, full2compact = roi.utils._kronecker._operator_indices(r, 2)
+    s = r*(r+1)//2
+    assert perms.shape == (2,s)
+    assert mult.shape == (s,)
+    assert full2compact.shape == (r**2,)
+    i, j = roi.utils._kronecker._kron2c_indices(r)
+    assert np.all(mult[i == j] == 1)
+    assert np.all(mult[i != j] == 2)
+    assert np.all(full2compact[perms] == np.arange(s))
+
+    # Cubic: 1, 3, or 6 full columns per term.
+    perms, mult, full2compact = roi.utils._kronecker._operator_indices(r, 3)
+    s = r*(r+1)*(r+2)//6
+    assert perms.shape == (6,s)
+    assert set(mult) == {1, 3, 6}
+    assert np.sum(mult) == r**3
+    assert np.all(full2compact[perms] == np.arange(s))
+
+    # Quartic: 1, 4, 6, 12, or 24 full columns per term.
+    perms, mult, full2compact = roi.utils._kronecker._operator_indices(r, 4)
+    assert perms.shape == (24,roi.utils.kronc_size(r, 4))
+    assert set(mult) == {1, 4, 6, 12, 24}
+    assert np.sum(mult) == r**4
+
+
 # Kronecker (Khatri-Rao) products =============================================
 # utils.kron2c() --------------------------------------------------------------
 def _test_kron2c_single_vector(n):
@@ -18,6 +74,11 @@ def _test_kron2c_single_vector(n):
     for i in range(n):
         assert np.allclose(x2[i*(i+1)//2:(i+1)*(i+2)//2], x[i]*x[:i+1])
 
+    # Write the product to a preallocated array.
+    out = np.empty_like(x2)
+    assert roi.utils.kron2c(x, out=out) is out
+    assert np.allclose(out, x2)
+
 
 def _test_kron2c_single_matrix(n):
     """Do one matrix test of utils._kronecker.kron2c()."""
@@ -54,6 +115,11 @@ def _test_kron3c_single_vector(n):
         assert np.allclose(x3[i*(i+1)*(i+2)//6:(i+1)*(i+2)*(i+3)//6],
                             x[i]*roi.utils.kron2c(x[:i+1]))
 
+    # Write the product to a preallocated array.
+    out = np.empty_like(x3)
+    assert roi.utils.kron3c(x, out=out) is out
+    assert np.allclose(out, x3)
+
 
 def _test_kron3c_single_matrix(n):
     """Do one matrix test of utils._kronecker.kron3c()."""
@@ -80,6 +146,44 @@ def test_kron3c(n_tests=50):
         _test_kron3c_single_matrix(n)
 
 
+# utils.kronc() ---------------------------------------------------------------
+def test_kronc_size():
+    """Test utils._kronecker.kronc_size()."""
+    for r in range(1, 10):
+        assert roi.utils.kronc_size(r, 1) == r
+        assert roi.utils.kronc_size(r, 2) == r*(r+1)//2
+        assert roi.utils.kronc_size(r, 3) == r*(r+1)*(r+2)//6
+        assert roi.utils.kronc_size(r, 4) == r*(r+1)*(r+2)*(r+3)//24
+
+
+def test_kronc(n_tests=10):
+    """Test utils._kronecker.kronc()."""
+    # Try with bad degrees.
+    for p in [0, -1, 2.5]:
+        with pytest.raises(ValueError) as exc:
+            roi.utils.kronc(np.random.random(4), p)
+        assert exc.value.args[0] == f"invalid degree p = {p}"
+
+    for n in np.random.randint(2, 12, n_tests):
+        x = np.random.random(n)
+        X = np.random.random((n,3))
+
+        # Agree with the hard-coded degrees.
+        assert np.all(roi.utils.kronc(x, 1) == x)
+        assert np.allclose(roi.utils.kronc(x, 2), roi.utils.kron2c(x))
+        assert np.allclose(roi.utils.kronc(X, 3), roi.utils.kron3c(X))
+
+        # Quartic terms are unique products of four entries, column-wise.
+        x4 = roi.utils.kronc(x, 4)
+        assert x4.shape == (roi.utils.kronc_size(n, 4),)
+        terms = roi.utils._kronecker._kronc_terms(n, 4)
+        assert np.all(np.diff(terms, axis=0) <= 0)
+        assert np.allclose(x4, np.prod(x[terms], axis=0))
+        X4 = roi.utils.kronc(X, 4)
+        for j in range(X.shape[1]):
+            assert np.allclose(X4[:,j], roi.utils.kronc(X[:,j], 4))
+
+
 # Matricized tensor management ================================================
 # utils.expand_Hc() -----------------------------------------------------------
 def _test_expand_Hc_single(r):
@@ -102,6 +206,21 @@ def _test_expand_Hc_single(r):
     for subH in H:
         assert np.allclose(subH, subH.T)
 
+    # Check the sparse and LinearOperator formats.
+    Hsparse = roi.utils.expand_Hc(Hc, mode="sparse")
+    assert sparse.issparse(Hsparse)
+    assert np.allclose(Hsparse.toarray(), H)
+    Hc_sparse = sparse.random(r, s, density=.1, format="csr")
+    Hsparse = roi.utils.expand_Hc(Hc_sparse, mode="sparse")
+    assert np.allclose(Hsparse.toarray(),
+                       roi.utils.expand_Hc(Hc_sparse.toarray()))
+    assert Hsparse.nnz <= 2*Hc_sparse.nnz
+    Hop = roi.utils.expand_Hc(Hc, mode="operator")
+    assert Hop.shape == (r,r**2)
+    assert np.allclose(Hop.matvec(np.kron(x,x)), Hxx)
+    y = np.random.random(r)
+    assert np.allclose(Hop.rmatvec(y), H.T @ y)
+
 
 def test_expand_Hc(n_tests=100):
     """Test utils._kronecker.expand_Hc()."""
@@ -114,6 +233,11 @@ def test_expand_Hc(n_tests=100):
     assert exc.value.args[0] == \
         f"invalid shape (r,s) = {(r,sbad)} with s != r(r+1)/2"
 
+    # Try to expand with an invalid mode.
+    with pytest.raises(NotImplementedError) as exc:
+        roi.utils.expand_Hc(np.random.random((r,r*(r+1)//2)), mode="bad")
+    assert exc.value.args[0] == "invalid mode 'bad'"
+
     # Do 100 test cases of varying dimensions.
     for r in np.random.randint(2, 100, n_tests):
         _test_expand_Hc_single(r)
@@ -180,6 +304,14 @@ def _test_expand_Gc_single(r):
     for subG in G:
         assert np.allclose(subG, subG.T)
 
+    # Check the sparse and LinearOperator formats.
+    Gsparse = roi.utils.expand_Gc(Gc, mode="sparse")
+    assert sparse.issparse(Gsparse)
+    assert np.allclose(Gsparse.toarray(), G)
+    Gop = roi.utils.expand_Gc(Gc, mode="operator")
+    assert Gop.shape == (r,r**3)
+    assert np.allclose(Gop.matvec(np.kron(x,np.kron(x,x))), Gxxx)
+
 
 def test_expand_Gc(n_tests=50):
     """Test utils._kronecker.expand_Gc()."""
@@ -230,3 +362,38 @@ def test_compress_G(n_tests=50):
     # Do 100 test cases of varying dimensions.
     for r in np.random.randint(2, 30, n_tests):
         _test_compress_G_single(r)
+
+
+# utils.compress_operator() / utils.expand_operator() -------------------------
+def test_compress_expand_operator(r=5):
+    """Test utils._kronecker.compress_operator() and expand_operator()."""
+    x = np.random.random(r)
+    xxxx = np.kron(x, np.kron(x, np.kron(x, x)))
+
+    # Try with bad shapes.
+    with pytest.raises(ValueError) as exc:
+        roi.utils.compress_operator(np.random.random((r,r**4 - 1)), 4)
+    assert exc.value.args[0] == \
+        f"invalid shape (r,a) = {(r,r**4 - 1)} with a != r**4"
+    with pytest.raises(ValueError) as exc:
+        roi.utils.expand_operator(np.random.random((r,r+1)), 4)
+    assert exc.value.args[0] == \
+        f"invalid shape (r,s) = {(r,r+1)} with s != binom(r+3,4)"
+
+    # Agree with the hard-coded degrees.
+    H = np.random.random((r,r**2))
+    assert np.allclose(roi.utils.compress_operator(H, 2),
+                       roi.utils.compress_H(H))
+    Gc = np.random.random((r,r*(r+1)*(r+2)//6))
+    assert np.allclose(roi.utils.expand_operator(Gc, 3),
+                       roi.utils.expand_Gc(Gc))
+
+    # Quartic operators act on the compact and full products identically.
+    K = np.random.random((r,r**4))
+    Kc = roi.utils.compress_operator(K, 4)
+    assert Kc.shape == (r,roi.utils.kronc_size(r, 4))
+    assert np.allclose(Kc @ roi.utils.kronc(x, 4), K @ xxxx)
+    K2 = roi.utils.expand_operator(Kc, 4)
+    assert K2.shape == (r,r**4)
+    assert np.allclose(K2 @ xxxx, K @ xxxx)
+    assert np.allclose(roi.utils.compress_operator(K2, 4), Kc)
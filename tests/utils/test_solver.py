@@ -4,6 +4,7 @@
 import pytest
 import numpy as np
 from scipy import linalg as la
+from scipy.sparse import linalg as spla
 
 import rom_operator_inference as roi
 
@@ -171,3 +172,314 @@ def test_lstsq_reg(n_tests=5):
     k, m = 200, 20
     for r in np.random.randint(4, 50, n_tests):
         _test_lstsq_reg_single(k, min(k, 1 + r + r*(r+1)//2 + m), r)
+
+
+def test_lstsq_reg_multiple():
+    """Test utils._solver.lstsq_reg() with a list of regularizations."""
+    k, d, r = 100, 12, 4
+    A = np.random.random((k,d))
+    B = np.random.random((k,r))
+    I = np.eye(d)
+
+    def _check(Ps):
+        X, res, rnk, s = roi.utils.lstsq_reg(A, B, Ps)
+        assert X.shape == (d,r)
+        assert res.shape == (r,)
+        for j, Pj in enumerate(Ps):
+            x, resj, rnkj, sj = roi.utils.lstsq_reg(A, B[:,j], Pj)
+            assert np.allclose(X[:,j], x)
+            Pj = Pj*I if np.isscalar(Pj) else Pj
+            assert np.isclose(res[j], np.sum((A @ x - B[:,j])**2)
+                                      + np.sum((Pj @ x)**2))
+            if j == 0:
+                assert rnk == rnkj
+                assert np.allclose(s, sj)
+
+    _check([0, 1e-3, 1e-1, 10])                     # Scalars (filters).
+    _check(range(r))                                # Scalars (filters).
+    _check([j*I for j in range(r)])                 # Matrices (shared QR).
+    _check([np.diag(np.random.random(d)) for _ in range(r)])
+    _check([1e-2, 2*I, 0, np.random.random((d,d))]) # Mixed.
+
+    # Solve the decoupled problems in parallel.
+    Ps = [np.diag(np.random.random(d)) for _ in range(r)]
+    X, res, _, _ = roi.utils.lstsq_reg(A, B, Ps)
+    for solver in ["lstsq", "normal"]:
+        for workers in [2, -1]:
+            X2, res2, _, _ = roi.utils.lstsq_reg(A, B, Ps, solver=solver,
+                                                 workers=workers)
+            assert np.allclose(X, X2)
+            assert np.allclose(res, res2)
+    for workers in [0, -2, 1.5]:
+        with pytest.raises(ValueError) as exc:
+            roi.utils.lstsq_reg(A, B, Ps, workers=workers)
+        assert exc.value.args[0] == "workers must be a positive integer or -1"
+
+    # Negative regularization parameters not allowed.
+    for Ps in [[1, -1, 1, 1], [I, -1, I, I]]:
+        with pytest.raises(ValueError) as exc:
+            roi.utils.lstsq_reg(A, B, Ps)
+        assert exc.value.args[0] == \
+            "regularization parameter must be nonnegative"
+
+    # Underdetermined systems.
+    for Ps in [[0, 1, 1, 1], [0, I, I, I]]:
+        with pytest.warns(la.LinAlgWarning) as exc:
+            roi.utils.lstsq_reg(A[:8,:], B[:8,:], Ps)
+        assert exc[0].message.args[0] == \
+            "least squares system is underdetermined"
+
+
+def test_lstsq_reg_normal():
+    """Test utils._solver.lstsq_reg() with solver="normal"."""
+    k, d, r = 200, 10, 4
+    A = np.random.random((k,d))
+    B = np.random.random((k,r))
+    I = np.eye(d)
+
+    # Invalid solver.
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_reg(A, B, solver="svd")
+    assert exc.value.args[0] == "invalid solver 'svd'"
+
+    # Well-conditioned problems: same results as the default solver.
+    for P in [0, 1e-2, 3*I, [1e-2]*r, [I*j for j in range(r)]]:
+        for b in [B, B[:,0]] if np.isscalar(P) or not isinstance(P, list) \
+                 else [B]:
+            x1, res1, _, s1 = roi.utils.lstsq_reg(A, b, P)
+            x2, res2, rnk, s2 = roi.utils.lstsq_reg(A, b, P, solver="normal")
+            assert x2.shape == x1.shape
+            assert np.allclose(x1, x2)
+            assert np.allclose(res1, res2)
+            assert np.allclose(s1, s2)
+            assert rnk == d
+
+    # Rank-deficient problem: falls back to the default solver.
+    A[:,-1] = A[:,0]
+    x1, res1, rnk1, s1 = roi.utils.lstsq_reg(A, B)
+    x2, res2, rnk2, s2 = roi.utils.lstsq_reg(A, B, solver="normal")
+    assert np.allclose(x1, x2)
+    assert rnk1 == rnk2 == d - 1
+    for P in [[0]*r, [0, 1e-2, 0, I]]:
+        x2, res2, _, _ = roi.utils.lstsq_reg(A, B, P, solver="normal")
+        x1, res1, _, _ = roi.utils.lstsq_reg(A, B, P)
+        assert np.allclose(A @ x1, A @ x2)
+        expected = [np.sum((A @ x2[:,j] - B[:,j])**2)
+                    + np.sum((Pj * x2[:,j] if np.isscalar(Pj)
+                              else Pj @ x2[:,j])**2)
+                    for j, Pj in enumerate(P)]
+        assert np.allclose(res2, expected)
+        assert np.all(res2 > 0)
+
+    # Underdetermined problem: falls back (with the usual warning).
+    with pytest.warns(la.LinAlgWarning) as exc:
+        roi.utils.lstsq_reg(A[:8,:], B[:8,:], solver="normal")
+    assert exc[0].message.args[0] == "least squares system is underdetermined"
+
+
+def test_lstsq_reg_diagonal():
+    """Test utils._solver.lstsq_reg() with diagonal regularization."""
+    k, d, r = 200, 10, 4
+    A = np.random.random((k,d))
+    B = np.random.random((k,r))
+    p = np.random.random(d)
+    p[0] = 0
+
+    # Bad diagonals.
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_reg(A, B, p[:-1])
+    assert exc.value.args[0] == \
+        "diagonal P must be (d,) with d = number of columns of A"
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_reg(A, B, -p)
+    assert exc.value.args[0] == "regularization parameter must be nonnegative"
+
+    # Same results as the dense diagonal matrix.
+    for solver in ["lstsq", "normal"]:
+        for P, Pdiag in [(p, np.diag(p)),
+                         ([p*j for j in range(r)],
+                          [np.diag(p)*j for j in range(r)]),
+                         ([1e-2, p, 0, 2*p], [1e-2, np.diag(p), 0, 2*p])]:
+            for b in [B, B[:,0]] if not isinstance(P, list) else [B]:
+                x1, res1, rnk1, s1 = roi.utils.lstsq_reg(A, b, Pdiag, solver)
+                x2, res2, rnk2, s2 = roi.utils.lstsq_reg(A, b, P, solver)
+                assert x2.shape == x1.shape
+                assert np.allclose(x1, x2)
+                assert np.allclose(res1, res2)
+                assert rnk1 == rnk2
+                assert np.allclose(s1, s2)
+
+    # Underdetermined problem (regularized, so uniquely solvable).
+    x1, res1, _, _ = roi.utils.lstsq_reg(A[:5], B[:5], np.diag(p + 1))
+    x2, res2, _, _ = roi.utils.lstsq_reg(A[:5], B[:5], p + 1)
+    assert np.allclose(x1, x2)
+    assert np.allclose(res1, res2)
+
+    # Rank-deficient data where the diagonal is zero (no Cholesky factor).
+    A2 = A.copy()
+    A2[:,1] = A2[:,0]
+    p2 = p.copy()
+    p2[:2] = 0
+    x1, res1, rnk1, _ = roi.utils.lstsq_reg(A2, B, np.diag(p2))
+    x2, res2, rnk2, _ = roi.utils.lstsq_reg(A2, B, p2)
+    assert np.allclose(A2 @ x1, A2 @ x2)
+    assert np.allclose(res2, np.sum((A2 @ x2 - B)**2, axis=0)
+                             + np.sum((p2 * x2.T)**2, axis=1))
+    assert rnk1 == rnk2 == d - 1
+
+
+def test_lstsq_iterative():
+    """Test utils._solver.lstsq_iterative()."""
+    k, d, r = 200, 10, 4
+    A = np.random.random((k,d))
+    B = np.random.random((k,r))
+
+    # Invalid arguments.
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_iterative(A, B, solver="lstsq")
+    assert exc.value.args[0] == "invalid solver 'lstsq'"
+
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_iterative(A, B, np.eye(d))
+    assert exc.value.args[0] == "iterative solvers require scalar P"
+
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_iterative(A, B, -1)
+    assert exc.value.args[0] == "regularization parameter must be nonnegative"
+
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_iterative(A, B, [1]*(r-1))
+    assert exc.value.args[0] == "multiple P requires exactly r entries " \
+                                "with r = number of columns of b"
+
+    with pytest.raises(ValueError) as exc:
+        roi.utils.lstsq_iterative(A, B, x0=np.zeros(d))
+    assert exc.value.args[0] == f"x0.shape = {(d,)} != {(d,r)}"
+
+    # Same solutions and residuals as lstsq_reg(), also matrix-free.
+    Aop = spla.aslinearoperator(A)
+    for solver in ["lsqr", "lsmr"]:
+        for P in [0, 1e-1, [0, 1e-2, 1e-1, 1]]:
+            for b in [B, B[:,0]] if np.isscalar(P) else [B]:
+                x1, res1, _, _ = roi.utils.lstsq_reg(A, b, P)
+                if np.isscalar(P) and P == 0:
+                    res1 = np.sum((A @ x1 - b)**2, axis=0)
+                x2, res2, itn = roi.utils.lstsq_iterative(Aop, b, P, solver,
+                                                          workers=2)
+                assert x2.shape == x1.shape
+                assert np.allclose(x1, x2)
+                assert np.allclose(res1, res2)
+                assert np.all(itn < 2*d)
+
+        # Warm start from the solution of a nearby problem.
+        P = [1e-1] * r
+        x1, res1, _, _ = roi.utils.lstsq_reg(A, B, P)
+        x0 = roi.utils.lstsq_reg(A, B + 1e-6, P)[0]
+        x2, res2, itn = roi.utils.lstsq_iterative(A, B, P, solver, x0=x0)
+        assert np.allclose(x1, x2)
+        assert np.allclose(res1, res2)
+        assert np.all(itn < roi.utils.lstsq_iterative(A, B, P, solver)[2])
+
+        # All columns share each application of A and A^T.
+        calls = []
+        Acount = spla.LinearOperator((k,d), dtype=float,
+                                     matvec=lambda v: A @ v,
+                                     rmatvec=lambda w: A.T @ w,
+                                     matmat=lambda V: calls.append(1) or A @ V,
+                                     rmatmat=lambda W: calls.append(1)
+                                                                or A.T @ W)
+        _, _, itn = roi.utils.lstsq_iterative(Acount, B, P, solver)
+        assert len(calls) == 2*np.max(itn) + 2
+
+        # Not enough iterations.
+        with pytest.warns(la.LinAlgWarning) as exc:
+            roi.utils.lstsq_iterative(A, B, solver=solver, maxiter=2)
+        assert exc[0].message.args[0] == \
+            f"{solver} reached the iteration limit without converging"
+
+
+def test_SolverL2():
+    """Test utils._solver.SolverL2."""
+    k, d, r = 100, 12, 3
+    A = np.random.random((k,d))
+    B = np.random.random((k,r))
+
+    solver = roi.utils.SolverL2()
+    with pytest.raises(ValueError) as exc:
+        solver.fit(A, np.random.random((k,2,2)))
+    assert exc.value.args[0] == "`B` must be one- or two-dimensional"
+    with pytest.raises(ValueError) as exc:
+        solver.fit(A, B[1:])
+    assert exc.value.args[0] == "A and B not aligned, dimension 0"
+
+    # Compare to lstsq_reg() for several regularization factors.
+    assert solver.fit(A, B) is solver
+    assert np.isclose(solver.cond(), np.linalg.cond(A))
+    λs = [0, 1e-3, 1e-1, 10]
+    for λ in λs:
+        X, res, _, s = roi.utils.lstsq_reg(A, B, λ)
+        assert np.allclose(solver.predict(λ), X)
+        assert np.isclose(solver.misfit(λ), np.sum((A @ X - B)**2))
+        assert np.isclose(solver.residual(λ), np.sum(res))
+        assert np.isclose(solver.norm(λ), la.norm(X))
+        assert np.isclose(solver.regcond(λ), s[0]/s[-1])
+
+    # Vectorized misfit, residual, and norm evaluation.
+    misfits = solver.misfit(λs)
+    residuals = solver.residual(λs)
+    norms = solver.norm(λs)
+    assert misfits.shape == residuals.shape == norms.shape == (len(λs),)
+    assert np.allclose(misfits, [solver.misfit(λ) for λ in λs])
+    assert np.allclose(residuals, [solver.residual(λ) for λ in λs])
+    assert np.allclose(norms, [solver.norm(λ) for λ in λs])
+    assert np.all(np.diff(misfits) >= 0)
+    assert np.all(np.diff(norms) <= 0)
+
+    # One-dimensional right-hand side.
+    solver.fit(A, B[:,0])
+    X, res, _, _ = roi.utils.lstsq_reg(A, B[:,0], 1e-2)
+    assert np.allclose(solver.predict(1e-2), X)
+    assert np.isclose(solver.residual(1e-2), res)
+
+    # Rank-deficient A.
+    A[:,-1] = A[:,0]
+    solver.fit(A, B)
+    X = roi.utils.lstsq_reg(A, B)[0]
+    assert np.allclose(solver.predict(0), X)
+    assert solver.cond() > 1e10
+
+    # Bad regularization parameters.
+    with pytest.raises(ValueError) as exc:
+        solver.predict(-1)
+    assert exc.value.args[0] == "regularization parameter must be nonnegative"
+    with pytest.raises(ValueError) as exc:
+        solver.predict([1, 2])
+    assert exc.value.args[0] == "predict() requires a scalar regularization"
+
+
+def test_qr_append():
+    """Test utils._solver._qr_append()."""
+    A = np.random.random((50,8))
+    R = None
+    for j in range(0, 50, 7):
+        R = roi.utils._solver._qr_append(R, A[j:j+7])
+    assert R.shape == (8,8)
+    assert np.allclose(R, np.triu(R))
+    assert np.allclose(R.T @ R, A.T @ A)
+
+    # Fewer rows than columns.
+    R = roi.utils._solver._qr_append(None, A[:3])
+    assert R.shape == (3,8)
+    assert np.allclose(R.T @ R, A[:3].T @ A[:3])
+
+
+def test_tsqr_reduce():
+    """Test utils._solver._tsqr_reduce()."""
+    A = np.random.random((60,8))
+    for nblocks in [1, 2, 5, 8]:
+        Rs = [roi.utils._solver._qr_append(None, block)
+              for block in np.array_split(A, nblocks)]
+        R = roi.utils._solver._tsqr_reduce(Rs)
+        assert R.shape == (8,8)
+        assert np.allclose(R, np.triu(R))
+        assert np.allclose(R.T @ R, A.T @ A)